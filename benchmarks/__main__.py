@@ -0,0 +1,59 @@
+"""Run the SDK benchmarks offline.
+
+    python -m benchmarks                   # run everything and compare against the saved baseline if there is one
+    python -m benchmarks --save            # run everything and store the results as the new baseline
+    python -m benchmarks -k signing        # only run benchmarks whose name contains "signing"
+
+Exits with status 1 when a benchmark is slower than the baseline by more than --tolerance.
+"""
+
+import argparse
+import os
+import sys
+
+from benchmarks import harness, hot_paths  # noqa: F401 pylint: disable=unused-import
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), ".baselines", "hot_paths.json")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark SDK hot paths")
+    parser.add_argument("-k", dest="names", action="append", help="only run benchmarks whose name contains this")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline file to compare against or save to")
+    parser.add_argument("--save", action="store_true", help="save the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown before flagging, 0.15 = 15%%")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per timing loop")
+    parser.add_argument("--repeat", type=int, default=5, help="timing loops per benchmark, the best is kept")
+    args = parser.parse_args()
+
+    results = harness.run(args.names, args.min_time, args.repeat)
+    baseline = harness.load_baseline(args.baseline) if os.path.exists(args.baseline) and not args.save else {}
+
+    regressions = 0
+    width = max(len(result.name) for result in results) if results else 0
+    print(f"{'benchmark':<{width}}  {'time/op':>10}  {'ops/s':>12}  {'baseline':>10}  {'change':>8}")
+    for comparison, result in zip(harness.compare(baseline, results), results):
+        flag = ""
+        baseline_column = change_column = "-"
+        if comparison.baseline_ns is not None and comparison.change is not None:
+            baseline_column = harness.format_ns(comparison.baseline_ns)
+            change_column = f"{comparison.change:+.1%}"
+            if comparison.change > args.tolerance:
+                flag = "  REGRESSION"
+                regressions += 1
+        print(
+            f"{result.name:<{width}}  {harness.format_ns(result.ns_per_op):>10}  {result.ops_per_sec:>12,.0f}"
+            f"  {baseline_column:>10}  {change_column:>8}{flag}"
+        )
+
+    if args.save:
+        harness.save_baseline(args.baseline, results)
+        print(f"saved baseline to {args.baseline}")
+    if regressions:
+        print(f"{regressions} benchmark(s) regressed by more than {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Websocket frames shaped like the ones recorded from mainnet, generated deterministically so benchmarks run offline."""
+
+import json
+
+from hyperliquid.utils.types import Any, Dict, List
+
+USER = "0x5e9ee1089755c3435139848e47e6635505d5a13a"
+N_ASSETS = 200
+N_POSITIONS = 12
+N_OPEN_ORDERS = 40
+N_LEVELS = 20
+SERVER_TIME = 1_700_000_000_000
+
+
+def coin_name(i: int) -> str:
+    return "BTC" if i == 0 else f"COIN{i}"
+
+
+def l2_book_msg(coin: str = "BTC", mid: float = 65000.0, n_levels: int = N_LEVELS) -> Dict[str, Any]:
+    tick = mid * 1e-5
+    bids = [
+        {"px": f"{mid - tick * (i + 1):.1f}", "sz": f"{0.1 + i * 0.37:.5f}", "n": 1 + i % 7} for i in range(n_levels)
+    ]
+    asks = [
+        {"px": f"{mid + tick * (i + 1):.1f}", "sz": f"{0.2 + i * 0.29:.5f}", "n": 1 + i % 5} for i in range(n_levels)
+    ]
+    return {"channel": "l2Book", "data": {"coin": coin, "time": SERVER_TIME, "levels": [bids, asks]}}
+
+
+def trades_msg(coin: str = "BTC", n_trades: int = 10) -> Dict[str, Any]:
+    trades = [
+        {
+            "coin": coin,
+            "side": "B" if i % 2 else "A",
+            "px": f"{65000 + i * 0.5:.1f}",
+            "sz": f"{0.01 * (i + 1):.5f}",
+            "hash": "0x" + f"{i:064x}",
+            "time": SERVER_TIME + i,
+            "tid": 1000 + i,
+            "users": [USER, "0x0000000000000000000000000000000000000000"],
+        }
+        for i in range(n_trades)
+    ]
+    return {"channel": "trades", "data": trades}
+
+
+def _position(i: int) -> Dict[str, Any]:
+    return {
+        "type": "oneWay",
+        "position": {
+            "coin": coin_name(i),
+            "szi": f"{(i + 1) * (1 if i % 2 else -1) * 1.5:.4f}",
+            "leverage": {"type": "cross", "value": 10},
+            "entryPx": f"{100 + i * 3.25:.4f}",
+            "positionValue": f"{(i + 1) * 150.0:.2f}",
+            "unrealizedPnl": f"{(i - 6) * 12.5:.4f}",
+            "returnOnEquity": f"{(i - 6) * 0.01:.6f}",
+            "liquidationPx": f"{50 + i * 2.0:.4f}",
+            "marginUsed": f"{(i + 1) * 15.0:.4f}",
+            "maxLeverage": 40,
+            "cumFunding": {"allTime": "12.3", "sinceOpen": "1.2", "sinceChange": "0.4"},
+        },
+    }
+
+
+def _open_order(i: int) -> Dict[str, Any]:
+    return {
+        "coin": coin_name(i % N_POSITIONS),
+        "side": "B" if i % 2 else "A",
+        "limitPx": f"{100 + i * 0.75:.2f}",
+        "sz": f"{0.5 + i * 0.1:.2f}",
+        "oid": 40_000_000_000 + i,
+        "timestamp": SERVER_TIME - i * 1000,
+        "origSz": f"{0.5 + i * 0.1:.2f}",
+        "triggerCondition": "N/A",
+        "isTrigger": False,
+        "triggerPx": "0.0",
+        "children": [],
+        "isPositionTpsl": False,
+        "reduceOnly": False,
+        "orderType": "Limit",
+        "tif": "Gtc",
+        "cloid": None,
+    }
+
+
+def _asset_ctx(i: int) -> Dict[str, Any]:
+    px = 100 + i * 3.25
+    return {
+        "funding": "0.0000125",
+        "openInterest": f"{1000 + i * 10.5:.2f}",
+        "prevDayPx": f"{px * 0.99:.4f}",
+        "dayNtlVlm": f"{1_000_000 + i * 1234.5:.2f}",
+        "premium": "0.0001",
+        "oraclePx": f"{px:.4f}",
+        "markPx": f"{px:.4f}",
+        "midPx": f"{px:.4f}",
+        "impactPxs": [f"{px * 0.9999:.4f}", f"{px * 1.0001:.4f}"],
+        "dayBaseVlm": f"{10_000 + i:.2f}",
+    }
+
+
+def web_data2_msg() -> Dict[str, Any]:
+    margin_summary = {
+        "accountValue": "1182.312496",
+        "totalNtlPos": "9860.5",
+        "totalRawUsd": "11042.8",
+        "totalMarginUsed": "986.05",
+    }
+    universe: List[Dict[str, Any]] = [
+        {"szDecimals": 2, "name": coin_name(i), "maxLeverage": 20, "marginTableId": 20} for i in range(N_ASSETS)
+    ]
+    return {
+        "channel": "webData2",
+        "data": {
+            "clearinghouseState": {
+                "marginSummary": margin_summary,
+                "crossMarginSummary": margin_summary,
+                "crossMaintenanceMarginUsed": "120.5",
+                "withdrawable": "196.26",
+                "assetPositions": [_position(i) for i in range(N_POSITIONS)],
+                "time": SERVER_TIME,
+            },
+            "leadingVaults": [],
+            "totalVaultEquity": "0.0",
+            "openOrders": [_open_order(i) for i in range(N_OPEN_ORDERS)],
+            "agentAddress": None,
+            "agentValidUntil": None,
+            "cumLedger": "1000.0",
+            "meta": {"universe": universe, "marginTables": []},
+            "assetCtxs": [_asset_ctx(i) for i in range(N_ASSETS)],
+            "serverTime": SERVER_TIME,
+            "isVault": False,
+            "user": USER,
+            "twapStates": [],
+            "spotState": {
+                "balances": [{"coin": "USDC", "token": 0, "hold": "0.0", "total": "12.5", "entryNtl": "0.0"}]
+            },
+            "perpsAtOpenInterestCap": [],
+        },
+    }
+
+
+def encode(msg: Dict[str, Any]) -> str:
+    return json.dumps(msg, separators=(",", ":"))
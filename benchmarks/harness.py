@@ -0,0 +1,116 @@
+import json
+import os
+import platform
+import tempfile
+import time
+
+from hyperliquid.utils.types import Any, Callable, Dict, List, NamedTuple, Optional
+
+# A benchmark is a setup function returning the zero argument operation to time
+Setup = Callable[[], Callable[[], Any]]
+
+BenchmarkResult = NamedTuple(
+    "BenchmarkResult", [("name", str), ("ns_per_op", float), ("ops_per_sec", float), ("iterations", int)]
+)
+Comparison = NamedTuple(
+    "Comparison", [("name", str), ("baseline_ns", Optional[float]), ("current_ns", float), ("change", Optional[float])]
+)
+
+REGISTRY: Dict[str, Setup] = {}
+# registered by setups and run, last first, once their benchmark has been measured
+_cleanups: List[Callable[[], Any]] = []
+
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    def register(setup: Setup) -> Setup:
+        if name in REGISTRY:
+            raise ValueError("duplicate benchmark", name)
+        REGISTRY[name] = setup
+        return setup
+
+    return register
+
+
+def add_cleanup(fn: Callable[[], Any]) -> None:
+    _cleanups.append(fn)
+
+
+def temp_dir() -> str:
+    """A temporary directory for a setup, removed by cleanup()."""
+    directory = tempfile.TemporaryDirectory(prefix="hyperliquid-bench-")
+    add_cleanup(directory.cleanup)
+    return directory.name
+
+
+def cleanup() -> None:
+    while _cleanups:
+        _cleanups.pop()()
+
+
+def measure(name: str, op: Callable[[], Any], min_time: float = 0.2, repeat: int = 5) -> BenchmarkResult:
+    """Time op like timeit: calibrate a loop count that runs for at least min_time, keep the best of repeat loops."""
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            op()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        iterations *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            op()
+        best = min(best, time.perf_counter() - start)
+    ns_per_op = best / iterations * 1e9
+    return BenchmarkResult(name, ns_per_op, 1e9 / ns_per_op, iterations)
+
+
+def run(names: Optional[List[str]] = None, min_time: float = 0.2, repeat: int = 5) -> List[BenchmarkResult]:
+    results = []
+    for name, setup in REGISTRY.items():
+        if names and not any(selected in name for selected in names):
+            continue
+        try:
+            results.append(measure(name, setup(), min_time, repeat))
+        finally:
+            cleanup()
+    return results
+
+
+def save_baseline(path: str, results: List[BenchmarkResult]) -> None:
+    baseline = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": {result.name: result.ns_per_op for result in results},
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> Dict[str, float]:
+    with open(path) as f:
+        results: Dict[str, float] = json.load(f)["results"]
+        return results
+
+
+def compare(baseline: Dict[str, float], results: List[BenchmarkResult]) -> List[Comparison]:
+    comparisons = []
+    for result in results:
+        baseline_ns = baseline.get(result.name)
+        change = None if baseline_ns is None else result.ns_per_op / baseline_ns - 1
+        comparisons.append(Comparison(result.name, baseline_ns, result.ns_per_op, change))
+    return comparisons
+
+
+def format_ns(ns: float) -> str:
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f}{unit}"
+    return f"{ns:.0f}ns"
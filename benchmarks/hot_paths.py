@@ -0,0 +1,226 @@
+import itertools
+import json
+
+import eth_account
+
+from benchmarks import frames, harness
+from benchmarks.harness import benchmark
+from hyperliquid.bars import BarBuilder, dollar_bars, tick_bars, time_bars
+from hyperliquid.order_book import ASK, L2Book
+from hyperliquid.recorder import TickRecorder
+from hyperliquid.tick_store import TickStore
+from hyperliquid.utils.signing import (
+    OrderRequest,
+    action_hash,
+    order_request_to_order_wire,
+    order_wires_to_order_action,
+    pack_batch_modify_action,
+    pack_modify_wire,
+    pack_order_wire,
+    sign_l1_action,
+)
+from hyperliquid.utils.types import Any, Callable, Cloid, List
+from hyperliquid.websocket_manager import ActiveSubscription, WebsocketManager, ws_msg_to_identifier
+
+PRIVATE_KEY = "0x0123456789012345678901234567890123456789012345678901234567890123"
+VAULT_ADDRESS = "0x1719884eb866cb12b2287399b15f7db5e7d775ea"
+NONCE = 1_700_000_000_000
+
+
+def order_requests(n: int) -> List[OrderRequest]:
+    return [
+        {
+            "coin": "ETH",
+            "is_buy": i % 2 == 0,
+            "sz": 0.0147 + i * 0.001,
+            "limit_px": 1670.1 + i * 0.1,
+            "reduce_only": False,
+            "order_type": {"limit": {"tif": "Gtc"}},
+            "cloid": Cloid.from_int(i + 1),
+        }
+        for i in range(n)
+    ]
+
+
+def order_action(n: int) -> Any:
+    return order_wires_to_order_action([order_request_to_order_wire(order, 4) for order in order_requests(n)])
+
+
+def batch_modify_action(n: int) -> Any:
+    return {
+        "type": "batchModify",
+        "modifies": [
+            {"oid": 40_000_000_000 + i, "order": order_request_to_order_wire(order, 4)}
+            for i, order in enumerate(order_requests(n))
+        ],
+    }
+
+
+@benchmark("signing.sign_l1_action[order x1]")
+def sign_single_order():
+    wallet = eth_account.Account.from_key(PRIVATE_KEY)
+    action = order_action(1)
+    return lambda: sign_l1_action(wallet, action, None, NONCE, None, True)
+
+
+@benchmark("signing.action_hash[order x1]")
+def hash_single_order():
+    action = order_action(1)
+    return lambda: action_hash(action, None, NONCE, None)
+
+
+@benchmark("signing.action_hash[batchModify x50 vault expires]")
+def hash_batch_modify():
+    action = batch_modify_action(50)
+    return lambda: action_hash(action, VAULT_ADDRESS, NONCE, NONCE + 5000)
+
+
+def _wire_benchmark(n: int) -> Callable[[], Any]:
+    orders = order_requests(n)
+
+    def op():
+        return [order_request_to_order_wire(order, 4) for order in orders]
+
+    return op
+
+
+@benchmark("signing.order_request_to_order_wire[x1]")
+def wire_1():
+    return _wire_benchmark(1)
+
+
+@benchmark("signing.order_request_to_order_wire[x10]")
+def wire_10():
+    return _wire_benchmark(10)
+
+
+@benchmark("signing.order_request_to_order_wire[x100]")
+def wire_100():
+    return _wire_benchmark(100)
+
+
+@benchmark("ws.ws_msg_to_identifier[l2Book]")
+def identifier_l2_book():
+    msg: Any = frames.l2_book_msg()
+    return lambda: ws_msg_to_identifier(msg)
+
+
+def _dispatch_benchmark(msg: Any) -> Callable[[], Any]:
+    manager = WebsocketManager("http://localhost")
+    received: List[Any] = []
+    identifier = ws_msg_to_identifier(msg)
+    assert identifier is not None
+    manager.active_subscriptions[identifier].append(ActiveSubscription(received.append, 1))
+    raw = frames.encode(msg)
+
+    def op():
+        manager.on_message(None, raw)
+        received.clear()
+
+    return op
+
+
+@benchmark("ws.on_message[l2Book]")
+def dispatch_l2_book():
+    return _dispatch_benchmark(frames.l2_book_msg())
+
+
+@benchmark("ws.on_message[trades x10]")
+def dispatch_trades():
+    return _dispatch_benchmark(frames.trades_msg())
+
+
+@benchmark("json.loads[l2Book]")
+def decode_l2_book():
+    raw = frames.encode(frames.l2_book_msg())
+    return lambda: json.loads(raw)
+
+
+@benchmark("json.loads[webData2]")
+def decode_web_data2():
+    raw = frames.encode(frames.web_data2_msg())
+    return lambda: json.loads(raw)
+
+
+@benchmark("signing.action_hash[batchModify x50 prepacked wires]")
+def hash_batch_modify_prepacked():
+    modifies = batch_modify_action(50)["modifies"]
+    packed = [pack_modify_wire(modify["oid"], pack_order_wire(modify["order"])) for modify in modifies]
+
+    def op():
+        # re-pricing one order of a resting batch only packs that order again
+        packed[0] = pack_modify_wire(modifies[0]["oid"], pack_order_wire(modifies[0]["order"]))
+        return action_hash(pack_batch_modify_action(packed), VAULT_ADDRESS, NONCE, NONCE + 5000)
+
+    return op
+
+
+@benchmark("order_book.on_l2_book[20 levels]")
+def order_book_update():
+    book = L2Book("BTC")
+    msg = frames.l2_book_msg()
+    return lambda: book.on_l2_book(msg)
+
+
+@benchmark("order_book.vwap[half the asks]")
+def order_book_vwap():
+    book = L2Book("BTC")
+    book.on_l2_book(frames.l2_book_msg())
+    sz = sum(sz for _, sz, _ in book.levels(ASK)) / 2
+    return lambda: book.vwap(True, sz)
+
+
+@benchmark("bars.on_trades[trades x10, 1s/5s/tick/dollar]")
+def bars_on_trades():
+    builder = BarBuilder(None, ["BTC"], [time_bars(1), time_bars(5), tick_bars(100), dollar_bars(1_000_000)])
+    msg = frames.trades_msg()
+    tids = itertools.count()
+
+    def op():
+        # fresh tids and times so no trade is dropped as a duplicate or as late
+        for trade in msg["data"]:
+            tid = next(tids)
+            trade["tid"] = tid
+            trade["time"] = frames.SERVER_TIME + tid * 10
+        builder.on_trades(msg)
+
+    return op
+
+
+@benchmark("recorder[100 x (trades x10 + l2Book 20 levels), flush zlib]")
+def recorder_feed():
+    recorder = TickRecorder(harness.temp_dir(), ["BTC"], fsync="never")
+    harness.add_cleanup(recorder.close)
+    trades = frames.trades_msg()
+    book = frames.l2_book_msg()
+
+    def op():
+        # one flush interval of a busy coin: 1000 trades and 100 books, encoded, compressed and written
+        for _ in range(100):
+            recorder.on_trades(trades)
+            recorder.on_l2_book(book)
+        recorder.flush()
+
+    return op
+
+
+@benchmark("tick_store.resample[100k trades, 1m bars]")
+def tick_store_resample():
+    root = harness.temp_dir()
+    recorder = TickRecorder(root, ["BTC"], compression=None, fsync="never")
+    msg = frames.trades_msg()
+    for i in range(10_000):
+        # one trade every 60ms, about 100 one minute bars
+        for j, trade in enumerate(msg["data"]):
+            trade["time"] = frames.SERVER_TIME + (i * 10 + j) * 60
+        recorder.on_trades(msg)
+        if i % 1000 == 999:
+            recorder.flush()
+    recorder.close()
+    store = TickStore(root)
+    harness.add_cleanup(store.close)
+
+    def op():
+        store.resample("BTC", 60_000, frames.SERVER_TIME, frames.SERVER_TIME + 6_000_000)
+
+    return op
@@ -0,0 +1,83 @@
+"""Import time budgets, measured with python -X importtime in fresh interpreters.
+
+    python -m benchmarks.import_time              # check every budget, exit 1 if one is exceeded
+    python -m benchmarks.import_time --repeat 10
+
+Read-only tools only need Info, so importing it must not pull in eth_account (about half a second) or
+websocket-client. Both are imported on first use instead: eth_account when something is signed, websocket-client
+when an Info is created without skip_ws. The time of a statement is the sum of the self times of every module it
+imports that a bare interpreter has not already imported, the best of --repeat runs.
+"""
+
+import argparse
+import subprocess
+import sys
+
+from hyperliquid.utils.types import Dict, FrozenSet, List, NamedTuple, Tuple
+
+# statement -> (budget in ms, modules it must not import)
+BUDGETS: Dict[str, Tuple[float, FrozenSet[str]]] = {
+    "from hyperliquid.info import Info": (300.0, frozenset({"eth_account", "eth_utils", "eth_keys", "websocket"})),
+    "from hyperliquid.exchange import Exchange": (350.0, frozenset({"eth_account", "eth_keys", "websocket"})),
+}
+
+ImportResult = NamedTuple(
+    "ImportResult", [("statement", str), ("ms", float), ("budget_ms", float), ("forbidden", List[str])]
+)
+
+
+def _import_times(statement: str) -> Dict[str, int]:
+    """Self time in microseconds of every module imported by running statement in a new interpreter."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(self_us)
+    return times
+
+
+def measure(statement: str, repeat: int = 5) -> Tuple[float, FrozenSet[str]]:
+    """(best time in ms, names of the modules imported) of statement on top of a bare interpreter."""
+    startup = set(_import_times("pass"))
+    best = float("inf")
+    modules: FrozenSet[str] = frozenset()
+    for _ in range(repeat):
+        times = {name: us for name, us in _import_times(statement).items() if name not in startup}
+        best = min(best, sum(times.values()) / 1000)
+        modules = frozenset(times)
+    return best, modules
+
+
+def check(repeat: int = 5) -> List[ImportResult]:
+    results = []
+    for statement, (budget_ms, forbidden) in BUDGETS.items():
+        ms, modules = measure(statement, repeat)
+        loaded = sorted(name for name in modules if name.split(".")[0] in forbidden)
+        results.append(ImportResult(statement, ms, budget_ms, loaded))
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check import time budgets")
+    parser.add_argument("--repeat", type=int, default=5, help="interpreters started per statement, the best is kept")
+    args = parser.parse_args()
+
+    failures = 0
+    for result in check(args.repeat):
+        flag = ""
+        if result.ms > result.budget_ms:
+            flag = "  OVER BUDGET"
+            failures += 1
+        if result.forbidden:
+            flag += f"  imports {', '.join(result.forbidden)}"
+            failures += 1
+        print(f"{result.statement:<45} {result.ms:>8.1f}ms  budget {result.budget_ms:.0f}ms{flag}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
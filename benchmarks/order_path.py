@@ -0,0 +1,318 @@
+"""Order path load test: Exchange.order, bulk_orders, bulk_modify_orders_new and bulk_cancel at increasing rates.
+
+    python -m benchmarks.order_path                           # against an in-process LocalServer
+    python -m benchmarks.order_path --rates 50,200 --duration 5 -k bulk
+    python -m benchmarks.order_path --url http://localhost:3001 --json order_path.json
+
+Operations are sent open loop: operation i is due at start + i / rate however long the earlier ones took, and its
+latency is measured from that due time. A stack that cannot keep up therefore shows growing queueing delay in the
+total percentiles instead of quietly sending less. Every operation is also split into stages by wrapping the
+functions Exchange calls: wire (order_request_to_order_wire, order_wires_to_order_action), hash (action_hash),
+sign (the rest of sign_l1_action), http (Exchange._post_action) and other (everything else in the Exchange method).
+
+Only point --url at a local server or a recorded endpoint, the orders are real.
+"""
+
+import argparse
+import itertools
+import json
+import sys
+import threading
+import time
+
+import eth_account
+
+import hyperliquid.exchange
+import hyperliquid.utils.signing
+from benchmarks.harness import format_ns
+from benchmarks.hot_paths import PRIVATE_KEY
+from hyperliquid.exchange import Exchange
+from hyperliquid.local_server import LocalServer
+from hyperliquid.utils.signing import CancelRequest, ModifyRequest, OrderRequest, OrderType
+from hyperliquid.utils.types import Any, Callable, Cloid, Dict, List, NamedTuple, Optional, Sequence
+
+STAGES = ("wire", "hash", "sign", "http", "other")
+PERCENTILES = (("p50", 0.5), ("p99", 0.99), ("p99.9", 0.999))
+COIN = "ETH"
+GTC: OrderType = {"limit": {"tif": "Gtc"}}
+# /exchange accepts at most 40 orders per request at the minimum weight, see OrderGateway
+SETUP_BATCH = 39
+# bulk_modify_orders_new cycles through this many groups of resting orders
+MODIFY_GROUPS = 16
+
+# prepare(exchange, batch, n_ops) places whatever the scenario needs and returns the operation to run for i in n_ops
+Prepare = Callable[[Exchange, int, int], Callable[[int], Any]]
+
+StepResult = NamedTuple(
+    "StepResult",
+    [
+        ("scenario", str),
+        ("batch", int),
+        ("rate", float),
+        ("ops", int),
+        ("errors", int),
+        ("achieved", float),
+        ("latency_ns", Dict[str, Dict[str, float]]),
+    ],
+)
+
+_local = threading.local()
+_cloid_counter = itertools.count(1)
+
+
+def _timed(stage: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            stages = getattr(_local, "stages", None)
+            if stages is not None:
+                stages[stage] += time.perf_counter_ns() - start
+
+    return wrapper
+
+
+class StageProbe:
+    """Wraps the functions on the order path with timers while active. Timings go to the calling thread's stages."""
+
+    TARGETS = (
+        (hyperliquid.exchange, "order_request_to_order_wire", "wire"),
+        (hyperliquid.exchange, "order_wires_to_order_action", "wire"),
+        (hyperliquid.exchange, "sign_l1_action", "sign"),
+        (hyperliquid.utils.signing, "action_hash", "hash"),
+        (Exchange, "_post_action", "http"),
+    )
+
+    def __enter__(self) -> "StageProbe":
+        self._originals = [(owner, name, getattr(owner, name)) for owner, name, _ in self.TARGETS]
+        for owner, name, stage in self.TARGETS:
+            setattr(owner, name, _timed(stage, getattr(owner, name)))
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        for owner, name, original in self._originals:
+            setattr(owner, name, original)
+
+
+def _bid(i: int, batch_index: int = 0) -> OrderRequest:
+    # far below any ETH price so nothing crosses, spread over 100 levels
+    return {
+        "coin": COIN,
+        "is_buy": True,
+        "sz": 0.01,
+        "limit_px": 1000.0 + (i * 7 + batch_index) % 100,
+        "order_type": GTC,
+        "reduce_only": False,
+    }
+
+
+def _place(exchange: Exchange, orders: List[OrderRequest]) -> List[int]:
+    oids = []
+    for start in range(0, len(orders), SETUP_BATCH):
+        response = exchange.bulk_orders(orders[start : start + SETUP_BATCH])
+        if response.get("status") != "ok":
+            raise RuntimeError(f"placing setup orders failed: {response}")
+        for status in response["response"]["data"]["statuses"]:
+            if "resting" not in status:
+                raise RuntimeError(f"setup order did not rest: {status}")
+            oids.append(status["resting"]["oid"])
+    return oids
+
+
+def prepare_order(exchange: Exchange, batch: int, n_ops: int) -> Callable[[int], Any]:
+    def op(i: int) -> Any:
+        order = _bid(i)
+        return exchange.order(COIN, True, order["sz"], order["limit_px"], GTC)
+
+    return op
+
+
+def prepare_bulk_orders(exchange: Exchange, batch: int, n_ops: int) -> Callable[[int], Any]:
+    return lambda i: exchange.bulk_orders([_bid(i, j) for j in range(batch)])
+
+
+def prepare_bulk_modify(exchange: Exchange, batch: int, n_ops: int) -> Callable[[int], Any]:
+    # orders are modified by cloid so the same groups can be modified over and over
+    cloids = [Cloid.from_int(next(_cloid_counter)) for _ in range(MODIFY_GROUPS * batch)]
+    orders = [_bid(i) for i in range(len(cloids))]
+    for order, cloid in zip(orders, cloids):
+        order["cloid"] = cloid
+    _place(exchange, orders)
+
+    def op(i: int) -> Any:
+        group = i % MODIFY_GROUPS
+        modifies: List[ModifyRequest] = []
+        for j in range(batch):
+            cloid = cloids[group * batch + j]
+            order = _bid(i, j)
+            order["cloid"] = cloid
+            modifies.append({"oid": cloid, "order": order})
+        return exchange.bulk_modify_orders_new(modifies)
+
+    return op
+
+
+def prepare_bulk_cancel(exchange: Exchange, batch: int, n_ops: int) -> Callable[[int], Any]:
+    oids = _place(exchange, [_bid(i) for i in range(n_ops * batch)])
+
+    def op(i: int) -> Any:
+        cancels: List[CancelRequest] = [{"coin": COIN, "oid": oid} for oid in oids[i * batch : (i + 1) * batch]]
+        return exchange.bulk_cancel(cancels)
+
+    return op
+
+
+SCENARIOS: Dict[str, Prepare] = {
+    "order": prepare_order,
+    "bulk_orders": prepare_bulk_orders,
+    "bulk_modify_orders_new": prepare_bulk_modify,
+    "bulk_cancel": prepare_bulk_cancel,
+}
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest rank percentile of an ascending list."""
+    if not sorted_values:
+        return float("nan")
+    rank = min(len(sorted_values) - 1, max(0, int(q * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+def _failed(response: Any) -> bool:
+    if not isinstance(response, dict) or response.get("status") != "ok":
+        return True
+    data = response["response"].get("data")
+    return data is not None and any(isinstance(status, dict) and "error" in status for status in data["statuses"])
+
+
+def run_step(
+    op: Callable[[int], Any], scenario: str, batch: int, rate: float, n_ops: int, concurrency: int
+) -> StepResult:
+    """Run n_ops operations due every 1 / rate seconds on concurrency threads."""
+    interval_ns = int(1e9 / rate)
+    samples: List[Dict[str, int]] = []
+    errors = [0]
+    counter = itertools.count()
+    lock = threading.Lock()
+    start_ns = time.perf_counter_ns() + 10_000_000
+
+    def worker() -> None:
+        while True:
+            i = next(counter)
+            if i >= n_ops:
+                return
+            due = start_ns + i * interval_ns
+            wait = due - time.perf_counter_ns()
+            if wait > 0:
+                time.sleep(wait / 1e9)
+            stages = dict.fromkeys(STAGES, 0)
+            _local.stages = stages
+            begin = time.perf_counter_ns()
+            try:
+                failed = _failed(op(i))
+            except Exception:  # pylint: disable=broad-exception-caught
+                failed = True
+            end = time.perf_counter_ns()
+            _local.stages = None
+            stages["sign"] -= stages["hash"]
+            stages["other"] = end - begin - sum(stages.values())
+            stages["service"] = end - begin
+            stages["total"] = end - due
+            with lock:
+                samples.append(stages)
+                errors[0] += failed
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+
+    latency_ns: Dict[str, Dict[str, float]] = {}
+    for stage in STAGES + ("service", "total"):
+        values = sorted(sample[stage] for sample in samples)
+        latency_ns[stage] = {label: percentile(values, q) for label, q in PERCENTILES}
+    return StepResult(scenario, batch, rate, n_ops, errors[0], n_ops / elapsed, latency_ns)
+
+
+def run(
+    exchange: Exchange,
+    scenarios: List[str],
+    rates: List[float],
+    duration: float,
+    batch: int = 10,
+    concurrency: int = 4,
+    report: Optional[Callable[[StepResult], None]] = None,
+) -> List[StepResult]:
+    results = []
+    with StageProbe():
+        for scenario in scenarios:
+            scenario_batch = 1 if scenario == "order" else batch
+            for rate in rates:
+                n_ops = max(1, int(rate * duration))
+                op = SCENARIOS[scenario](exchange, scenario_batch, n_ops)
+                result = run_step(op, scenario, scenario_batch, rate, n_ops, concurrency)
+                results.append(result)
+                if report is not None:
+                    report(result)
+    return results
+
+
+def print_header() -> None:
+    columns = ["scenario", "rate", "achieved", "errors"] + [f"total {label}" for label, _ in PERCENTILES]
+    columns += [f"{stage} p50" for stage in STAGES]
+    print(f"{columns[0]:<26}" + "".join(f"{column:>12}" for column in columns[1:]))
+
+
+def print_result(result: StepResult) -> None:
+    name = result.scenario if result.batch == 1 else f"{result.scenario}[x{result.batch}]"
+    cells = [f"{result.rate:.0f}/s", f"{result.achieved:.0f}/s", str(result.errors)]
+    cells += [format_ns(result.latency_ns["total"][label]) for label, _ in PERCENTILES]
+    cells += [format_ns(result.latency_ns[stage]["p50"]) for stage in STAGES]
+    print(f"{name:<26}" + "".join(f"{cell:>12}" for cell in cells), flush=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Order path throughput and latency benchmark")
+    parser.add_argument("--url", help="endpoint to drive, by default an in-process LocalServer is started")
+    parser.add_argument("-k", dest="names", action="append", help="only run scenarios whose name contains this")
+    parser.add_argument(
+        "--rates", default="25,50,100,200", help="comma separated operations per second to step through"
+    )
+    parser.add_argument("--duration", type=float, default=2.0, help="seconds per rate step")
+    parser.add_argument("--batch", type=int, default=10, help="orders or cancels per bulk operation")
+    parser.add_argument("--concurrency", type=int, default=4, help="threads sending operations")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this file")
+    parser.add_argument("--max-error-rate", type=float, default=0.0, help="exit 1 if more operations than this fail")
+    args = parser.parse_args()
+
+    scenarios = [name for name in SCENARIOS if not args.names or any(selected in name for selected in args.names)]
+    rates = [float(rate) for rate in args.rates.split(",")]
+    server = None
+    url = args.url
+    if url is None:
+        server = LocalServer().start()
+        url = server.base_url
+    try:
+        exchange = Exchange(eth_account.Account.from_key(PRIVATE_KEY), url)
+        print_header()
+        results = run(exchange, scenarios, rates, args.duration, args.batch, args.concurrency, print_result)
+    finally:
+        if server is not None:
+            server.stop()
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump([result._asdict() for result in results], f, indent=2)
+    ops = sum(result.ops for result in results)
+    errors = sum(result.errors for result in results)
+    if ops and errors / ops > args.max_error_rate:
+        print(f"{errors} of {ops} operations failed")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
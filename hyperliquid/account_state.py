@@ -0,0 +1,209 @@
+import logging
+import threading
+import time
+from collections import deque
+
+from hyperliquid.info import Info
+from hyperliquid.models import UserState
+from hyperliquid.utils.types import Any, Callable, Deque, Dict, Fill, List, Optional, Set, Subscription, Tuple
+
+# recent events kept for inspection and to re-apply fills on top of a new snapshot
+MAX_EVENTS = 1_000
+
+
+class AccountState:
+    """In-process mirror of one user's perp positions, margin, open orders and spot balances.
+
+    webData2 messages carry the full clearinghouse state, open orders and spot balances and replace the mirror.
+    Fills from userFills that are newer than the last snapshot move position sizes right away, until a snapshot
+    that includes them arrives. userFundings and userNonFundingLedgerUpdates events are kept as recent history.
+    With reconcile_interval the mirror is also replaced from REST every reconcile_interval seconds, e.g. in case
+    the websocket silently stalls. version increases on every change, time is the exchange time of the snapshot.
+
+    Only the default perp dex is mirrored, webData2 does not cover builder-deployed dexs.
+    """
+
+    def __init__(self, info: Info, address: str, reconcile_interval: Optional[float] = None):
+        self.info = info
+        self.address = address
+        self.reconcile_interval = reconcile_interval
+        self.version = 0
+        self.time = 0
+        self._clearinghouse_state: Optional[Any] = None
+        self._open_orders: List[Any] = []
+        self._balances: Dict[str, float] = {}
+        self._szi: Dict[str, float] = {}
+        self._model: Optional[UserState] = None
+        self.fills: Deque[Fill] = deque(maxlen=MAX_EVENTS)
+        self.fundings: Deque[Any] = deque(maxlen=MAX_EVENTS)
+        self.ledger_updates: Deque[Any] = deque(maxlen=MAX_EVENTS)
+        self._seen_tids: Set[int] = set()
+        self._lock = threading.RLock()
+        self._ready = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._subscriptions: List[Any] = []
+
+    def start(self) -> None:
+        """Subscribe to the account channels and seed the mirror over REST."""
+        channels: List[Tuple[Subscription, Callable[[Any], None]]] = [
+            ({"type": "webData2", "user": self.address}, self.on_web_data2),
+            ({"type": "userFills", "user": self.address}, self.on_user_fills),
+            ({"type": "userFundings", "user": self.address}, self.on_user_fundings),
+            ({"type": "userNonFundingLedgerUpdates", "user": self.address}, self.on_ledger_updates),
+        ]
+        for subscription, callback in channels:
+            self._subscriptions.append((subscription, self.info.subscribe(subscription, callback)))
+        self.reconcile()
+        if self.reconcile_interval is not None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="hyperliquid-account-state", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for subscription, subscription_id in self._subscriptions:
+            self.info.unsubscribe(subscription, subscription_id)
+        self._subscriptions = []
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the first snapshot, from the websocket or from REST."""
+        return self._ready.wait(timeout)
+
+    def _run(self) -> None:
+        assert self.reconcile_interval is not None
+        while not self._stop_event.wait(self.reconcile_interval):
+            try:
+                self.reconcile()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logging.warning(f"AccountState reconcile failed: {e!r}")
+
+    def reconcile(self) -> None:
+        """Replace the mirror with user_state, frontend_open_orders and spot_user_state fetched over REST."""
+        clearinghouse_state = self.info.user_state(self.address)
+        open_orders = self.info.frontend_open_orders(self.address)
+        spot_state = self.info.spot_user_state(self.address)
+        snapshot_time = clearinghouse_state.get("time") or int(time.time() * 1000)
+        self._apply_snapshot(clearinghouse_state, open_orders, spot_state, snapshot_time)
+
+    def on_web_data2(self, ws_msg: Any) -> None:
+        data = ws_msg["data"]
+        clearinghouse_state = data["clearinghouseState"]
+        snapshot_time = clearinghouse_state.get("time") or data.get("serverTime") or int(time.time() * 1000)
+        self._apply_snapshot(clearinghouse_state, data.get("openOrders", []), data.get("spotState"), snapshot_time)
+
+    def _apply_snapshot(
+        self, clearinghouse_state: Any, open_orders: List[Any], spot_state: Optional[Any], snapshot_time: int
+    ) -> None:
+        with self._lock:
+            if snapshot_time < self.time:
+                return
+            self.time = snapshot_time
+            self._clearinghouse_state = clearinghouse_state
+            self._open_orders = open_orders
+            if spot_state is not None:
+                self._balances = {balance["coin"]: float(balance["total"]) for balance in spot_state["balances"]}
+            self._szi = {
+                position["position"]["coin"]: float(position["position"]["szi"])
+                for position in clearinghouse_state["assetPositions"]
+            }
+            for fill in self.fills:
+                if fill["time"] > snapshot_time:
+                    self._apply_fill(fill)
+            self._model = None
+            self.version += 1
+        self._ready.set()
+
+    def _apply_fill(self, fill: Fill) -> None:
+        asset = self.info.coin_to_asset.get(fill["coin"])
+        if asset is not None and 10_000 <= asset < 110_000:
+            # spot fills move balances, which the next snapshot picks up
+            return
+        sz = float(fill["sz"]) if fill["side"] == "B" else -float(fill["sz"])
+        szi = self._szi.get(fill["coin"], 0.0) + sz
+        if asset is not None:
+            # summing floats leaves residuals such as 0.1 + 0.2 - 0.3, which would read as a dust position
+            szi = round(szi, self.info.asset_to_sz_decimals[asset])
+        self._szi[fill["coin"]] = szi
+
+    def on_user_fills(self, ws_msg: Any) -> None:
+        data = ws_msg["data"]
+        with self._lock:
+            for fill in data["fills"]:
+                if fill["tid"] in self._seen_tids:
+                    continue
+                if len(self.fills) == self.fills.maxlen:
+                    self._seen_tids.discard(self.fills[0]["tid"])
+                self._seen_tids.add(fill["tid"])
+                self.fills.append(fill)
+                # the snapshot sent on subscription repeats history that the mirror's snapshot already includes
+                if not data.get("isSnapshot") and fill["time"] > self.time:
+                    self._apply_fill(fill)
+            self.version += 1
+
+    def on_user_fundings(self, ws_msg: Any) -> None:
+        data = ws_msg["data"]
+        if data.get("isSnapshot"):
+            return
+        with self._lock:
+            self.fundings.extend(data["fundings"])
+            self.version += 1
+
+    def on_ledger_updates(self, ws_msg: Any) -> None:
+        data = ws_msg["data"]
+        if data.get("isSnapshot"):
+            return
+        with self._lock:
+            self.ledger_updates.extend(data["nonFundingLedgerUpdates"])
+            self.version += 1
+
+    def user_state(self) -> Any:
+        """The last clearinghouse state snapshot, shaped like Info.user_state. Fills since then are not applied."""
+        with self._lock:
+            return self._clearinghouse_state
+
+    def state(self) -> Optional[UserState]:
+        """The last snapshot as a UserState model, built once per snapshot."""
+        with self._lock:
+            if self._model is None and self._clearinghouse_state is not None:
+                self._model = UserState(self._clearinghouse_state)
+            return self._model
+
+    def position_size(self, coin: str) -> float:
+        """Signed size of the coin's position including fills newer than the last snapshot."""
+        with self._lock:
+            return self._szi.get(coin, 0.0)
+
+    def positions(self) -> Dict[str, float]:
+        """Signed size of every open position including fills newer than the last snapshot."""
+        with self._lock:
+            return {coin: szi for coin, szi in self._szi.items() if szi != 0}
+
+    def open_orders(self, coin: Optional[str] = None) -> List[Any]:
+        """Open orders of the last snapshot, shaped like Info.frontend_open_orders."""
+        with self._lock:
+            if coin is None:
+                return list(self._open_orders)
+            return [order for order in self._open_orders if order["coin"] == coin]
+
+    def balances(self) -> Dict[str, float]:
+        """Total spot balance by token."""
+        with self._lock:
+            return dict(self._balances)
+
+    @property
+    def account_value(self) -> float:
+        with self._lock:
+            if self._clearinghouse_state is None:
+                return 0.0
+            return float(self._clearinghouse_state["marginSummary"]["accountValue"])
+
+    @property
+    def withdrawable(self) -> float:
+        with self._lock:
+            if self._clearinghouse_state is None:
+                return 0.0
+            return float(self._clearinghouse_state["withdrawable"])
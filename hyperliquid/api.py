@@ -1,32 +1,105 @@
 import json
 import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from json import JSONDecodeError
 
 import requests
 
 from hyperliquid.utils.constants import MAINNET_API_URL
 from hyperliquid.utils.error import ClientError, ServerError
-from hyperliquid.utils.types import Any
+from hyperliquid.utils.rate_limit import RateLimiter, request_weight
+from hyperliquid.utils.retry import RetryPolicy
+from hyperliquid.utils.types import Any, List, Optional
 
 
 class API:
-    def __init__(self, base_url=None, timeout=None):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
         self.base_url = base_url or MAINNET_API_URL
         self.session = requests.Session()
         self.session.headers.update({"Content-Type": "application/json"})
         self._logger = logging.getLogger(__name__)
         self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        # created up front so concurrent hedged requests share one pool, its threads only start on first use
+        self._hedge_executor = ThreadPoolExecutor(thread_name_prefix="hyperliquid-hedge")
+
+    def close(self) -> None:
+        """Shut down the hedge threads and close the HTTP session."""
+        self._hedge_executor.shutdown(wait=False)
+        self.session.close()
 
     def post(self, url_path: str, payload: Any = None) -> Any:
         payload = payload or {}
-        url = self.base_url + url_path
-        response = self.session.post(url, json=payload, timeout=self.timeout)
+        # only /info requests are idempotent, /exchange actions must never be sent twice
+        if self.retry_policy is not None and url_path == "/info":
+            response = self._send_with_retries(url_path, payload, self.retry_policy)
+        else:
+            response = self._send(url_path, payload)
         self._handle_exception(response)
         try:
             return response.json()
         except ValueError:
             return {"error": f"Could not parse JSON: {response.text}"}
 
+    def _send(self, url_path: str, payload: Any) -> requests.Response:
+        if self.rate_limiter is not None:
+            waited = self.rate_limiter.acquire(request_weight(url_path, payload))
+            if waited > 0:
+                self._logger.debug(f"rate limiter delayed {url_path} request by {waited:.3f}s")
+        response = self.session.post(self.base_url + url_path, json=payload, timeout=self.timeout)
+        if response.status_code == 429 and self.rate_limiter is not None:
+            self.rate_limiter.drain()
+        return response
+
+    def _send_with_retries(self, url_path: str, payload: Any, policy: RetryPolicy) -> requests.Response:
+        policy.record_request()
+        attempt = 0
+        while True:
+            try:
+                response = self._send_hedged(url_path, payload, policy)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if not policy.should_retry(attempt):
+                    raise
+                delay = policy.backoff(attempt)
+                self._logger.debug(f"retrying {payload.get('type')} in {delay:.3f}s after {e!r}")
+            else:
+                if response.status_code not in policy.retry_status_codes or not policy.should_retry(attempt):
+                    return response
+                retry_after = policy.retry_after(response)
+                delay = policy.backoff(attempt) if retry_after is None else retry_after
+                self._logger.debug(f"retrying {payload.get('type')} in {delay:.3f}s after {response.status_code}")
+            attempt += 1
+            time.sleep(delay)
+
+    def _send_hedged(self, url_path: str, payload: Any, policy: RetryPolicy) -> requests.Response:
+        start = time.monotonic()
+        hedge_delay = policy.hedge_delay()
+        if hedge_delay is None:
+            response = self._send(url_path, payload)
+            policy.record_latency(time.monotonic() - start)
+            return response
+
+        pending: List[Future[requests.Response]] = [self._hedge_executor.submit(self._send, url_path, payload)]
+        done, _ = wait(pending, timeout=hedge_delay)
+        if not done and policy.should_hedge():
+            self._logger.debug(f"hedging {payload.get('type')} after {hedge_delay:.3f}s")
+            pending.append(self._hedge_executor.submit(self._send, url_path, payload))
+        while True:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.remove(future)
+                if future.exception() is None or not pending:
+                    policy.record_latency(time.monotonic() - start)
+                    return future.result()
+
     def _handle_exception(self, response):
         status_code = response.status_code
         if status_code < 400:
@@ -0,0 +1,299 @@
+"""Bars built locally from the trades channel: time bars of any length, tick, volume and dollar bars.
+
+    builder = BarBuilder(info, ["BTC", "ETH"], [time_bars(1), time_bars(5), dollar_bars(1_000_000)])
+    builder.start()
+    closes = builder.series("BTC", time_bars(5)).ring.column("close")
+
+Completed bars of every (coin, spec) go into a BarRing of preallocated arrays that keeps the last capacity bars,
+so memory stays bounded however long the builder runs. Trades are deduplicated by tid, the trades channel repeats
+recent trades when it is subscribed.
+
+Time bars close once a trade at least allowed_lateness_ms past their end has been seen, so trades delivered a little
+out of order still land in the right bar. Trades for a bar that has already closed are dropped and counted in
+late_trades. Intervals without trades produce no bar. Tick, volume and dollar bars close in arrival order, a trade
+that crosses the volume or dollar threshold is split between the bars so every bar has exactly the threshold.
+"""
+
+from array import array
+from collections import deque
+
+from hyperliquid.utils.types import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Set, Tuple
+
+BarSpec = NamedTuple("BarSpec", [("kind", str), ("size", float)])
+Bar = NamedTuple(
+    "Bar",
+    [
+        ("start", int),
+        ("end", int),
+        ("open", float),
+        ("high", float),
+        ("low", float),
+        ("close", float),
+        ("volume", float),
+        ("buy_volume", float),
+        ("notional", float),
+        ("trades", int),
+    ],
+)
+
+KINDS = ("time", "tick", "volume", "dollar")
+FLOAT_COLUMNS = ("open", "high", "low", "close", "volume", "buy_volume", "notional")
+INT_COLUMNS = ("start", "end", "trades")
+DEFAULT_CAPACITY = 4096
+DEFAULT_ALLOWED_LATENESS_MS = 250
+# tids remembered per coin to drop repeated trades
+MAX_SEEN_TIDS = 10_000
+
+
+def time_bars(seconds: float) -> BarSpec:
+    return BarSpec("time", seconds)
+
+
+def tick_bars(trades: int) -> BarSpec:
+    return BarSpec("tick", trades)
+
+
+def volume_bars(sz: float) -> BarSpec:
+    return BarSpec("volume", sz)
+
+
+def dollar_bars(notional: float) -> BarSpec:
+    return BarSpec("dollar", notional)
+
+
+class BarRing:
+    """The last capacity bars in one preallocated array per column, oldest first when read."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.count = 0
+        self.columns: Dict[str, Any] = {name: array("d", bytes(8 * capacity)) for name in FLOAT_COLUMNS}
+        self.columns.update({name: array("q", bytes(8 * capacity)) for name in INT_COLUMNS})
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def append(self, bar: Bar) -> None:
+        i = self.count % self.capacity
+        for name, value in zip(Bar._fields, bar):
+            self.columns[name][i] = value
+        self.count += 1
+
+    def __getitem__(self, i: int) -> Bar:
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("bar index out of range", i)
+        j = (self.count - n + i) % self.capacity
+        return Bar(*(self.columns[name][j] for name in Bar._fields))
+
+    def column(self, name: str, n: Optional[int] = None) -> Any:
+        """Copy of the last n values of a column, all kept bars by default, oldest first."""
+        kept = len(self)
+        n = kept if n is None else min(n, kept)
+        values = self.columns[name]
+        end = self.count % self.capacity if self.count >= self.capacity else self.count
+        start = end - n
+        if start >= 0:
+            return values[start:end]
+        return values[start + self.capacity :] + values[:end]
+
+    def bars(self, n: Optional[int] = None) -> List[Bar]:
+        kept = len(self)
+        n = kept if n is None else min(n, kept)
+        return [self[i] for i in range(kept - n, kept)]
+
+
+class _OpenBar:
+    __slots__ = ("start", "end", "open", "high", "low", "close", "volume", "buy_volume", "notional", "trades")
+
+    def __init__(self, start: int, px: float):
+        self.start = start
+        self.end = start
+        self.open = self.high = self.low = self.close = px
+        self.volume = self.buy_volume = self.notional = 0.0
+        self.trades = 0
+
+    def add(self, time: int, px: float, sz: float, is_buy: bool) -> None:
+        if px > self.high:
+            self.high = px
+        if px < self.low:
+            self.low = px
+        self.close = px
+        if time > self.end:
+            self.end = time
+        self.volume += sz
+        if is_buy:
+            self.buy_volume += sz
+        self.notional += px * sz
+        self.trades += 1
+
+    def bar(self) -> Bar:
+        return Bar(
+            self.start,
+            self.end,
+            self.open,
+            self.high,
+            self.low,
+            self.close,
+            self.volume,
+            self.buy_volume,
+            self.notional,
+            self.trades,
+        )
+
+
+class BarSeries:
+    """Bars of one coin for one spec."""
+
+    def __init__(
+        self,
+        coin: str,
+        spec: BarSpec,
+        capacity: int = DEFAULT_CAPACITY,
+        allowed_lateness_ms: int = DEFAULT_ALLOWED_LATENESS_MS,
+        on_bar: Optional[Callable[[str, BarSpec, Bar], None]] = None,
+    ):
+        if spec.kind not in KINDS:
+            raise ValueError("unknown bar kind", spec.kind)
+        if spec.size <= 0:
+            raise ValueError("bar size must be positive", spec.size)
+        self.coin = coin
+        self.spec = spec
+        self.ring = BarRing(capacity)
+        self.allowed_lateness_ms = allowed_lateness_ms
+        self.on_bar = on_bar
+        self.late_trades = 0
+        self._interval_ms = int(spec.size * 1000)
+        # time bars: open bars by start time, other kinds use the single bar under key 0
+        self._open: Dict[int, _OpenBar] = {}
+        self._closed_until = 0
+        self._watermark = 0
+
+    def _emit(self, open_bar: _OpenBar) -> None:
+        bar = open_bar.bar()
+        self.ring.append(bar)
+        if self.on_bar is not None:
+            self.on_bar(self.coin, self.spec, bar)
+
+    def add(self, time: int, px: float, sz: float, is_buy: bool) -> None:
+        if self.spec.kind == "time":
+            self._add_timed(time, px, sz, is_buy)
+        else:
+            self._add_counted(time, px, sz, is_buy)
+
+    def _add_timed(self, time: int, px: float, sz: float, is_buy: bool) -> None:
+        start = time - time % self._interval_ms
+        if start < self._closed_until:
+            self.late_trades += 1
+            return
+        open_bar = self._open.get(start)
+        if open_bar is None:
+            open_bar = self._open[start] = _OpenBar(start, px)
+        open_bar.add(time, px, sz, is_buy)
+        if time > self._watermark:
+            self._watermark = time
+            self.flush(time - self.allowed_lateness_ms)
+
+    def flush(self, until: int) -> None:
+        """Close every time bar that ends at or before until, e.g. on a timer when trading is quiet."""
+        if until < self._closed_until:
+            return
+        closable = [start for start in self._open if start + self._interval_ms <= until]
+        for start in sorted(closable):
+            self._emit(self._open.pop(start))
+        self._closed_until = max(self._closed_until, until - until % self._interval_ms)
+
+    def _add_counted(self, time: int, px: float, sz: float, is_buy: bool) -> None:
+        kind = self.spec.kind
+        while True:
+            open_bar = self._open.get(0)
+            if open_bar is None:
+                open_bar = self._open[0] = _OpenBar(time, px)
+            if kind == "tick":
+                open_bar.add(time, px, sz, is_buy)
+                full = open_bar.trades >= self.spec.size
+                sz = 0.0
+            else:
+                # volume and dollar bars take the part of the trade that fits and carry the rest over
+                filled = open_bar.volume if kind == "volume" else open_bar.notional
+                room = self.spec.size - filled
+                room_sz = room if kind == "volume" else room / px
+                take = min(sz, room_sz)
+                open_bar.add(time, px, take, is_buy)
+                sz -= take
+                full = take >= room_sz * (1 - 1e-12)
+            if full:
+                self._emit(self._open.pop(0))
+            if sz <= 1e-12:
+                return
+
+    def current(self) -> Optional[Bar]:
+        """The bar in progress, for time bars the latest one."""
+        if not self._open:
+            return None
+        return self._open[max(self._open)].bar()
+
+
+class BarBuilder:
+    """BarSeries for every coin and spec, fed from the trades channel of each coin."""
+
+    def __init__(
+        self,
+        info: Any,
+        coins: List[str],
+        specs: List[BarSpec],
+        capacity: int = DEFAULT_CAPACITY,
+        allowed_lateness_ms: int = DEFAULT_ALLOWED_LATENESS_MS,
+        on_bar: Optional[Callable[[str, BarSpec, Bar], None]] = None,
+    ):
+        self.info = info
+        self.coins = coins
+        self.specs = specs
+        self._series: Dict[Tuple[str, BarSpec], BarSeries] = {}
+        self._by_coin: Dict[str, List[BarSeries]] = {}
+        for coin in coins:
+            for spec in specs:
+                series = BarSeries(coin, spec, capacity, allowed_lateness_ms, on_bar)
+                self._series[(coin, spec)] = series
+                self._by_coin.setdefault(coin, []).append(series)
+        self._seen_tids: Dict[str, Tuple[Set[int], Deque[int]]] = {coin: (set(), deque()) for coin in coins}
+        self._subscriptions: List[Tuple[Any, int]] = []
+
+    def series(self, coin: str, spec: BarSpec) -> BarSeries:
+        return self._series[(coin, spec)]
+
+    def start(self) -> None:
+        for coin in self.coins:
+            subscription = {"type": "trades", "coin": coin}
+            self._subscriptions.append((subscription, self.info.subscribe(subscription, self.on_trades)))
+
+    def stop(self) -> None:
+        for subscription, subscription_id in self._subscriptions:
+            self.info.unsubscribe(subscription, subscription_id)
+        self._subscriptions = []
+
+    def on_trades(self, ws_msg: Any) -> None:
+        for trade in ws_msg["data"]:
+            coin = trade["coin"]
+            series_list = self._by_coin.get(coin)
+            if series_list is None:
+                continue
+            seen, order = self._seen_tids[coin]
+            tid = trade["tid"]
+            if tid in seen:
+                continue
+            seen.add(tid)
+            order.append(tid)
+            if len(order) > MAX_SEEN_TIDS:
+                seen.discard(order.popleft())
+            time, px, sz, is_buy = trade["time"], float(trade["px"]), float(trade["sz"]), trade["side"] == "B"
+            for series in series_list:
+                series.add(time, px, sz, is_buy)
+
+    def flush(self, until: int) -> None:
+        """Close time bars ending at or before until (exchange ms) on every series."""
+        for series in self._series.values():
+            if series.spec.kind == "time":
+                series.flush(until)
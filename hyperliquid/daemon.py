@@ -0,0 +1,295 @@
+"""Long running process that keeps an Info, optionally an Exchange, and websocket caches warm for short-lived tools.
+
+    python -m hyperliquid.daemon --user 0x... --coin BTC --coin ETH
+
+Tools then ask it over a Unix socket with hyperliquid.daemon_client.DaemonClient instead of importing the SDK,
+loading metadata and opening a websocket themselves. all_mids, l2_book and user_state are answered from the
+allMids, l2Book and webData2 subscriptions. A coin or user is subscribed on its first request, which is answered
+over REST like any request made while the websocket is down or the cached message is older than max_age. Other
+Info reads go through a ResponseCache. With an Exchange the daemon also forwards a fixed set of trading methods,
+so the socket is only accessible to the user running the daemon: it is created with mode 0600, in a directory
+other users cannot write to, and the daemon refuses to start on a path another user owns.
+
+The protocol is one JSON object per line in each direction: {"method": ..., "params": {...}} is answered by
+{"result": ...} or {"error": ...}. A connection can send any number of requests.
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import threading
+import time
+
+from hyperliquid.daemon_client import default_socket_path
+from hyperliquid.exchange import Exchange
+from hyperliquid.info import Info
+from hyperliquid.utils.cache import ResponseCache
+from hyperliquid.utils.types import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+# Info methods the "info" request may call, all of them reads
+INFO_METHODS: FrozenSet[str] = frozenset(
+    {
+        "user_state",
+        "spot_user_state",
+        "open_orders",
+        "frontend_open_orders",
+        "all_mids",
+        "user_fills",
+        "user_fills_by_time",
+        "meta",
+        "meta_and_asset_ctxs",
+        "perp_dexs",
+        "spot_meta",
+        "spot_meta_and_asset_ctxs",
+        "funding_history",
+        "user_funding_history",
+        "l2_snapshot",
+        "candles_snapshot",
+        "user_fees",
+        "user_staking_summary",
+        "user_staking_delegations",
+        "user_staking_rewards",
+        "query_order_by_oid",
+        "query_referral_state",
+        "query_sub_accounts",
+        "query_user_to_multi_sig_signers",
+        "query_perp_deploy_auction_status",
+        "name_to_asset",
+    }
+)
+
+# Exchange methods the "exchange" request may call, only if the daemon was given an Exchange
+EXCHANGE_METHODS: FrozenSet[str] = frozenset(
+    {
+        "order",
+        "bulk_orders",
+        "modify_order",
+        "market_open",
+        "market_close",
+        "cancel",
+        "bulk_cancel",
+        "schedule_cancel",
+        "update_leverage",
+        "update_isolated_margin",
+    }
+)
+
+DEFAULT_MAX_AGE = 10.0
+
+
+def _check_socket_dir(socket_path: str) -> None:
+    """Create the socket's directory with mode 0700 if it is missing and refuse one other users can write to."""
+    directory = os.path.dirname(os.path.abspath(socket_path))
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    # lstat, a symlink planted in place of the directory is refused as well
+    st = os.lstat(directory)
+    private = st.st_uid in (os.getuid(), 0) and not st.st_mode & 0o022
+    # in a sticky directory such as /tmp other users cannot remove or replace the socket
+    sticky = st.st_mode & stat.S_ISVTX
+    if not stat.S_ISDIR(st.st_mode) or not (private or sticky):
+        raise RuntimeError("the socket directory is writable by other users", directory)
+
+
+class Daemon:
+    def __init__(
+        self,
+        info: Info,
+        socket_path: Optional[str] = None,
+        exchange: Optional[Exchange] = None,
+        max_age: float = DEFAULT_MAX_AGE,
+    ):
+        self.info = info
+        self.exchange = exchange
+        self.socket_path = socket_path or default_socket_path()
+        self.max_age = max_age
+        self.started = time.time()
+        self.requests = 0
+        # cache key -> (monotonic time of the last message, data)
+        self._cached: Dict[str, Tuple[float, Any]] = {}
+        self._subscribed: Dict[str, Tuple[Any, int]] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[socketserver.ThreadingUnixStreamServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.methods: Dict[str, Callable[..., Any]] = {
+            "ping": self.ping,
+            "all_mids": self.all_mids,
+            "l2_book": self.l2_book,
+            "user_state": self.user_state,
+            "meta": self.meta,
+            "coin_to_asset": lambda: self.info.coin_to_asset,
+            "info": self.call_info,
+            "exchange": self.call_exchange,
+        }
+
+    def start(self) -> "Daemon":
+        _check_socket_dir(self.socket_path)
+        if os.path.lexists(self.socket_path):
+            if os.lstat(self.socket_path).st_uid != os.getuid():
+                raise RuntimeError("the socket path belongs to another user", self.socket_path)
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+            except OSError:
+                # left behind by a daemon that did not shut down cleanly
+                try:
+                    os.unlink(self.socket_path)
+                except PermissionError as e:
+                    raise RuntimeError("cannot remove the stale socket", self.socket_path) from e
+            else:
+                raise RuntimeError("a daemon is already listening on", self.socket_path)
+            finally:
+                probe.close()
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line in self.rfile:
+                    self.wfile.write(daemon.handle_line(line))
+                    self.wfile.flush()
+
+        # bind() creates the socket with the umask applied, chmod afterwards would leave it open for a moment
+        umask = os.umask(0o177)
+        try:
+            self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        finally:
+            os.umask(umask)
+        self._server.daemon_threads = True
+        if self.info.ws_manager is not None:
+            self._subscribe("allMids", {"type": "allMids"})
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            os.unlink(self.socket_path)
+        with self._lock:
+            subscribed = list(self._subscribed.values())
+            self._subscribed.clear()
+        for subscription, subscription_id in subscribed:
+            self.info.unsubscribe(subscription, subscription_id)
+
+    def handle_line(self, line: bytes) -> bytes:
+        self.requests += 1
+        try:
+            request = json.loads(line)
+            method = self.methods.get(request["method"])
+            if method is None:
+                raise ValueError("unknown method", request["method"])
+            response = {"result": method(**request.get("params", {}))}
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logging.debug("daemon request failed: %r", e)
+            response = {"error": f"{type(e).__name__}: {e}"}
+        return json.dumps(response).encode() + b"\n"
+
+    def _subscribe(self, key: str, subscription: Any) -> None:
+        """Subscribe once per key, every message replaces the cached data of key."""
+        if self.info.ws_manager is None:
+            return
+        with self._lock:
+            if key in self._subscribed:
+                return
+            self._subscribed[key] = (subscription, -1)
+
+        def on_message(ws_msg: Any) -> None:
+            self._cached[key] = (time.monotonic(), ws_msg["data"])
+
+        self._subscribed[key] = (subscription, self.info.subscribe(subscription, on_message))
+
+    def _fresh(self, key: str) -> Optional[Any]:
+        cached = self._cached.get(key)
+        if cached is None or time.monotonic() - cached[0] > self.max_age:
+            return None
+        return cached[1]
+
+    def ping(self) -> Any:
+        return {"pid": os.getpid(), "uptime": time.time() - self.started, "requests": self.requests}
+
+    def all_mids(self) -> Any:
+        data = self._fresh("allMids")
+        if data is None:
+            return self.info.all_mids()
+        return data["mids"]
+
+    def l2_book(self, coin: str) -> Any:
+        key = f"l2Book:{coin}"
+        self._subscribe(key, {"type": "l2Book", "coin": coin})
+        data = self._fresh(key)
+        if data is None:
+            return self.info.l2_snapshot(coin)
+        return data
+
+    def user_state(self, user: str) -> Any:
+        key = f"webData2:{user.lower()}"
+        self._subscribe(key, {"type": "webData2", "user": user})
+        data = self._fresh(key)
+        if data is None:
+            return self.info.user_state(user)
+        return data["clearinghouseState"]
+
+    def meta(self) -> Any:
+        return self.info.meta()
+
+    def call_info(self, name: str, args: List[Any]) -> Any:
+        if name not in INFO_METHODS:
+            raise ValueError("not an Info read method", name)
+        return getattr(self.info, name)(*args)
+
+    def call_exchange(self, name: str, args: List[Any], kwargs: Dict[str, Any]) -> Any:
+        if self.exchange is None:
+            raise ValueError("the daemon was started without an Exchange")
+        if name not in EXCHANGE_METHODS:
+            raise ValueError("not a forwarded Exchange method", name)
+        return getattr(self.exchange, name)(*args, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve warm Hyperliquid state to local tools over a Unix socket")
+    parser.add_argument("--url", help="API URL, defaults to mainnet")
+    parser.add_argument("--socket", help="socket path, defaults to $HYPERLIQUID_DAEMON_SOCKET or a per-user path")
+    parser.add_argument("--user", action="append", default=[], help="subscribe to this user's state up front")
+    parser.add_argument("--coin", action="append", default=[], help="subscribe to this coin's book up front")
+    parser.add_argument("--no-ws", action="store_true", help="answer everything over REST")
+    parser.add_argument(
+        "--exchange",
+        action="store_true",
+        help="forward trading methods, signing with the key in $HYPERLIQUID_SECRET_KEY",
+    )
+    parser.add_argument("--account", help="account address when the key is an agent wallet")
+    args = parser.parse_args()
+
+    info = Info(args.url, skip_ws=args.no_ws, cache=ResponseCache())
+    exchange = None
+    if args.exchange:
+        from eth_account import Account  # pylint: disable=import-outside-toplevel
+
+        wallet = Account.from_key(os.environ["HYPERLIQUID_SECRET_KEY"])
+        exchange = Exchange(
+            wallet, info.base_url, account_address=args.account, rate_limiter=info.rate_limiter, info=info
+        )
+    daemon = Daemon(info, args.socket, exchange).start()
+    for user in args.user:
+        daemon.user_state(user)
+    for coin in args.coin:
+        daemon.l2_book(coin)
+    print(f"serving on {daemon.socket_path}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        daemon.stop()
+        info.disconnect_websocket()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Thin client for hyperliquid.daemon. Only imports the standard library so short-lived scripts start quickly.
+
+    client = DaemonClient()
+    if client.available():
+        mids = client.all_mids()
+    else:
+        mids = Info(skip_ws=True).all_mids()
+
+available() is False and call() raises OSError when no daemon is running, so tools can fall back to the SDK.
+"""
+
+import json
+import os
+import socket
+import tempfile
+
+from hyperliquid.utils.types import Any, Optional
+
+
+def default_socket_path() -> str:
+    """$HYPERLIQUID_DAEMON_SOCKET, else a socket in $XDG_RUNTIME_DIR, else one in a per-user directory in the temp dir."""
+    path = os.environ.get("HYPERLIQUID_DAEMON_SOCKET")
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "hyperliquid-daemon.sock")
+    return os.path.join(tempfile.gettempdir(), f"hyperliquid-{os.getuid()}", "daemon.sock")
+
+
+class DaemonError(Exception):
+    """The daemon failed to answer a request, e.g. an unknown method or an error from the API."""
+
+
+class DaemonClient:
+    """One connection to a daemon, opened on first use and reused for every later request. Not thread safe."""
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: Optional[float] = 10.0):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._file: Any = None
+
+    def available(self) -> bool:
+        try:
+            self.call("ping")
+        except OSError:
+            return False
+        return True
+
+    def _connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+        self._file = sock.makefile("rwb")
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._file.close()
+            self._sock.close()
+            self._sock = None
+            self._file = None
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def call(self, method: str, **params: Any) -> Any:
+        """Send one request and wait for its result. Raises OSError if the daemon is not reachable."""
+        if self._sock is None:
+            self._connect()
+        try:
+            self._file.write(json.dumps({"method": method, "params": params}).encode() + b"\n")
+            self._file.flush()
+            line = self._file.readline()
+        except OSError:
+            self.close()
+            raise
+        if not line:
+            self.close()
+            raise ConnectionError("daemon closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            raise DaemonError(response["error"])
+        return response["result"]
+
+    def all_mids(self) -> Any:
+        return self.call("all_mids")
+
+    def l2_book(self, coin: str) -> Any:
+        return self.call("l2_book", coin=coin)
+
+    def user_state(self, user: str) -> Any:
+        return self.call("user_state", user=user)
+
+    def meta(self) -> Any:
+        return self.call("meta")
+
+    def info(self, method: str, *args: Any) -> Any:
+        """Call a read method of the daemon's Info, e.g. info("open_orders", address)."""
+        return self.call("info", name=method, args=list(args))
+
+    def exchange(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Call one of the daemon's Exchange methods, e.g. exchange("cancel", "ETH", oid)."""
+        return self.call("exchange", name=method, args=list(args), kwargs=kwargs)
@@ -0,0 +1,157 @@
+import logging
+import threading
+import time
+
+from hyperliquid.exchange import Exchange
+from hyperliquid.order_tracker import OrderTracker
+from hyperliquid.utils.constants import MAINNET_API_URL
+from hyperliquid.utils.signing import sign_l1_action
+from hyperliquid.utils.types import Any, Dict, List, NamedTuple, Optional, Set
+
+# payload is None when there was nothing to cancel
+PresignedCancel = NamedTuple(
+    "PresignedCancel", [("payload", Any), ("nonce", int), ("oids", Set[int]), ("version", int)]
+)
+# the exchange rejects nonces more than a day ahead of its clock
+MAX_PRESIGN_HORIZON_MS = 86_400_000
+
+
+class DeadmanSwitch:
+    """Keeps a rolling schedule_cancel heartbeat and a pre-signed cancel of every known resting order.
+
+    Every heartbeat_interval seconds the exchange side dead man's switch is pushed cancel_after seconds into
+    the future, so if this process stops heartbeating all open orders get canceled by the exchange. Meanwhile
+    a cancel action for every open order known to the tracker is kept signed, and re-signed whenever the tracker
+    changes, so panic() only has to post it.
+
+    Pre-signed actions use a nonce presign_horizon_ms ahead of the clock: the exchange only accepts nonces
+    larger than the smallest of the 100 highest it has seen, so a nonce taken at signing time would be rejected
+    once the strategy sent 100 more actions. Payloads are re-signed before the clock reaches half the horizon.
+    The exchange only accepts nonces up to a day ahead, so the horizon must be shorter than that.
+    """
+
+    def __init__(
+        self,
+        exchange: Exchange,
+        tracker: OrderTracker,
+        heartbeat_interval: float = 10.0,
+        cancel_after: float = 30.0,
+        refresh_interval: float = 0.25,
+        presign_horizon_ms: int = 60_000,
+    ):
+        if cancel_after < 5:
+            raise ValueError("schedule_cancel requires at least 5 seconds", cancel_after)
+        if heartbeat_interval >= cancel_after:
+            raise ValueError("heartbeat_interval must be shorter than cancel_after", heartbeat_interval)
+        if not 0 < presign_horizon_ms < MAX_PRESIGN_HORIZON_MS:
+            raise ValueError("presign_horizon_ms must be positive and less than a day", presign_horizon_ms)
+        self.exchange = exchange
+        self.tracker = tracker
+        self.heartbeat_interval = heartbeat_interval
+        self.cancel_after = cancel_after
+        self.refresh_interval = refresh_interval
+        self.presign_horizon_ms = presign_horizon_ms
+        self.presigned: Optional[PresignedCancel] = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="hyperliquid-deadman-switch", daemon=True)
+
+    def start(self) -> None:
+        self.heartbeat()
+        self.refresh()
+        self._thread.start()
+
+    def stop(self, disarm: bool = True) -> None:
+        """Stop heartbeating. With disarm the scheduled cancel is removed, otherwise it fires cancel_after later."""
+        self._stop_event.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        if disarm:
+            self.exchange.schedule_cancel(None)
+
+    def heartbeat(self) -> Any:
+        return self.exchange.schedule_cancel(self.exchange.now_ms() + int(self.cancel_after * 1000))
+
+    def refresh(self, force: bool = False) -> None:
+        """Re-sign the cancel payload if the tracked orders changed or the pre-signed nonce is getting old."""
+        with self._lock:
+            self._refresh(force)
+
+    def _refresh(self, force: bool) -> None:
+        version = self.tracker.version
+        presigned = self.presigned
+        if (
+            not force
+            and presigned is not None
+            and presigned.version == version
+            and self.exchange.now_ms() < presigned.nonce - self.presign_horizon_ms // 2
+        ):
+            return
+        orders = self.tracker.open_orders()
+        cancels = [{"a": self.exchange.info.name_to_asset(order.coin), "o": order.oid} for order in orders]
+        if not cancels:
+            self.presigned = PresignedCancel(None, 0, set(), version)
+            return
+        nonce = self.exchange.now_ms() + self.presign_horizon_ms
+        action = {"type": "cancel", "cancels": cancels}
+        signature = sign_l1_action(
+            self.exchange.wallet,
+            action,
+            self.exchange.vault_address,
+            nonce,
+            None,
+            self.exchange.base_url == MAINNET_API_URL,
+        )
+        payload = {
+            "action": action,
+            "nonce": nonce,
+            "signature": signature,
+            "vaultAddress": self.exchange.vault_address,
+            "expiresAfter": None,
+        }
+        self.presigned = PresignedCancel(payload, nonce, {order.oid for order in orders}, version)
+
+    def panic(self) -> Dict[str, Any]:
+        """Cancel every known resting order right away.
+
+        Sends the pre-signed cancel, then a freshly signed cancel for any order the tracker learned about since the
+        payload was signed.
+
+        Returns:
+            {
+                presigned: response to the pre-signed cancel, or None if there was nothing to send,
+                remaining: bulk_cancel response for orders not covered by it, or None
+            }
+        """
+        with self._lock:
+            presigned = self.presigned
+            result: Dict[str, Any] = {"presigned": None, "remaining": None}
+            covered: Set[int] = set()
+            if presigned is not None and presigned.payload is not None:
+                # posted as signed, Exchange._post_action would replace expiresAfter with the exchange's current one
+                result["presigned"] = self.exchange.post("/exchange", presigned.payload)
+                covered = presigned.oids
+                # the nonce is spent, the next refresh has to sign a new payload
+                self.presigned = None
+            remaining: List[Any] = [
+                {"coin": order.coin, "oid": order.oid}
+                for order in self.tracker.open_orders()
+                if order.oid not in covered
+            ]
+            if remaining:
+                result["remaining"] = self.exchange.bulk_cancel(remaining)
+            logging.info(f"DeadmanSwitch panic canceled {len(covered)} pre-signed and {len(remaining)} other orders")
+            return result
+
+    def _run(self) -> None:
+        next_heartbeat = time.monotonic() + self.heartbeat_interval
+        while not self._stop_event.wait(self.refresh_interval):
+            try:
+                if time.monotonic() >= next_heartbeat:
+                    next_heartbeat = time.monotonic() + self.heartbeat_interval
+                    response = self.heartbeat()
+                    if response.get("status") != "ok":
+                        logging.error(f"DeadmanSwitch schedule_cancel rejected: {response}")
+                self.refresh()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logging.error(f"DeadmanSwitch heartbeat failed: {e!r}")
@@ -1,13 +1,16 @@
+from typing import TYPE_CHECKING
+
 import json
 import logging
 import secrets
-
-import eth_account
-from eth_account.signers.local import LocalAccount
+import threading
 
 from hyperliquid.api import API
 from hyperliquid.info import Info
+from hyperliquid.utils.clock import ExchangeClock
 from hyperliquid.utils.constants import MAINNET_API_URL
+from hyperliquid.utils.rate_limit import RateLimiter
+from hyperliquid.utils.retry import RetryPolicy
 from hyperliquid.utils.signing import (
     CancelByCloidRequest,
     CancelRequest,
@@ -42,10 +45,16 @@ from hyperliquid.utils.types import (
     Meta,
     Optional,
     PerpDexSchemaInput,
+    Set,
     SpotMeta,
     Tuple,
 )
 
+if TYPE_CHECKING:
+    from eth_account.signers.local import LocalAccount
+
+    from hyperliquid.account_state import AccountState
+
 
 class Exchange(API):
     # Default Max Slippage for Market Orders 5%
@@ -53,7 +62,7 @@ class Exchange(API):
 
     def __init__(
         self,
-        wallet: LocalAccount,
+        wallet: "LocalAccount",
         base_url: Optional[str] = None,
         meta: Optional[Meta] = None,
         vault_address: Optional[str] = None,
@@ -61,13 +70,31 @@ class Exchange(API):
         spot_meta: Optional[SpotMeta] = None,
         perp_dexs: Optional[List[str]] = None,
         timeout: Optional[float] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        info: Optional[Info] = None,
+        clock: Optional[ExchangeClock] = None,
     ):
-        super().__init__(base_url, timeout)
+        # retry_policy only applies to the /info reads of the embedded Info, /exchange actions are never retried.
+        # Passing an existing info shares its asset tables, then meta, spot_meta and perp_dexs are ignored.
+        if base_url is None and info is not None:
+            base_url = info.base_url
+        super().__init__(base_url, timeout, rate_limiter)
         self.wallet = wallet
         self.vault_address = vault_address
         self.account_address = account_address
-        self.info = Info(base_url, True, meta, spot_meta, perp_dexs, timeout)
-        self.expires_after: Optional[int] = None
+        if info is None:
+            info = Info(base_url, True, meta, spot_meta, perp_dexs, timeout, rate_limiter, retry_policy)
+        self.info = info
+        # nonces and relative expiries follow the exchange clock when a clock is given, the local clock otherwise
+        self.clock = clock
+        # with an AccountState mirror of this exchange's user, market_close reads positions from it instead of REST
+        self.account_state: Optional["AccountState"] = None
+        self._expires_after: Optional[int] = None
+        self._expires_in: Optional[int] = None
+        self._action = threading.local()
+        self._nonce_lock = threading.Lock()
+        self._last_nonce = 0
 
     def _post_action(self, action, signature, nonce):
         payload = {
@@ -80,6 +107,28 @@ class Exchange(API):
         logging.debug(payload)
         return self.post("/exchange", payload)
 
+    def now_ms(self) -> int:
+        return self.clock.now_ms() if self.clock is not None else get_timestamp_ms()
+
+    def _next_nonce(self) -> int:
+        # nonces are millisecond timestamps, bumped when several actions are signed within the same millisecond
+        with self._nonce_lock:
+            self._last_nonce = max(self.now_ms(), self._last_nonce + 1)
+            nonce = self._last_nonce
+        if self._expires_in is not None:
+            # the action being built on this thread expires relative to its own nonce, so the expiry that is
+            # signed and the one that is posted are the same even while other threads sign actions
+            self._action.expires_after = nonce + self._expires_in
+        return nonce
+
+    def _user_address(self) -> str:
+        address: str = self.wallet.address
+        if self.account_address:
+            address = self.account_address
+        if self.vault_address:
+            address = self.vault_address
+        return address
+
     def _slippage_price(
         self,
         name: str,
@@ -107,6 +156,26 @@ class Exchange(API):
     def set_expires_after(self, expires_after: Optional[int]) -> None:
         self.expires_after = expires_after
 
+    # every action signed from now on is rejected once the exchange clock passes its nonce plus expires_in
+    # milliseconds. With a clock the nonce is in exchange time, so short windows do not depend on the local clock.
+    def set_expires_in(self, expires_in: Optional[int]) -> None:
+        self._expires_after = None
+        self._expires_in = expires_in
+
+    @property
+    def expires_after(self) -> Optional[int]:
+        if self._expires_in is None:
+            return self._expires_after
+        expires_after: Optional[int] = getattr(self._action, "expires_after", None)
+        if expires_after is None:
+            return self.now_ms() + self._expires_in
+        return expires_after
+
+    @expires_after.setter
+    def expires_after(self, expires_after: Optional[int]) -> None:
+        self._expires_in = None
+        self._expires_after = expires_after
+
     def order(
         self,
         name: str,
@@ -134,7 +203,7 @@ class Exchange(API):
         order_wires: List[OrderWire] = [
             order_request_to_order_wire(order, self.info.name_to_asset(order["coin"])) for order in order_requests
         ]
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
 
         if builder:
             builder["b"] = builder["b"].lower()
@@ -181,7 +250,7 @@ class Exchange(API):
         return self.bulk_modify_orders_new([modify])
 
     def bulk_modify_orders_new(self, modify_requests: List[ModifyRequest]) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         modify_wires = [
             {
                 "oid": modify["oid"].to_raw() if isinstance(modify["oid"], Cloid) else modify["oid"],
@@ -236,33 +305,96 @@ class Exchange(API):
         cloid: Optional[Cloid] = None,
         builder: Optional[BuilderInfo] = None,
     ) -> Any:
-        address: str = self.wallet.address
-        if self.account_address:
-            address = self.account_address
-        if self.vault_address:
-            address = self.vault_address
-        positions = self.info.user_state(address)["assetPositions"]
-        for position in positions:
-            item = position["position"]
-            if coin != item["coin"]:
-                continue
-            szi = float(item["szi"])
-            if not sz:
-                sz = abs(szi)
-            is_buy = True if szi < 0 else False
-            # Get aggressive Market Price
-            px = self._slippage_price(coin, is_buy, slippage, px)
-            # Market Order is an aggressive Limit Order IoC
-            return self.order(
-                coin,
-                is_buy,
-                sz,
-                px,
-                order_type={"limit": {"tif": "Ioc"}},
-                reduce_only=True,
-                cloid=cloid,
-                builder=builder,
-            )
+        # the mirror is only read once it holds a snapshot, before that a missing position is not a closed one
+        if self.account_state is not None and self.account_state.wait_ready(0):
+            szi = self.account_state.position_size(coin)
+        else:
+            szi = 0.0
+            for position in self.info.user_state(self._user_address())["assetPositions"]:
+                if coin == position["position"]["coin"]:
+                    szi = float(position["position"]["szi"])
+        if szi == 0:
+            return None
+        if not sz:
+            sz = abs(szi)
+        is_buy = True if szi < 0 else False
+        # Get aggressive Market Price
+        px = self._slippage_price(coin, is_buy, slippage, px)
+        # Market Order is an aggressive Limit Order IoC
+        return self.order(
+            coin,
+            is_buy,
+            sz,
+            px,
+            order_type={"limit": {"tif": "Ioc"}},
+            reduce_only=True,
+            cloid=cloid,
+            builder=builder,
+        )
+
+    def close_all_positions(
+        self,
+        dexs: Optional[List[str]] = None,
+        coins: Optional[List[str]] = None,
+        slippage: float = DEFAULT_SLIPPAGE,
+        cancel_orders: bool = False,
+        builder: Optional[BuilderInfo] = None,
+    ) -> Any:
+        """Close every open position with reduce only IOC orders sent as a single bulk_orders action.
+
+        User state and mids are read once per dex instead of once per position as with market_close.
+
+        Args:
+            dexs (Optional[List[str]]): Perp dexs to flatten. Defaults to [""], the original dex.
+            coins (Optional[List[str]]): Only close positions in these coins. Defaults to all coins.
+            slippage (float): Max slippage from the mid price, as in market_close.
+            cancel_orders (bool): Also cancel the resting orders in the coins of the positions being closed, in
+                one bulk_cancel action sent before the closing orders. Orders in other coins, spot included, are
+                left alone.
+            builder (Optional[BuilderInfo]): Builder for the closing orders.
+        Returns:
+            {
+                cancel: bulk_cancel response, or None if nothing was canceled,
+                order: bulk_orders response, or None if there was nothing to close
+            }
+        """
+        address = self._user_address()
+        if dexs is None:
+            dexs = [""]
+        order_requests: List[OrderRequest] = []
+        cancel_requests: List[CancelRequest] = []
+        for dex in dexs:
+            mids = None
+            closing: Set[str] = set()
+            for position in self.info.user_state(address, dex)["assetPositions"]:
+                item = position["position"]
+                coin = item["coin"]
+                szi = float(item["szi"])
+                if szi == 0 or (coins is not None and coin not in coins):
+                    continue
+                closing.add(coin)
+                if mids is None:
+                    mids = self.info.all_mids(dex)
+                is_buy = szi < 0
+                order_requests.append(
+                    {
+                        "coin": coin,
+                        "is_buy": is_buy,
+                        "sz": abs(szi),
+                        "limit_px": self._slippage_price(coin, is_buy, slippage, float(mids[coin])),
+                        "order_type": {"limit": {"tif": "Ioc"}},
+                        "reduce_only": True,
+                    }
+                )
+            if cancel_orders and closing:
+                for order in self.info.open_orders(address, dex):
+                    if order["coin"] in closing:
+                        cancel_requests.append({"coin": order["coin"], "oid": order["oid"]})
+
+        return {
+            "cancel": self.bulk_cancel(cancel_requests) if cancel_requests else None,
+            "order": self.bulk_orders(order_requests, builder) if order_requests else None,
+        }
 
     def cancel(self, name: str, oid: int) -> Any:
         return self.bulk_cancel([{"coin": name, "oid": oid}])
@@ -271,7 +403,7 @@ class Exchange(API):
         return self.bulk_cancel_by_cloid([{"coin": name, "cloid": cloid}])
 
     def bulk_cancel(self, cancel_requests: List[CancelRequest]) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         cancel_action = {
             "type": "cancel",
             "cancels": [
@@ -298,7 +430,7 @@ class Exchange(API):
         )
 
     def bulk_cancel_by_cloid(self, cancel_requests: List[CancelByCloidRequest]) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
 
         cancel_action = {
             "type": "cancelByCloid",
@@ -333,7 +465,7 @@ class Exchange(API):
         Args:
             time (int): if time is not None, then set the cancel time in the future. If None, then unsets any cancel time in the future.
         """
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         schedule_cancel_action: ScheduleCancelAction = {
             "type": "scheduleCancel",
         }
@@ -354,7 +486,7 @@ class Exchange(API):
         )
 
     def update_leverage(self, leverage: int, name: str, is_cross: bool = True) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         update_leverage_action = {
             "type": "updateLeverage",
             "asset": self.info.name_to_asset(name),
@@ -376,7 +508,7 @@ class Exchange(API):
         )
 
     def update_isolated_margin(self, amount: float, name: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         amount = float_to_usd_int(amount)
         update_isolated_margin_action = {
             "type": "updateIsolatedMargin",
@@ -399,7 +531,7 @@ class Exchange(API):
         )
 
     def set_referrer(self, code: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         set_referrer_action = {
             "type": "setReferrer",
             "code": code,
@@ -419,7 +551,7 @@ class Exchange(API):
         )
 
     def create_sub_account(self, name: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         create_sub_account_action = {
             "type": "createSubAccount",
             "name": name,
@@ -439,7 +571,7 @@ class Exchange(API):
         )
 
     def usd_class_transfer(self, amount: float, to_perp: bool) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         str_amount = str(amount)
         if self.vault_address:
             str_amount += f" subaccount:{self.vault_address}"
@@ -462,7 +594,7 @@ class Exchange(API):
         For the default perp dex use the empty string "" as name. For spot use "spot".
         Token must match the collateral token if transferring to or from a perp dex.
         """
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         str_amount = str(amount)
 
         action = {
@@ -483,7 +615,7 @@ class Exchange(API):
         )
 
     def sub_account_transfer(self, sub_account_user: str, is_deposit: bool, usd: int) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         sub_account_transfer_action = {
             "type": "subAccountTransfer",
             "subAccountUser": sub_account_user,
@@ -505,7 +637,7 @@ class Exchange(API):
         )
 
     def sub_account_spot_transfer(self, sub_account_user: str, is_deposit: bool, token: str, amount: float) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         sub_account_transfer_action = {
             "type": "subAccountSpotTransfer",
             "subAccountUser": sub_account_user,
@@ -528,7 +660,7 @@ class Exchange(API):
         )
 
     def vault_usd_transfer(self, vault_address: str, is_deposit: bool, usd: int) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         vault_transfer_action = {
             "type": "vaultTransfer",
             "vaultAddress": vault_address,
@@ -544,7 +676,7 @@ class Exchange(API):
         )
 
     def usd_transfer(self, amount: float, destination: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         action = {"destination": destination, "amount": str(amount), "time": timestamp, "type": "usdSend"}
         is_mainnet = self.base_url == MAINNET_API_URL
         signature = sign_usd_transfer_action(self.wallet, action, is_mainnet)
@@ -555,7 +687,7 @@ class Exchange(API):
         )
 
     def spot_transfer(self, amount: float, destination: str, token: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         action = {
             "destination": destination,
             "amount": str(amount),
@@ -572,7 +704,7 @@ class Exchange(API):
         )
 
     def token_delegate(self, validator: str, wei: int, is_undelegate: bool) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         action = {
             "validator": validator,
             "wei": wei,
@@ -589,7 +721,7 @@ class Exchange(API):
         )
 
     def withdraw_from_bridge(self, amount: float, destination: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         action = {"destination": destination, "amount": str(amount), "time": timestamp, "type": "withdraw3"}
         is_mainnet = self.base_url == MAINNET_API_URL
         signature = sign_withdraw_from_bridge_action(self.wallet, action, is_mainnet)
@@ -600,9 +732,11 @@ class Exchange(API):
         )
 
     def approve_agent(self, name: Optional[str] = None) -> Tuple[Any, str]:
+        from eth_account import Account  # pylint: disable=import-outside-toplevel
+
         agent_key = "0x" + secrets.token_hex(32)
-        account = eth_account.Account.from_key(agent_key)
-        timestamp = get_timestamp_ms()
+        account = Account.from_key(agent_key)
+        timestamp = self._next_nonce()
         is_mainnet = self.base_url == MAINNET_API_URL
         action = {
             "type": "approveAgent",
@@ -624,14 +758,14 @@ class Exchange(API):
         )
 
     def approve_builder_fee(self, builder: str, max_fee_rate: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
 
         action = {"maxFeeRate": max_fee_rate, "builder": builder, "nonce": timestamp, "type": "approveBuilderFee"}
         signature = sign_approve_builder_fee(self.wallet, action, self.base_url == MAINNET_API_URL)
         return self._post_action(action, signature, timestamp)
 
     def convert_to_multi_sig_user(self, authorized_users: List[str], threshold: int) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         authorized_users = sorted(authorized_users)
         signers = {
             "authorizedUsers": authorized_users,
@@ -652,7 +786,7 @@ class Exchange(API):
     def spot_deploy_register_token(
         self, token_name: str, sz_decimals: int, wei_decimals: int, max_gas: int, full_name: str
     ) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         action = {
             "type": "spotDeploy",
             "registerToken2": {
@@ -678,7 +812,7 @@ class Exchange(API):
     def spot_deploy_user_genesis(
         self, token: int, user_and_wei: List[Tuple[str, str]], existing_token_and_wei: List[Tuple[int, str]]
     ) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         action = {
             "type": "spotDeploy",
             "userGenesis": {
@@ -705,7 +839,7 @@ class Exchange(API):
         return self.spot_deploy_token_action_inner("enableFreezePrivilege", token)
 
     def spot_deploy_freeze_user(self, token: int, user: str, freeze: bool) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         action = {
             "type": "spotDeploy",
             "freezeUser": {
@@ -735,7 +869,7 @@ class Exchange(API):
         return self.spot_deploy_token_action_inner("enableQuoteToken", token)
 
     def spot_deploy_token_action_inner(self, variant: str, token: int) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         action = {
             "type": "spotDeploy",
             variant: {
@@ -757,7 +891,7 @@ class Exchange(API):
         )
 
     def spot_deploy_genesis(self, token: int, max_supply: str, no_hyperliquidity: bool) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         genesis = {
             "token": token,
             "maxSupply": max_supply,
@@ -783,7 +917,7 @@ class Exchange(API):
         )
 
     def spot_deploy_register_spot(self, base_token: int, quote_token: int) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         action = {
             "type": "spotDeploy",
             "registerSpot": {
@@ -807,7 +941,7 @@ class Exchange(API):
     def spot_deploy_register_hyperliquidity(
         self, spot: int, start_px: float, order_sz: float, n_orders: int, n_seeded_levels: Optional[int]
     ) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         register_hyperliquidity = {
             "spot": spot,
             "startPx": str(start_px),
@@ -835,7 +969,7 @@ class Exchange(API):
         )
 
     def spot_deploy_set_deployer_trading_fee_share(self, token: int, share: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         action = {
             "type": "spotDeploy",
             "setDeployerTradingFeeShare": {
@@ -868,7 +1002,7 @@ class Exchange(API):
         only_isolated: bool,
         schema: Optional[PerpDexSchemaInput],
     ) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         schema_wire = None
         if schema is not None:
             schema_wire = {
@@ -911,7 +1045,7 @@ class Exchange(API):
         oracle_pxs: Dict[str, str],
         all_mark_pxs: List[Dict[str, str]],
     ) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         oracle_pxs_wire = sorted(list(oracle_pxs.items()))
         mark_pxs_wire = [sorted(list(mark_pxs.items())) for mark_pxs in all_mark_pxs]
         action = {
@@ -943,7 +1077,7 @@ class Exchange(API):
         return self.c_signer_inner("jailSelf")
 
     def c_signer_inner(self, variant: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         action = {
             "type": "CSignerAction",
             variant: None,
@@ -973,7 +1107,7 @@ class Exchange(API):
         unjailed: bool,
         initial_wei: int,
     ) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         action = {
             "type": "CValidatorAction",
             "register": {
@@ -1013,7 +1147,7 @@ class Exchange(API):
         commission_bps: Optional[int],
         signer: Optional[str],
     ) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         action = {
             "type": "CValidatorAction",
             "changeProfile": {
@@ -1041,7 +1175,7 @@ class Exchange(API):
         )
 
     def c_validator_unregister(self) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         action = {
             "type": "CValidatorAction",
             "unregister": None,
@@ -1088,7 +1222,7 @@ class Exchange(API):
         )
 
     def use_big_blocks(self, enable: bool) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self._next_nonce()
         action = {
             "type": "evmUserModify",
             "usingBigBlocks": enable,
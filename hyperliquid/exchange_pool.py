@@ -0,0 +1,149 @@
+import itertools
+import threading
+import zlib
+
+from hyperliquid.exchange import Exchange
+from hyperliquid.info import Info
+from hyperliquid.utils.signing import (
+    CancelByCloidRequest,
+    CancelRequest,
+    ModifyRequest,
+    OidOrCloid,
+    OrderRequest,
+    OrderType,
+)
+from hyperliquid.utils.types import Any, BuilderInfo, Cloid, List, Literal, Optional, Union
+
+Routing = Union[Literal["round_robin"], Literal["coin"]]
+
+
+def _require_requests(requests: List[Any], method: str) -> None:
+    # bulk actions are routed by the coin of their first request
+    if not requests:
+        raise ValueError(f"ExchangePool.{method} needs at least one request")
+
+
+class ExchangePool:
+    """Spreads L1 actions for one account over several approved agent wallets.
+
+    Each agent is its own Exchange with its own signer and nonce sequence, so concurrent strategies do not contend
+    on a single wallet. Actions are routed round robin, or with routing="coin" by a stable hash of the coin so
+    that everything for one coin is signed by the same agent and stays in nonce order.
+    All agents share one Info, so metadata is loaded once.
+
+    Agents can only sign L1 actions (orders, cancels, leverage, ...). Transfers and other user signed actions
+    must be sent with the account's own wallet. An account can have one unnamed and three named agents.
+    """
+
+    def __init__(self, agents: List[Exchange], routing: Routing = "round_robin"):
+        if not agents:
+            raise ValueError("ExchangePool needs at least one agent")
+        self.agents = agents
+        self.routing = routing
+        self.agent_keys: List[str] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_agent_keys(
+        cls,
+        agent_keys: List[str],
+        account_address: str,
+        info: Info,
+        vault_address: Optional[str] = None,
+        routing: Routing = "round_robin",
+        timeout: Optional[float] = None,
+    ) -> "ExchangePool":
+        from eth_account import Account  # pylint: disable=import-outside-toplevel
+
+        agents = []
+        for agent_key in agent_keys:
+            agent = Exchange(
+                Account.from_key(agent_key),
+                info.base_url,
+                vault_address=vault_address,
+                account_address=account_address,
+                timeout=timeout,
+                rate_limiter=info.rate_limiter,
+                info=info,
+            )
+            agents.append(agent)
+        return cls(agents, routing)
+
+    @classmethod
+    def approve_agents(cls, exchange: Exchange, names: List[str], routing: Routing = "round_robin") -> "ExchangePool":
+        """Approve a new agent wallet for every name with exchange's wallet and pool them.
+
+        The generated private keys are available as agent_keys on the returned pool, store them to reuse the agents
+        later with from_agent_keys.
+        """
+        agent_keys = []
+        for name in names:
+            response, agent_key = exchange.approve_agent(name)
+            if response.get("status") != "ok":
+                raise RuntimeError(f"Approving agent {name} failed: {response}")
+            agent_keys.append(agent_key)
+        pool = cls.from_agent_keys(
+            agent_keys,
+            exchange.account_address or exchange.wallet.address,
+            exchange.info,
+            exchange.vault_address,
+            routing,
+            exchange.timeout,
+        )
+        pool.agent_keys = agent_keys
+        return pool
+
+    def agent(self, coin: Optional[str] = None) -> Exchange:
+        if coin is not None and self.routing == "coin":
+            return self.agents[zlib.crc32(coin.encode()) % len(self.agents)]
+        with self._lock:
+            return self.agents[next(self._counter) % len(self.agents)]
+
+    def order(
+        self,
+        name: str,
+        is_buy: bool,
+        sz: float,
+        limit_px: float,
+        order_type: OrderType,
+        reduce_only: bool = False,
+        cloid: Optional[Cloid] = None,
+        builder: Optional[BuilderInfo] = None,
+    ) -> Any:
+        return self.agent(name).order(name, is_buy, sz, limit_px, order_type, reduce_only, cloid, builder)
+
+    def bulk_orders(self, order_requests: List[OrderRequest], builder: Optional[BuilderInfo] = None) -> Any:
+        _require_requests(order_requests, "bulk_orders")
+        return self.agent(order_requests[0]["coin"]).bulk_orders(order_requests, builder)
+
+    def modify_order(
+        self,
+        oid: OidOrCloid,
+        name: str,
+        is_buy: bool,
+        sz: float,
+        limit_px: float,
+        order_type: OrderType,
+        reduce_only: bool = False,
+        cloid: Optional[Cloid] = None,
+    ) -> Any:
+        return self.agent(name).modify_order(oid, name, is_buy, sz, limit_px, order_type, reduce_only, cloid)
+
+    def bulk_modify_orders_new(self, modify_requests: List[ModifyRequest]) -> Any:
+        _require_requests(modify_requests, "bulk_modify_orders_new")
+        return self.agent(modify_requests[0]["order"]["coin"]).bulk_modify_orders_new(modify_requests)
+
+    def cancel(self, name: str, oid: int) -> Any:
+        return self.agent(name).cancel(name, oid)
+
+    def cancel_by_cloid(self, name: str, cloid: Cloid) -> Any:
+        return self.agent(name).cancel_by_cloid(name, cloid)
+
+    def bulk_cancel(self, cancel_requests: List[CancelRequest]) -> Any:
+        _require_requests(cancel_requests, "bulk_cancel")
+        return self.agent(cancel_requests[0]["coin"]).bulk_cancel(cancel_requests)
+
+    def bulk_cancel_by_cloid(self, cancel_requests: List[CancelByCloidRequest]) -> Any:
+        _require_requests(cancel_requests, "bulk_cancel_by_cloid")
+        return self.agent(cancel_requests[0]["coin"]).bulk_cancel_by_cloid(cancel_requests)
@@ -0,0 +1,403 @@
+import logging
+import math
+import secrets
+import threading
+import time
+
+from hyperliquid.exchange import Exchange
+from hyperliquid.order_gateway import DEFAULT_MAX_BATCH
+from hyperliquid.order_tracker import OrderTracker
+from hyperliquid.utils.rate_limit import RateLimiter
+from hyperliquid.utils.signing import ModifyRequest, OrderRequest
+from hyperliquid.utils.types import Any, Cloid, Dict, List, Literal, NamedTuple, Optional, Tuple, Union
+
+Finish = Union[Literal["cancel"], Literal["cross"]]
+
+# the exchange rejects orders worth less than 10 USDC
+MIN_ORDER_NOTIONAL = 10.0
+MAX_CONSECUTIVE_ERRORS = 5
+
+ExecutionReport = NamedTuple(
+    "ExecutionReport",
+    [
+        ("coin", str),
+        ("is_buy", bool),
+        ("sz", float),
+        ("filled_sz", float),
+        ("avg_px", Optional[float]),
+        ("arrival_px", Optional[float]),
+        ("slippage_bps", Optional[float]),
+        ("status", str),
+        ("children", int),
+        ("modifies", int),
+        ("elapsed", float),
+    ],
+)
+
+
+class _Child:
+    __slots__ = ("cloid", "oid", "px", "sz")
+
+    def __init__(self, cloid: Any, oid: int, px: float, sz: float):
+        self.cloid = cloid
+        self.oid = oid
+        self.px = px
+        self.sz = sz
+
+
+class ParentOrder:
+    """A parent order worked by an ExecutionEngine as a single resting child order at a time.
+
+    With duration the parent is a TWAP: the size is released in slices equal parts, one every duration / slices
+    seconds, and whatever was released but not filled is shown. With display_sz at most that much is shown at once,
+    like an iceberg; both can be combined. Without either the full size is shown at once.
+
+    The child rests at the touch on its own side of the book, offset_bps more aggressive, and never beyond limit_px.
+    It is re-priced with a modify once the target price moved by reprice_bps. When the duration is over the child
+    is canceled, and with finish="cross" the rest is sent as an IOC order slippage away from the mid.
+    """
+
+    def __init__(
+        self,
+        coin: str,
+        is_buy: bool,
+        sz: float,
+        limit_px: Optional[float] = None,
+        duration: Optional[float] = None,
+        slices: int = 10,
+        display_sz: Optional[float] = None,
+        offset_bps: float = 0.0,
+        reprice_bps: float = 1.0,
+        finish: Finish = "cancel",
+        slippage: float = Exchange.DEFAULT_SLIPPAGE,
+    ):
+        if sz <= 0:
+            raise ValueError("sz must be positive", sz)
+        if slices < 1:
+            raise ValueError("slices must be at least 1", slices)
+        self.coin = coin
+        self.is_buy = is_buy
+        self.sz = sz
+        self.limit_px = limit_px
+        self.duration = duration
+        self.slices = slices
+        self.display_sz = display_sz
+        self.offset_bps = offset_bps
+        self.reprice_bps = reprice_bps
+        self.finish = finish
+        self.slippage = slippage
+        self.status = "pending"
+        self.started: Optional[float] = None
+        self.arrival_px: Optional[float] = None
+        self.child: Optional[_Child] = None
+        self.oids: List[int] = []
+        self.children = 0
+        self.modifies = 0
+        self.errors = 0
+        self.last_error: Any = None
+        self.finishing = False
+        self.done = threading.Event()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self.done.wait(timeout)
+
+
+class ExecutionEngine:
+    """Works ParentOrders with child orders, batching the actions of all parents on every tick.
+
+    Each tick the engine decides per parent whether to place, re-price or cancel its child, then sends all
+    cancels, new children and modifies as one bulk action each. Children are re-priced with bulk_modify_orders_new
+    rather than canceled and replaced, and keep their cloid across modifies. Fills are taken from the OrderTracker,
+    which must be started, and the touch from bbo subscriptions, or l2_snapshot when the Info has no websocket.
+
+    With a rate_limiter, re-pricing is skipped while its headroom is below min_headroom so that placing and
+    canceling children always fits in the budget.
+    """
+
+    def __init__(
+        self,
+        exchange: Exchange,
+        tracker: OrderTracker,
+        interval: float = 1.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        min_headroom: float = 100.0,
+    ):
+        self.exchange = exchange
+        self.tracker = tracker
+        self.interval = interval
+        self.rate_limiter = rate_limiter if rate_limiter is not None else exchange.rate_limiter
+        self.min_headroom = min_headroom
+        self.skipped_reprices = 0
+        self._parents: List[ParentOrder] = []
+        self._bbo: Dict[str, Tuple[Optional[float], Optional[float]]] = {}
+        self._subscriptions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="hyperliquid-execution", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self, cancel: bool = True) -> None:
+        """Stop working parents. With cancel the resting children are canceled first."""
+        self._stop_event.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        if cancel:
+            with self._lock:
+                parents = [parent for parent in self._parents if parent.child is not None]
+            if parents:
+                self.exchange.bulk_cancel_by_cloid(
+                    [{"coin": parent.coin, "cloid": parent.child.cloid} for parent in parents if parent.child]
+                )
+            for parent in parents:
+                parent.child = None
+                self._complete(parent, "canceled")
+        for coin, subscription_id in self._subscriptions.items():
+            self.exchange.info.unsubscribe({"type": "bbo", "coin": coin}, subscription_id)
+        self._subscriptions = {}
+
+    def submit(self, parent: ParentOrder) -> ParentOrder:
+        if parent.coin not in self._subscriptions and self.exchange.info.ws_manager is not None:
+            self._subscriptions[parent.coin] = self.exchange.info.subscribe(
+                {"type": "bbo", "coin": parent.coin}, self._on_bbo
+            )
+        with self._lock:
+            self._parents.append(parent)
+        return parent
+
+    def cancel(self, parent: ParentOrder) -> None:
+        """Stop working parent at the next tick, its child is canceled and nothing is crossed."""
+        parent.finish = "cancel"
+        parent.finishing = True
+
+    def _on_bbo(self, ws_msg: Any) -> None:
+        data = ws_msg["data"]
+        bid, ask = data["bbo"]
+        self._bbo[data["coin"]] = (
+            None if bid is None else float(bid["px"]),
+            None if ask is None else float(ask["px"]),
+        )
+
+    def touch(self, coin: str) -> Tuple[Optional[float], Optional[float]]:
+        bbo = self._bbo.get(coin)
+        if bbo is None:
+            bids, asks = self.exchange.info.l2_snapshot(coin)["levels"]
+            bbo = (float(bids[0]["px"]) if bids else None, float(asks[0]["px"]) if asks else None)
+            if self.exchange.info.ws_manager is None:
+                return bbo
+            self._bbo[coin] = bbo
+        return bbo
+
+    def filled(self, parent: ParentOrder) -> Tuple[float, Optional[float]]:
+        """Filled size and average fill price of parent so far."""
+        filled_sz = notional = 0.0
+        for oid in parent.oids:
+            for fill in self.tracker.fills(oid):
+                sz = float(fill["sz"])
+                filled_sz += sz
+                notional += sz * float(fill["px"])
+        return filled_sz, notional / filled_sz if filled_sz else None
+
+    def report(self, parent: ParentOrder) -> ExecutionReport:
+        filled_sz, avg_px = self.filled(parent)
+        slippage_bps = None
+        if avg_px is not None and parent.arrival_px:
+            slippage_bps = (avg_px / parent.arrival_px - 1) * 1e4 * (1 if parent.is_buy else -1)
+        return ExecutionReport(
+            parent.coin,
+            parent.is_buy,
+            parent.sz,
+            filled_sz,
+            avg_px,
+            parent.arrival_px,
+            slippage_bps,
+            parent.status,
+            parent.children,
+            parent.modifies,
+            0.0 if parent.started is None else time.monotonic() - parent.started,
+        )
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.tick()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logging.error(f"ExecutionEngine tick failed: {e!r}")
+            self._stop_event.wait(self.interval)
+
+    def tick(self) -> None:
+        """Decide and send the child actions of every active parent."""
+        with self._lock:
+            parents = [parent for parent in self._parents if not parent.done.is_set()]
+            self._parents = parents
+        now = time.monotonic()
+        cancels: List[ParentOrder] = []
+        places: List[Tuple[ParentOrder, OrderRequest]] = []
+        modifies: List[Tuple[ParentOrder, ModifyRequest]] = []
+        for parent in parents:
+            self._plan(parent, now, cancels, places, modifies)
+
+        if modifies and self.rate_limiter is not None and self.rate_limiter.headroom() < self.min_headroom:
+            self.skipped_reprices += len(modifies)
+            modifies = []
+        for batch in _batches([(parent, None) for parent in cancels]):
+            cloid_cancels: List[Any] = [{"coin": parent.coin, "cloid": parent.child.cloid} for parent, _ in batch]
+            self._apply(batch, self.exchange.bulk_cancel_by_cloid(cloid_cancels), self._on_cancel)
+        for batch in _batches(places):
+            self._apply(batch, self.exchange.bulk_orders([order for _, order in batch]), self._on_order)
+        for batch in _batches(modifies):
+            self._apply(batch, self.exchange.bulk_modify_orders_new([modify for _, modify in batch]), self._on_modify)
+
+    def _plan(
+        self,
+        parent: ParentOrder,
+        now: float,
+        cancels: List[ParentOrder],
+        places: List[Tuple[ParentOrder, OrderRequest]],
+        modifies: List[Tuple[ParentOrder, ModifyRequest]],
+    ) -> None:
+        bid, ask = self.touch(parent.coin)
+        if parent.started is None:
+            parent.started = now
+            parent.status = "working"
+            if bid is not None and ask is not None:
+                parent.arrival_px = (bid + ask) / 2
+        child = parent.child
+        if child is not None:
+            tracked = self.tracker.order(child.oid)
+            if tracked is not None and not tracked.is_open:
+                parent.child = child = None
+
+        filled_sz, _ = self.filled(parent)
+        sz_decimals = self.exchange.info.asset_to_sz_decimals[self.exchange.info.name_to_asset(parent.coin)]
+        remaining = _floor(parent.sz - filled_sz, sz_decimals)
+        touch = bid if parent.is_buy else ask
+        reference_px = touch or parent.arrival_px or 0.0
+        expired = parent.duration is not None and now - parent.started >= parent.duration
+        if parent.errors >= MAX_CONSECUTIVE_ERRORS or remaining * reference_px < MIN_ORDER_NOTIONAL:
+            parent.finishing = True
+            parent.finish = "cancel"
+        elif expired:
+            parent.finishing = True
+
+        if parent.finishing:
+            if child is not None:
+                cancels.append(parent)
+            elif parent.finish == "cross" and remaining * reference_px >= MIN_ORDER_NOTIONAL:
+                parent.finish = "cancel"
+                px = self.exchange._slippage_price(  # pylint: disable=protected-access
+                    parent.coin, parent.is_buy, parent.slippage
+                )
+                places.append((parent, self._order_request(parent, remaining, px, "Ioc")))
+            else:
+                filled_sz, _ = self.filled(parent)
+                self._complete(parent, "done" if parent.sz - filled_sz < 10**-sz_decimals else "canceled")
+            return
+
+        if touch is None:
+            return
+        if parent.duration is None:
+            released = parent.sz
+        else:
+            slice_len = parent.duration / parent.slices
+            released = parent.sz * min(1.0, (math.floor((now - parent.started) / slice_len) + 1) / parent.slices)
+        show = released - filled_sz
+        if parent.display_sz is not None:
+            show = min(show, parent.display_sz)
+        show = _floor(min(show, remaining), sz_decimals)
+        px = self.exchange._slippage_price(  # pylint: disable=protected-access
+            parent.coin, parent.is_buy, parent.offset_bps / 1e4, touch
+        )
+        if parent.limit_px is not None:
+            px = min(px, parent.limit_px) if parent.is_buy else max(px, parent.limit_px)
+
+        if child is None:
+            if show * px >= MIN_ORDER_NOTIONAL:
+                places.append((parent, self._order_request(parent, show, px, "Gtc")))
+            return
+        showing = self.tracker.remaining_sz(child.oid) if self.tracker.order(child.oid) is not None else child.sz
+        moved_bps = abs(px / child.px - 1) * 1e4
+        if moved_bps >= parent.reprice_bps or show > showing + 10**-sz_decimals / 2:
+            order = self._order_request(parent, max(show, showing), px, "Gtc")
+            order["cloid"] = child.cloid
+            modifies.append((parent, {"oid": child.cloid, "order": order}))
+
+    def _order_request(self, parent: ParentOrder, sz: float, px: float, tif: Any) -> OrderRequest:
+        return {
+            "coin": parent.coin,
+            "is_buy": parent.is_buy,
+            "sz": sz,
+            "limit_px": px,
+            "order_type": {"limit": {"tif": tif}},
+            "reduce_only": False,
+            "cloid": Cloid.from_int(secrets.randbits(128)),
+        }
+
+    def _apply(self, batch: List[Tuple[ParentOrder, Any]], response: Any, handle: Any) -> None:
+        statuses = None
+        if isinstance(response, dict) and response.get("status") == "ok":
+            statuses = response["response"]["data"]["statuses"]
+        if statuses is None or len(statuses) != len(batch):
+            error = response.get("response", response) if isinstance(response, dict) else response
+            logging.warning(f"ExecutionEngine action for {len(batch)} children failed: {error}")
+            for parent, _ in batch:
+                parent.errors += 1
+                parent.last_error = error
+            return
+        for (parent, request), status in zip(batch, statuses):
+            handle(parent, status, request)
+
+    def _failed(self, parent: ParentOrder, status: Any) -> bool:
+        if isinstance(status, dict) and "error" in status:
+            parent.errors += 1
+            parent.last_error = status["error"]
+            logging.warning(f"ExecutionEngine {parent.coin} child action failed: {status['error']}")
+            return True
+        parent.errors = 0
+        return False
+
+    def _on_cancel(self, parent: ParentOrder, status: Any, _: Any) -> None:
+        # a rejected cancel means the child is no longer resting either
+        self._failed(parent, status)
+        parent.child = None
+
+    def _on_order(self, parent: ParentOrder, status: Any, order: OrderRequest) -> None:
+        if not self._failed(parent, status):
+            parent.children += 1
+            self._record(parent, status, order)
+
+    def _on_modify(self, parent: ParentOrder, status: Any, modify: ModifyRequest) -> None:
+        if not self._failed(parent, status):
+            parent.modifies += 1
+            self._record(parent, status, modify["order"])
+
+    def _record(self, parent: ParentOrder, status: Any, order: OrderRequest) -> None:
+        if "resting" in status:
+            oid = status["resting"]["oid"]
+            parent.child = _Child(order["cloid"], oid, order["limit_px"], order["sz"])
+        elif "filled" in status:
+            oid = status["filled"]["oid"]
+            parent.child = None
+        else:
+            return
+        if oid not in parent.oids:
+            parent.oids.append(oid)
+
+    def _complete(self, parent: ParentOrder, status: str) -> None:
+        parent.status = status
+        parent.done.set()
+        report = self.report(parent)
+        logging.info(
+            f"ExecutionEngine {report.coin} {'buy' if report.is_buy else 'sell'} {report.status}: "
+            f"{report.filled_sz}/{report.sz} at {report.avg_px}, {report.slippage_bps} bps vs arrival"
+        )
+
+
+def _batches(items: List[Any]) -> List[List[Any]]:
+    return [items[i : i + DEFAULT_MAX_BATCH] for i in range(0, len(items), DEFAULT_MAX_BATCH)]
+
+
+def _floor(sz: float, sz_decimals: int) -> float:
+    scale = 10.0**sz_decimals
+    return max(0.0, math.floor(sz * scale + 1e-9) / scale)
@@ -1,8 +1,17 @@
+from typing import TYPE_CHECKING
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from hyperliquid.api import API
+from hyperliquid.utils.cache import MISS, ResponseCache
+from hyperliquid.utils.rate_limit import RateLimiter
+from hyperliquid.utils.retry import RetryPolicy
 from hyperliquid.utils.types import (
     Any,
     Callable,
     Cloid,
+    Dict,
     List,
     Meta,
     Optional,
@@ -11,7 +20,9 @@ from hyperliquid.utils.types import (
     Subscription,
     cast,
 )
-from hyperliquid.websocket_manager import WebsocketManager
+
+if TYPE_CHECKING:
+    from hyperliquid.websocket_manager import WebsocketManager
 
 
 class Info(API):
@@ -25,15 +36,49 @@ class Info(API):
         # the original dex.
         perp_dexs: Optional[List[str]] = None,
         timeout: Optional[float] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
     ):  # pylint: disable=too-many-locals
-        super().__init__(base_url, timeout)
-        self.ws_manager: Optional[WebsocketManager] = None
+        super().__init__(base_url, timeout, rate_limiter, retry_policy)
+        self.cache = cache
+        self.ws_manager: Optional["WebsocketManager"] = None
         if not skip_ws:
-            self.ws_manager = WebsocketManager(self.base_url)
+            # websocket-client is only imported by users of subscriptions
+            from hyperliquid import websocket_manager  # pylint: disable=import-outside-toplevel
+
+            self.ws_manager = websocket_manager.WebsocketManager(self.base_url)
             self.ws_manager.start()
 
+        if perp_dexs is None:
+            perp_dexs = [""]
+            load_perp_dexs = False
+        else:
+            load_perp_dexs = True
+        # spotMeta, perpDexs and the meta of every dex are independent, fetch the missing ones concurrently so
+        # startup takes one round trip however many dexs are requested
+        reads: Dict[str, Callable[[], Any]] = {}
+        if spot_meta is None:
+            reads["spotMeta"] = self.spot_meta
+        if load_perp_dexs:
+            reads["perpDexs"] = self.perp_dexs
+
+        def read_meta(dex: str) -> Callable[[], Any]:
+            return lambda: self.meta(dex=dex)
+
+        for dex in perp_dexs:
+            if dex != "" or meta is None:
+                reads[f"meta:{dex}"] = read_meta(dex)
+        loaded: Dict[str, Any] = {}
+        if len(reads) == 1:
+            loaded = {key: read() for key, read in reads.items()}
+        elif reads:
+            with ThreadPoolExecutor(max_workers=min(32, len(reads))) as executor:
+                futures = [(key, executor.submit(read)) for key, read in reads.items()]
+                loaded = {key: future.result() for key, future in futures}
+
         if spot_meta is None:
-            spot_meta = self.spot_meta()
+            spot_meta = loaded["spotMeta"]
 
         self.coin_to_asset = {}
         self.name_to_coin = {}
@@ -53,10 +98,8 @@ class Info(API):
                 self.name_to_coin[name] = spot_info["name"]
 
         perp_dex_to_offset = {"": 0}
-        if perp_dexs is None:
-            perp_dexs = [""]
-        else:
-            for i, perp_dex in enumerate(self.perp_dexs()[1:]):
+        if load_perp_dexs:
+            for i, perp_dex in enumerate(loaded["perpDexs"][1:]):
                 # builder-deployed perp dexs start at 110000
                 perp_dex_to_offset[perp_dex["name"]] = 110000 + i * 10000
 
@@ -65,8 +108,17 @@ class Info(API):
             if perp_dex == "" and meta is not None:
                 self.set_perp_meta(meta, 0)
             else:
-                fresh_meta = self.meta(dex=perp_dex)
-                self.set_perp_meta(fresh_meta, offset)
+                self.set_perp_meta(loaded[f"meta:{perp_dex}"], offset)
+
+    def post(self, url_path: str, payload: Any = None) -> Any:
+        if self.cache is None or url_path != "/info" or payload is None or not self.cache.is_cacheable(payload):
+            return super().post(url_path, payload)
+        cached = self.cache.get(payload, MISS)
+        if cached is not MISS:
+            return cached
+        response = super().post(url_path, payload)
+        self.cache.put(payload, response)
+        return response
 
     def set_perp_meta(self, meta: Meta, offset: int) -> Any:
         for asset, asset_info in enumerate(meta["universe"]):
@@ -75,6 +127,11 @@ class Info(API):
             self.name_to_coin[asset_info["name"]] = asset_info["name"]
             self.asset_to_sz_decimals[asset] = asset_info["szDecimals"]
 
+    def close(self) -> None:
+        if self.ws_manager is not None:
+            self.ws_manager.stop()
+        super().close()
+
     def disconnect_websocket(self):
         if self.ws_manager is None:
             raise RuntimeError("Cannot call disconnect_websocket since skip_ws was used")
@@ -182,6 +239,67 @@ class Info(API):
         """
         return self.post("/info", {"type": "frontendOpenOrders", "user": address, "dex": dex})
 
+    def portfolio_snapshot(
+        self, addresses: List[str], dexs: Optional[List[str]] = None, max_workers: Optional[int] = None
+    ) -> Any:
+        """Retrieve the state of several accounts at once.
+
+        Sends user_state, open_orders and frontend_open_orders for every address and dex and spot_user_state
+        for every address concurrently, so the snapshot takes about as long as the slowest single request.
+        The requests are independent, so the responses are not from one exchange state. A fill landing mid-snapshot
+        can show up in one response and not in another. Compare the time of each userState if that matters.
+
+        POST /info
+
+        Args:
+            addresses (List[str]): Onchain addresses in 42-character hexadecimal format.
+            dexs (Optional[List[str]]): Perp dexs to include. Defaults to [""], the original dex.
+            max_workers (Optional[int]): Maximum number of concurrent requests. Defaults to one per request, up to 32.
+        Returns:
+            {
+                time: int,  # unix timestamp in milliseconds when the snapshot was started
+                elapsed: float,  # seconds taken by the snapshot
+                accounts: {
+                    address: {
+                        spotState: spot_user_state response,
+                        dexs: {
+                            dex: {
+                                userState: user_state response,
+                                openOrders: open_orders response,
+                                frontendOpenOrders: frontend_open_orders response,
+                            },
+                            ...
+                        }
+                    },
+                    ...
+                }
+            }
+        """
+        if dexs is None:
+            dexs = [""]
+        reads: List[Any] = []
+        for address in addresses:
+            reads.append((address, None, "spotState", self.spot_user_state, (address,)))
+            for dex in dexs:
+                reads.append((address, dex, "userState", self.user_state, (address, dex)))
+                reads.append((address, dex, "openOrders", self.open_orders, (address, dex)))
+                reads.append((address, dex, "frontendOpenOrders", self.frontend_open_orders, (address, dex)))
+
+        snapshot_time = int(time.time() * 1000)
+        start = time.monotonic()
+        accounts: Dict[str, Any] = {
+            address: {"spotState": None, "dexs": {dex: {} for dex in dexs}} for address in addresses
+        }
+        if reads:
+            with ThreadPoolExecutor(max_workers=max_workers or min(32, len(reads))) as executor:
+                futures = [(read, executor.submit(read[3], *read[4])) for read in reads]
+                for (address, read_dex, key, _, _), future in futures:
+                    if read_dex is None:
+                        accounts[address][key] = future.result()
+                    else:
+                        accounts[address]["dexs"][read_dex][key] = future.result()
+        return {"time": snapshot_time, "elapsed": time.monotonic() - start, "accounts": accounts}
+
     def all_mids(self, dex: str = "") -> Any:
         """Retrieve all mids for all actively traded coins.
 
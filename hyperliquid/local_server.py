@@ -0,0 +1,835 @@
+"""Local stand-in for the Hyperliquid API to load test execution code without the network.
+
+    python -m hyperliquid.local_server --port 3001
+
+serves /info, /exchange and /ws on LOCAL_API_URL. Point Exchange and Info at it with base_url=LOCAL_API_URL.
+In process, start LocalServer(port=0) and use its base_url.
+
+Signatures are recovered like the exchange does, so every signer is its own account unless it was approved as
+an agent with approveAgent. Orders are matched with price-time priority per asset. Only perps from the given meta
+are listed, trigger orders and all non-trading actions other than approveAgent are accepted but have no effect.
+"""
+
+import argparse
+import base64
+import bisect
+import hashlib
+import json
+import logging
+import queue
+import struct
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from hyperliquid.utils.constants import LOCAL_API_URL
+from hyperliquid.utils.signing import (
+    APPROVE_AGENT_SIGN_TYPES,
+    float_to_wire,
+    recover_agent_or_user_from_l1_action,
+    recover_user_from_user_signed_action,
+)
+from hyperliquid.utils.types import Any, Deque, Dict, List, Meta, Optional, Set, SpotMeta, Tuple, cast
+
+DEFAULT_META: Meta = {
+    "universe": [
+        {"name": "BTC", "szDecimals": 5},
+        {"name": "ETH", "szDecimals": 4},
+        {"name": "SOL", "szDecimals": 2},
+    ]
+}
+EMPTY_SPOT_META: SpotMeta = {"universe": [], "tokens": []}
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+# the exchange remembers the 100 highest nonces of every signer
+MAX_TRACKED_NONCES = 100
+NONCE_MAX_AGE_MS = 2 * 24 * 60 * 60 * 1000
+NONCE_MAX_LEAD_MS = 24 * 60 * 60 * 1000
+N_BOOK_LEVELS = 20
+EPSILON = 1e-9
+
+# an event is (channel, routing key, data) where the routing key is a user address or a coin
+Event = Tuple[str, str, Any]
+
+
+def _wire(x: float) -> str:
+    return float_to_wire(round(x, 8))
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class RestingOrder:
+    __slots__ = (
+        "oid",
+        "user",
+        "coin",
+        "asset",
+        "is_buy",
+        "px",
+        "sz",
+        "orig_sz",
+        "timestamp",
+        "cloid",
+        "tif",
+        "reduce_only",
+    )
+
+    def __init__(self, oid, user, coin, asset, is_buy, px, sz, timestamp, cloid, tif, reduce_only):
+        self.oid: int = oid
+        self.user: str = user
+        self.coin: str = coin
+        self.asset: int = asset
+        self.is_buy: bool = is_buy
+        self.px: float = px
+        self.sz: float = sz
+        self.orig_sz: float = sz
+        self.timestamp: int = timestamp
+        self.cloid: Optional[str] = cloid
+        self.tif: str = tif
+        self.reduce_only: bool = reduce_only
+
+    def to_wire(self) -> Dict[str, Any]:
+        order = {
+            "coin": self.coin,
+            "side": "B" if self.is_buy else "A",
+            "limitPx": _wire(self.px),
+            "sz": _wire(self.sz),
+            "oid": self.oid,
+            "timestamp": self.timestamp,
+            "origSz": _wire(self.orig_sz),
+        }
+        if self.cloid is not None:
+            order["cloid"] = self.cloid
+        return order
+
+    def to_frontend_wire(self) -> Dict[str, Any]:
+        order = self.to_wire()
+        order.update(
+            {
+                "isTrigger": False,
+                "triggerPx": "0.0",
+                "triggerCondition": "N/A",
+                "children": [],
+                "isPositionTpsl": False,
+                "reduceOnly": self.reduce_only,
+                "orderType": "Limit",
+                "tif": self.tif,
+            }
+        )
+        return order
+
+
+class Book:
+    """Price levels of one asset. Side 0 holds bids and side 1 asks, prices are kept sorted ascending."""
+
+    def __init__(self, coin: str):
+        self.coin = coin
+        self.levels: Tuple[Dict[float, Deque[RestingOrder]], Dict[float, Deque[RestingOrder]]] = ({}, {})
+        self.prices: Tuple[List[float], List[float]] = ([], [])
+
+    def best(self, side: int) -> Optional[float]:
+        prices = self.prices[side]
+        if not prices:
+            return None
+        return prices[-1] if side == 0 else prices[0]
+
+    def add(self, order: RestingOrder) -> None:
+        side = 0 if order.is_buy else 1
+        level = self.levels[side].get(order.px)
+        if level is None:
+            level = self.levels[side][order.px] = deque()
+            bisect.insort(self.prices[side], order.px)
+        level.append(order)
+
+    def remove(self, order: RestingOrder) -> None:
+        side = 0 if order.is_buy else 1
+        level = self.levels[side][order.px]
+        level.remove(order)
+        if not level:
+            self._drop_level(side, order.px)
+
+    def _drop_level(self, side: int, px: float) -> None:
+        del self.levels[side][px]
+        prices = self.prices[side]
+        del prices[bisect.bisect_left(prices, px)]
+
+    def mid(self) -> Optional[float]:
+        bid, ask = self.best(0), self.best(1)
+        if bid is None or ask is None:
+            return None
+        return (bid + ask) / 2
+
+    def level_wire(self, side: int, px: float) -> Dict[str, Any]:
+        level = self.levels[side][px]
+        return {"px": _wire(px), "sz": _wire(sum(order.sz for order in level)), "n": len(level)}
+
+    def snapshot(self, n_levels: int = N_BOOK_LEVELS) -> Dict[str, Any]:
+        bids = [self.level_wire(0, px) for px in reversed(self.prices[0][-n_levels:])]
+        asks = [self.level_wire(1, px) for px in self.prices[1][:n_levels]]
+        return {"coin": self.coin, "time": _now_ms(), "levels": [bids, asks]}
+
+
+class MatchingEngine:
+    """Price-time priority matching for every perp in meta, plus the account state needed to answer /info.
+
+    Methods that change state append the websocket events they produce to events. Callers hold lock around them.
+    """
+
+    def __init__(self, meta: Meta, initial_mids: Optional[Dict[str, float]] = None):
+        self.meta = meta
+        self.coins = [asset_info["name"] for asset_info in meta["universe"]]
+        self.books = {coin: Book(coin) for coin in self.coins}
+        self.last_px: Dict[str, float] = dict(initial_mids or {})
+        self.orders: Dict[int, RestingOrder] = {}
+        self.statuses: Dict[int, Tuple[Dict[str, Any], str, int]] = {}
+        self.cloids: Dict[Tuple[str, str], int] = {}
+        self.positions: Dict[str, Dict[str, List[float]]] = {}
+        self.fills: Dict[str, Deque[Any]] = {}
+        self.dirty_books: Set[str] = set()
+        self.lock = threading.RLock()
+        self._next_oid = 1
+        self._next_tid = 1
+
+    def _set_status(self, order: RestingOrder, status: str, now: int, events: List[Event]) -> None:
+        wire = order.to_wire()
+        self.statuses[order.oid] = (order.to_frontend_wire(), status, now)
+        events.append(("orderUpdates", order.user, {"order": wire, "status": status, "statusTimestamp": now}))
+
+    def place(self, user: str, wire: Any, now: int, events: List[Event]) -> Any:
+        asset = wire["a"]
+        if not 0 <= asset < len(self.coins):
+            return {"error": f"Invalid asset {asset}"}
+        coin = self.coins[asset]
+        order_type = wire["t"]
+        if "limit" not in order_type:
+            return {"error": f"Trigger orders are not supported by the local server. asset={asset}"}
+        tif = order_type["limit"]["tif"]
+        is_buy = wire["b"]
+        px = float(wire["p"])
+        sz = float(wire["s"])
+        cloid = wire.get("c")
+        if px <= 0 or sz <= 0:
+            return {"error": f"Order has invalid price or size. asset={asset}"}
+        if cloid is not None and (user, cloid) in self.cloids:
+            return {"error": f"Duplicate cloid. asset={asset}"}
+        if wire["r"]:
+            szi = self.positions.get(user, {}).get(coin, [0.0, 0.0])[0]
+            if szi == 0 or (szi > 0) == is_buy:
+                return {"error": f"Reduce only order would increase position. asset={asset}"}
+            sz = min(sz, abs(szi))
+
+        book = self.books[coin]
+        opposite = 1 if is_buy else 0
+        best = book.best(opposite)
+        if tif == "Alo" and best is not None and (best <= px if is_buy else best >= px):
+            return {"error": f"Post only order would have immediately matched, bbo was {_wire(best)}. asset={asset}"}
+
+        oid = self._next_oid
+        self._next_oid += 1
+        if cloid is not None:
+            self.cloids[(user, cloid)] = oid
+        taker = RestingOrder(oid, user, coin, asset, is_buy, px, sz, now, cloid, tif, wire["r"])
+        filled, notional = self._match(taker, book, now, events)
+
+        ids: Dict[str, Any] = {"oid": oid}
+        if cloid is not None:
+            ids["cloid"] = cloid
+        if taker.sz > EPSILON and tif != "Ioc":
+            book.add(taker)
+            self.orders[oid] = taker
+            self.dirty_books.add(coin)
+            self._set_status(taker, "open", now, events)
+            return {"resting": ids}
+        self._set_status(taker, "filled" if filled > 0 and taker.sz <= EPSILON else "canceled", now, events)
+        if filled == 0:
+            return {"error": f"Order could not immediately match against any resting orders. asset={asset}"}
+        return {"filled": {"totalSz": _wire(filled), "avgPx": _wire(notional / filled), **ids}}
+
+    def _match(self, taker: RestingOrder, book: Book, now: int, events: List[Event]) -> Tuple[float, float]:
+        opposite = 1 if taker.is_buy else 0
+        filled = notional = 0.0
+        trades = []
+        while taker.sz > EPSILON:
+            best = book.best(opposite)
+            if best is None or (best > taker.px if taker.is_buy else best < taker.px):
+                break
+            level = book.levels[opposite][best]
+            while level and taker.sz > EPSILON:
+                maker = level[0]
+                qty = min(maker.sz, taker.sz)
+                trades.append(self._fill(taker, maker, qty, best, now, events))
+                filled += qty
+                notional += qty * best
+                if maker.sz <= EPSILON:
+                    level.popleft()
+                    del self.orders[maker.oid]
+                    self._set_status(maker, "filled", now, events)
+            if not level:
+                book._drop_level(opposite, best)  # pylint: disable=protected-access
+        if trades:
+            self.last_px[book.coin] = float(trades[-1]["px"])
+            self.dirty_books.add(book.coin)
+            events.append(("trades", book.coin, trades))
+        return filled, notional
+
+    def _fill(
+        self, taker: RestingOrder, maker: RestingOrder, qty: float, px: float, now: int, events: List[Event]
+    ) -> Dict[str, Any]:
+        tid = self._next_tid
+        self._next_tid += 1
+        fill_hash = f"0x{tid:064x}"
+        for order, crossed in ((taker, True), (maker, False)):
+            order.sz = round(order.sz - qty, 8)
+            start_position, direction, closed_pnl = self._apply_position(order.user, order.coin, order.is_buy, qty, px)
+            fill = {
+                "coin": order.coin,
+                "px": _wire(px),
+                "sz": _wire(qty),
+                "side": "B" if order.is_buy else "A",
+                "time": now,
+                "startPosition": _wire(start_position),
+                "dir": direction,
+                "closedPnl": _wire(closed_pnl),
+                "hash": fill_hash,
+                "oid": order.oid,
+                "crossed": crossed,
+                "fee": "0.0",
+                "tid": tid,
+                "feeToken": "USDC",
+            }
+            self.fills.setdefault(order.user, deque(maxlen=2000)).appendleft(fill)
+            events.append(("userFills", order.user, fill))
+        buyer, seller = (taker.user, maker.user) if taker.is_buy else (maker.user, taker.user)
+        return {
+            "coin": taker.coin,
+            "side": "B" if taker.is_buy else "A",
+            "px": _wire(px),
+            "sz": _wire(qty),
+            "hash": fill_hash,
+            "time": now,
+            "tid": tid,
+            "users": [buyer, seller],
+        }
+
+    def _apply_position(self, user: str, coin: str, is_buy: bool, qty: float, px: float) -> Tuple[float, str, float]:
+        position = self.positions.setdefault(user, {}).setdefault(coin, [0.0, 0.0])
+        szi, entry_px = position
+        new_szi = round(szi + (qty if is_buy else -qty), 8)
+        closed_pnl = 0.0
+        if szi == 0 or (szi > 0) == is_buy:
+            direction = "Open Long" if is_buy else "Open Short"
+            entry_px = (abs(szi) * entry_px + qty * px) / abs(new_szi)
+        else:
+            closed_pnl = min(qty, abs(szi)) * (px - entry_px) * (1 if szi > 0 else -1)
+            direction = "Close Long" if szi > 0 else "Close Short"
+            if new_szi == 0:
+                entry_px = 0.0
+            elif (new_szi > 0) != (szi > 0):
+                direction = "Long > Short" if szi > 0 else "Short > Long"
+                entry_px = px
+        position[0], position[1] = new_szi, entry_px
+        return szi, direction, closed_pnl
+
+    def cancel(self, user: str, asset: int, oid: int, now: int, events: List[Event]) -> Any:
+        order = self.orders.get(oid)
+        if order is None or order.user != user or order.asset != asset:
+            return {"error": f"Order was never placed, already canceled, or filled. asset={asset}"}
+        self.books[order.coin].remove(order)
+        del self.orders[oid]
+        self.dirty_books.add(order.coin)
+        self._set_status(order, "canceled", now, events)
+        return "success"
+
+    def cancel_by_cloid(self, user: str, asset: int, cloid: str, now: int, events: List[Event]) -> Any:
+        oid = self.cloids.get((user, cloid))
+        if oid is None:
+            return {"error": f"Order was never placed, already canceled, or filled. asset={asset}"}
+        return self.cancel(user, asset, oid, now, events)
+
+    def modify(self, user: str, modify: Any, now: int, events: List[Event]) -> Any:
+        oid = modify["oid"]
+        if isinstance(oid, str):
+            oid = self.cloids.get((user, oid), -1)
+        order = self.orders.get(oid)
+        if order is None or order.user != user:
+            return {"error": "Cannot modify canceled or filled order"}
+        self.cancel(user, order.asset, order.oid, now, events)
+        if order.cloid is not None and modify["order"].get("c") == order.cloid:
+            del self.cloids[(user, order.cloid)]
+        return self.place(user, modify["order"], now, events)
+
+    def open_orders(self, user: str) -> List[RestingOrder]:
+        return sorted((order for order in self.orders.values() if order.user == user), key=lambda o: -o.oid)
+
+    def mids(self) -> Dict[str, str]:
+        mids = {}
+        for coin, book in self.books.items():
+            mid = book.mid()
+            if mid is None:
+                mid = self.last_px.get(coin)
+            if mid is not None:
+                mids[coin] = _wire(mid)
+        return mids
+
+    def clearinghouse_state(self, user: str) -> Dict[str, Any]:
+        mids = self.mids()
+        asset_positions = []
+        total_ntl = 0.0
+        for coin, (szi, entry_px) in self.positions.get(user, {}).items():
+            if szi == 0:
+                continue
+            mark_px = float(mids.get(coin, entry_px))
+            position_value = abs(szi) * mark_px
+            total_ntl += position_value
+            asset_positions.append(
+                {
+                    "type": "oneWay",
+                    "position": {
+                        "coin": coin,
+                        "szi": _wire(szi),
+                        "entryPx": _wire(entry_px),
+                        "leverage": {"type": "cross", "value": 1},
+                        "liquidationPx": None,
+                        "marginUsed": _wire(position_value),
+                        "positionValue": _wire(position_value),
+                        "returnOnEquity": "0.0",
+                        "unrealizedPnl": _wire(szi * (mark_px - entry_px)),
+                    },
+                }
+            )
+        summary = {
+            "accountValue": "0.0",
+            "totalMarginUsed": _wire(total_ntl),
+            "totalNtlPos": _wire(total_ntl),
+            "totalRawUsd": "0.0",
+        }
+        return {
+            "assetPositions": asset_positions,
+            "crossMarginSummary": summary,
+            "marginSummary": summary,
+            "withdrawable": "0.0",
+            "time": _now_ms(),
+        }
+
+    def order_status(self, user: str, oid: Any) -> Dict[str, Any]:
+        if isinstance(oid, str):
+            oid = self.cloids.get((user, oid), -1)
+        status = self.statuses.get(oid)
+        if status is None:
+            return {"status": "unknownOid"}
+        order, order_status, timestamp = status
+        return {"status": "order", "order": {"order": order, "status": order_status, "statusTimestamp": timestamp}}
+
+
+class _WsConnection:
+    def __init__(self, rfile: Any, wfile: Any):
+        self.rfile = rfile
+        self.wfile = wfile
+        self.subscriptions: Dict[Tuple[str, str], Any] = {}
+        self.closed = False
+        self._outbox: "queue.SimpleQueue[Optional[bytes]]" = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def send_text(self, text: str) -> None:
+        self._send_frame(0x1, text.encode())
+
+    def send_json(self, msg: Any) -> None:
+        self.send_text(json.dumps(msg, separators=(",", ":")))
+
+    def _send_frame(self, opcode: int, data: bytes) -> None:
+        n = len(data)
+        if n < 126:
+            header = struct.pack(">BB", 0x80 | opcode, n)
+        elif n < 65536:
+            header = struct.pack(">BBH", 0x80 | opcode, 126, n)
+        else:
+            header = struct.pack(">BBQ", 0x80 | opcode, 127, n)
+        self._outbox.put(header + data)
+
+    def _write_loop(self) -> None:
+        while True:
+            frame = self._outbox.get()
+            if frame is None:
+                return
+            try:
+                self.wfile.write(frame)
+                self.wfile.flush()
+            except (OSError, ValueError):
+                # ValueError once the handler closed the file
+                self.closed = True
+                return
+
+    def _read(self, n: int) -> bytes:
+        data: bytes = self.rfile.read(n)
+        if len(data) < n:
+            raise EOFError
+        return data
+
+    def recv(self) -> Optional[str]:
+        """Next text message from the client, None once the connection is closed."""
+        message = b""
+        try:
+            while True:
+                first, second = self._read(2)
+                opcode = first & 0x0F
+                n = second & 0x7F
+                if n == 126:
+                    (n,) = struct.unpack(">H", self._read(2))
+                elif n == 127:
+                    (n,) = struct.unpack(">Q", self._read(8))
+                mask = self._read(4) if second & 0x80 else None
+                data = self._read(n)
+                if mask is not None and n:
+                    key = (mask * (n // 4 + 1))[:n]
+                    data = (int.from_bytes(data, "big") ^ int.from_bytes(key, "big")).to_bytes(n, "big")
+                if opcode == 0x8:
+                    self._send_frame(0x8, b"")
+                    return None
+                if opcode == 0x9:
+                    self._send_frame(0xA, data)
+                    continue
+                if opcode == 0xA:
+                    continue
+                message += data
+                if first & 0x80:
+                    return message.decode()
+        except (EOFError, OSError, ValueError):
+            return None
+
+    def close(self) -> None:
+        self.closed = True
+        self._outbox.put(None)
+
+
+def _routing_key(subscription: Any) -> Tuple[str, str]:
+    if "user" in subscription:
+        return subscription["type"], subscription["user"].lower()
+    return subscription["type"], subscription.get("coin", "")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, without this delayed ACKs add 40ms to every response
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        logging.debug("local server: " + format, *args)
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json") -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        local: LocalServer = self.server.local  # type: ignore[attr-defined]
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            payload = json.loads(body)
+            if self.path == "/info":
+                response = local.handle_info(payload)
+            elif self.path == "/exchange":
+                response = local.handle_exchange(payload)
+            else:
+                self._send(404, b"Not Found", "text/plain")
+                return
+        except (KeyError, TypeError, ValueError, IndexError) as e:
+            self._send(422, f"Failed to deserialize the JSON body into the target type: {e!r}".encode(), "text/plain")
+            return
+        self._send(200, json.dumps(response, separators=(",", ":")).encode())
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        local: LocalServer = self.server.local  # type: ignore[attr-defined]
+        if self.path != "/ws" or self.headers.get("Upgrade", "").lower() != "websocket":
+            self._send(404, b"Not Found", "text/plain")
+            return
+        key = self.headers["Sec-WebSocket-Key"]
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode(), usedforsecurity=False).digest()).decode()
+        self.send_response(101, "Switching Protocols")
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept)
+        self.end_headers()
+        self.wfile.flush()
+        local.serve_websocket(_WsConnection(self.rfile, self.wfile))
+        self.close_connection = True
+
+
+class LocalServer:
+    def __init__(
+        self,
+        meta: Meta = DEFAULT_META,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        initial_mids: Optional[Dict[str, float]] = None,
+        accounts: Optional[List[str]] = None,
+        book_interval: float = 0.05,
+    ):
+        """
+        Args:
+            meta (Meta): Perps to list, assets are numbered by their position in the universe.
+            host (str): Interface to listen on.
+            port (int): Port to listen on, 0 picks a free port.
+            initial_mids (Optional[Dict[str, float]]): Mids reported for coins that have not traded yet.
+            accounts (Optional[List[str]]): If given, only these accounts and their agents may send actions.
+            book_interval (float): Seconds between l2Book, bbo and allMids publications, like blocks.
+        """
+        self.engine = MatchingEngine(meta, initial_mids)
+        self.accounts = None if accounts is None else {account.lower() for account in accounts}
+        self.agents: Dict[str, str] = {}
+        self.nonces: Dict[str, List[int]] = {}
+        self.book_interval = book_interval
+        self.actions = 0
+        self._connections: Set[_WsConnection] = set()
+        self._connections_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.local = self  # type: ignore[attr-defined]
+        self._threads = [
+            threading.Thread(target=self._httpd.serve_forever, name="local-server-http", daemon=True),
+            threading.Thread(target=self._publish_books, name="local-server-books", daemon=True),
+        ]
+
+    @property
+    def base_url(self) -> str:
+        host, port = cast(Tuple[str, int], self._httpd.server_address[:2])
+        return f"http://{host}:{port}"
+
+    def start(self) -> "LocalServer":
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+
+    def handle_info(self, payload: Any) -> Any:
+        request_type = payload["type"]
+        engine = self.engine
+        with engine.lock:
+            if request_type == "meta":
+                return engine.meta
+            if request_type == "spotMeta":
+                return EMPTY_SPOT_META
+            if request_type == "perpDexs":
+                return [None]
+            if request_type == "allMids":
+                return engine.mids()
+            if request_type == "l2Book":
+                return engine.books[payload["coin"]].snapshot()
+            user = payload.get("user", "").lower()
+            if request_type == "openOrders":
+                return [order.to_wire() for order in engine.open_orders(user)]
+            if request_type == "frontendOpenOrders":
+                return [order.to_frontend_wire() for order in engine.open_orders(user)]
+            if request_type == "orderStatus":
+                return engine.order_status(user, payload["oid"])
+            if request_type == "clearinghouseState":
+                return engine.clearinghouse_state(user)
+            if request_type == "spotClearinghouseState":
+                return {"balances": []}
+            if request_type == "userFills":
+                return list(engine.fills.get(user, ()))
+        raise ValueError(f"unsupported info request {request_type}")
+
+    def _check_nonce(self, signer: str, nonce: int, now: int) -> Optional[str]:
+        if not now - NONCE_MAX_AGE_MS < nonce < now + NONCE_MAX_LEAD_MS:
+            return f"Invalid nonce: nonce {nonce} is not within the allowed time window"
+        nonces = self.nonces.setdefault(signer, [])
+        i = bisect.bisect_left(nonces, nonce)
+        if i < len(nonces) and nonces[i] == nonce:
+            return f"Invalid nonce: duplicate nonce {nonce}"
+        if len(nonces) >= MAX_TRACKED_NONCES and i == 0:
+            return f"Invalid nonce: nonce {nonce} is lower than the {MAX_TRACKED_NONCES} highest nonces"
+        nonces.insert(i, nonce)
+        if len(nonces) > MAX_TRACKED_NONCES:
+            nonces.pop(0)
+        return None
+
+    def handle_exchange(self, payload: Any) -> Any:
+        action = payload["action"]
+        nonce = payload["nonce"]
+        expires_after = payload.get("expiresAfter")
+        vault_address = payload.get("vaultAddress")
+        now = _now_ms()
+        if expires_after is not None and expires_after < now:
+            return {"status": "err", "response": f"Action expired at {expires_after}"}
+
+        if action["type"] == "approveAgent":
+            signed_action = dict(action)
+            signed_action.setdefault("agentName", "")
+            user = recover_user_from_user_signed_action(
+                signed_action,
+                payload["signature"],
+                APPROVE_AGENT_SIGN_TYPES,
+                "HyperliquidTransaction:ApproveAgent",
+                False,
+            ).lower()
+            signer = user
+        else:
+            signer = recover_agent_or_user_from_l1_action(
+                action, payload["signature"], vault_address, nonce, expires_after, False
+            ).lower()
+            user = self.agents.get(signer, signer)
+        if self.accounts is not None and user not in self.accounts:
+            return {"status": "err", "response": f"User or API Wallet {signer} does not exist."}
+        if vault_address is not None:
+            user = vault_address.lower()
+
+        engine = self.engine
+        with engine.lock:
+            error = self._check_nonce(signer, nonce, now)
+            if error is not None:
+                return {"status": "err", "response": error}
+            self.actions += 1
+            events: List[Event] = []
+            response_type = action["type"]
+            if action["type"] == "order":
+                statuses = [engine.place(user, wire, now, events) for wire in action["orders"]]
+            elif action["type"] == "batchModify":
+                response_type = "order"
+                statuses = [engine.modify(user, modify, now, events) for modify in action["modifies"]]
+            elif action["type"] == "cancel":
+                statuses = [engine.cancel(user, c["a"], c["o"], now, events) for c in action["cancels"]]
+            elif action["type"] == "cancelByCloid":
+                statuses = [
+                    engine.cancel_by_cloid(user, c["asset"], c["cloid"], now, events) for c in action["cancels"]
+                ]
+            else:
+                if action["type"] == "approveAgent":
+                    self.agents[action["agentAddress"].lower()] = user
+                return {"status": "ok", "response": {"type": "default"}}
+            self._publish(events)
+        return {"status": "ok", "response": {"type": response_type, "data": {"statuses": statuses}}}
+
+    def _publish(self, events: List[Event]) -> None:
+        order_updates: Dict[str, List[Any]] = {}
+        fills: Dict[str, List[Any]] = {}
+        messages: List[Tuple[Tuple[str, str], Any]] = []
+        for channel, key, data in events:
+            if channel == "orderUpdates":
+                order_updates.setdefault(key, []).append(data)
+            elif channel == "userFills":
+                fills.setdefault(key, []).append(data)
+            else:
+                messages.append(((channel, key), {"channel": channel, "data": data}))
+        for user, updates in order_updates.items():
+            messages.append((("orderUpdates", user), {"channel": "orderUpdates", "data": updates}))
+        for user, user_fills in fills.items():
+            messages.append(
+                (
+                    ("userFills", user),
+                    {"channel": "userFills", "data": {"user": user, "isSnapshot": False, "fills": user_fills}},
+                )
+            )
+        self._send_to_subscribers(messages)
+
+    def _send_to_subscribers(self, messages: List[Tuple[Tuple[str, str], Any]]) -> None:
+        with self._connections_lock:
+            connections = list(self._connections)
+        for routing_key, msg in messages:
+            raw = None
+            for connection in connections:
+                if routing_key in connection.subscriptions:
+                    raw = raw or json.dumps(msg, separators=(",", ":"))
+                    connection.send_text(raw)
+
+    def _publish_books(self) -> None:
+        while not self._stop_event.wait(self.book_interval):
+            engine = self.engine
+            with engine.lock:
+                if not engine.dirty_books:
+                    continue
+                messages: List[Tuple[Tuple[str, str], Any]] = []
+                for coin in engine.dirty_books:
+                    book = engine.books[coin]
+                    messages.append((("l2Book", coin), {"channel": "l2Book", "data": book.snapshot()}))
+                    bbo: List[Any] = []
+                    for side in (0, 1):
+                        best = book.best(side)
+                        bbo.append(None if best is None else book.level_wire(side, best))
+                    messages.append(
+                        (("bbo", coin), {"channel": "bbo", "data": {"coin": coin, "time": _now_ms(), "bbo": bbo}})
+                    )
+                engine.dirty_books.clear()
+                messages.append((("allMids", ""), {"channel": "allMids", "data": {"mids": engine.mids()}}))
+                self._send_to_subscribers(messages)
+
+    def serve_websocket(self, connection: _WsConnection) -> None:
+        with self._connections_lock:
+            self._connections.add(connection)
+        connection.send_text("Websocket connection established.")
+        try:
+            while not connection.closed:
+                text = connection.recv()
+                if text is None:
+                    break
+                msg = json.loads(text)
+                method = msg.get("method")
+                if method == "ping":
+                    connection.send_json({"channel": "pong"})
+                elif method in ("subscribe", "unsubscribe"):
+                    subscription = msg["subscription"]
+                    with self.engine.lock:
+                        if method == "subscribe":
+                            connection.subscriptions[_routing_key(subscription)] = subscription
+                        else:
+                            connection.subscriptions.pop(_routing_key(subscription), None)
+                        connection.send_json(
+                            {
+                                "channel": "subscriptionResponse",
+                                "data": {"method": method, "subscription": subscription},
+                            }
+                        )
+                        if method == "subscribe":
+                            self._send_snapshot(connection, subscription)
+        finally:
+            with self._connections_lock:
+                self._connections.discard(connection)
+            connection.close()
+
+    def _send_snapshot(self, connection: _WsConnection, subscription: Any) -> None:
+        engine = self.engine
+        if subscription["type"] == "l2Book" and subscription["coin"] in engine.books:
+            connection.send_json({"channel": "l2Book", "data": engine.books[subscription["coin"]].snapshot()})
+        elif subscription["type"] == "allMids":
+            connection.send_json({"channel": "allMids", "data": {"mids": engine.mids()}})
+        elif subscription["type"] == "userFills":
+            user = subscription["user"].lower()
+            fills = list(engine.fills.get(user, ()))
+            connection.send_json({"channel": "userFills", "data": {"user": user, "isSnapshot": True, "fills": fills}})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Hyperliquid /info, /exchange and /ws API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(LOCAL_API_URL.rsplit(":", 1)[1]))
+    parser.add_argument("--meta", help="JSON file with the perp meta to list, defaults to BTC, ETH and SOL")
+    args = parser.parse_args()
+
+    meta = DEFAULT_META
+    if args.meta:
+        with open(args.meta) as f:
+            meta = json.load(f)
+    server = LocalServer(meta, args.host, args.port).start()
+    print(f"serving on {server.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
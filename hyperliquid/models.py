@@ -0,0 +1,299 @@
+"""Optional typed views of user_state, open_orders and frontend_open_orders responses.
+
+    state = UserState(info.user_state(address))
+    state.margin_summary.account_value    # float, parsed on first access
+    state.sizes()                         # array("d") of every position's szi
+
+Models keep a reference to the response and parse numeric strings only when a field is first read, caching the
+result in a slot. Collection accessors such as sizes() parse straight from the response into an array without
+building a model per entry.
+"""
+
+import math
+from array import array
+
+from hyperliquid.utils.types import Any, Dict, Iterator, List, Optional
+
+
+class _Float:
+    """Float parsed from raw[key] on first access and cached in the instance slot _<name>."""
+
+    def __init__(self, key: str, optional: bool = False):
+        self.key = key
+        self.optional = optional
+
+    def __set_name__(self, owner: Any, name: str) -> None:
+        self.slot = "_" + name
+
+    def __get__(self, obj: Any, objtype: Any = None) -> Any:
+        if obj is None:
+            return self
+        try:
+            return getattr(obj, self.slot)
+        except AttributeError:
+            raw = obj.raw.get(self.key)
+            value = None if raw is None and self.optional else float(raw)
+            setattr(obj, self.slot, value)
+            return value
+
+
+def _float_array(items: List[Any], key: str, optional: bool = False) -> "array[float]":
+    if optional:
+        # a null value keeps its slot as nan so the array stays aligned with the items
+        return array("d", [math.nan if item.get(key) is None else float(item[key]) for item in items])
+    return array("d", [float(item[key]) for item in items])
+
+
+class MarginSummary:
+    __slots__ = ("raw", "_account_value", "_total_margin_used", "_total_ntl_pos", "_total_raw_usd")
+
+    account_value = _Float("accountValue")
+    total_margin_used = _Float("totalMarginUsed")
+    total_ntl_pos = _Float("totalNtlPos")
+    total_raw_usd = _Float("totalRawUsd")
+
+    def __init__(self, raw: Any):
+        self.raw = raw
+
+
+class Position:
+    __slots__ = (
+        "raw",
+        "_szi",
+        "_entry_px",
+        "_position_value",
+        "_unrealized_pnl",
+        "_return_on_equity",
+        "_liquidation_px",
+        "_margin_used",
+    )
+
+    szi = _Float("szi")
+    entry_px = _Float("entryPx", optional=True)
+    position_value = _Float("positionValue")
+    unrealized_pnl = _Float("unrealizedPnl")
+    return_on_equity = _Float("returnOnEquity")
+    liquidation_px = _Float("liquidationPx", optional=True)
+    margin_used = _Float("marginUsed")
+
+    def __init__(self, raw: Any):
+        self.raw = raw
+
+    @property
+    def coin(self) -> str:
+        coin: str = self.raw["coin"]
+        return coin
+
+    @property
+    def leverage_type(self) -> str:
+        leverage_type: str = self.raw["leverage"]["type"]
+        return leverage_type
+
+    @property
+    def leverage(self) -> int:
+        leverage: int = self.raw["leverage"]["value"]
+        return leverage
+
+    def __repr__(self):
+        return f"Position(coin={self.coin}, szi={self.szi}, entry_px={self.entry_px})"
+
+
+class UserState:
+    """View of a user_state (clearinghouseState) response."""
+
+    __slots__ = (
+        "raw",
+        "_positions",
+        "_by_coin",
+        "_margin_summary",
+        "_cross_margin_summary",
+        "_withdrawable",
+        "_arrays",
+    )
+
+    withdrawable = _Float("withdrawable")
+
+    def __init__(self, raw: Any):
+        self.raw = raw
+        self._positions: Optional[List[Position]] = None
+        self._by_coin: Optional[Dict[str, Position]] = None
+        self._margin_summary: Optional[MarginSummary] = None
+        self._cross_margin_summary: Optional[MarginSummary] = None
+        self._arrays: Dict[str, "array[float]"] = {}
+
+    @property
+    def time(self) -> Optional[int]:
+        time: Optional[int] = self.raw.get("time")
+        return time
+
+    @property
+    def margin_summary(self) -> MarginSummary:
+        if self._margin_summary is None:
+            self._margin_summary = MarginSummary(self.raw["marginSummary"])
+        return self._margin_summary
+
+    @property
+    def cross_margin_summary(self) -> MarginSummary:
+        if self._cross_margin_summary is None:
+            self._cross_margin_summary = MarginSummary(self.raw["crossMarginSummary"])
+        return self._cross_margin_summary
+
+    @property
+    def positions(self) -> List[Position]:
+        if self._positions is None:
+            self._positions = [Position(asset_position["position"]) for asset_position in self.raw["assetPositions"]]
+        return self._positions
+
+    def position(self, coin: str) -> Optional[Position]:
+        if self._by_coin is None:
+            self._by_coin = {position.coin: position for position in self.positions}
+        return self._by_coin.get(coin)
+
+    def coins(self) -> List[str]:
+        return [asset_position["position"]["coin"] for asset_position in self.raw["assetPositions"]]
+
+    def _array(self, key: str, optional: bool = False) -> "array[float]":
+        values = self._arrays.get(key)
+        if values is None:
+            positions = [asset_position["position"] for asset_position in self.raw["assetPositions"]]
+            values = self._arrays[key] = _float_array(positions, key, optional)
+        return values
+
+    def sizes(self) -> "array[float]":
+        """szi of every position in coins() order, negative for shorts."""
+        return self._array("szi")
+
+    def entry_pxs(self) -> "array[float]":
+        """entryPx of every position in coins() order, nan where it is null."""
+        return self._array("entryPx", optional=True)
+
+    def position_values(self) -> "array[float]":
+        return self._array("positionValue")
+
+    def unrealized_pnls(self) -> "array[float]":
+        return self._array("unrealizedPnl")
+
+    def margins_used(self) -> "array[float]":
+        return self._array("marginUsed")
+
+    def __repr__(self):
+        return (
+            f"UserState(positions={len(self.raw['assetPositions'])}, account_value={self.margin_summary.account_value})"
+        )
+
+
+class OpenOrder:
+    """An entry of open_orders or frontend_open_orders. Fields only sent by frontend_open_orders are None otherwise."""
+
+    __slots__ = ("raw", "_limit_px", "_sz", "_orig_sz", "_trigger_px")
+
+    limit_px = _Float("limitPx")
+    sz = _Float("sz")
+    orig_sz = _Float("origSz", optional=True)
+    trigger_px = _Float("triggerPx", optional=True)
+
+    def __init__(self, raw: Any):
+        self.raw = raw
+
+    @property
+    def coin(self) -> str:
+        coin: str = self.raw["coin"]
+        return coin
+
+    @property
+    def oid(self) -> int:
+        oid: int = self.raw["oid"]
+        return oid
+
+    @property
+    def is_buy(self) -> bool:
+        return bool(self.raw["side"] == "B")
+
+    @property
+    def timestamp(self) -> int:
+        timestamp: int = self.raw["timestamp"]
+        return timestamp
+
+    @property
+    def cloid(self) -> Optional[str]:
+        cloid: Optional[str] = self.raw.get("cloid")
+        return cloid
+
+    @property
+    def reduce_only(self) -> Optional[bool]:
+        reduce_only: Optional[bool] = self.raw.get("reduceOnly")
+        return reduce_only
+
+    @property
+    def order_type(self) -> Optional[str]:
+        order_type: Optional[str] = self.raw.get("orderType")
+        return order_type
+
+    @property
+    def tif(self) -> Optional[str]:
+        tif: Optional[str] = self.raw.get("tif")
+        return tif
+
+    @property
+    def is_trigger(self) -> Optional[bool]:
+        is_trigger: Optional[bool] = self.raw.get("isTrigger")
+        return is_trigger
+
+    def __repr__(self):
+        return (
+            f"OpenOrder(coin={self.coin}, oid={self.oid}, is_buy={self.is_buy}, limit_px={self.limit_px}, sz={self.sz})"
+        )
+
+
+class OpenOrders:
+    """View of an open_orders or frontend_open_orders response. Entries are wrapped in OpenOrder on access."""
+
+    __slots__ = ("raw", "_orders", "_arrays")
+
+    def __init__(self, raw: List[Any]):
+        self.raw = raw
+        self._orders: List[Optional[OpenOrder]] = [None] * len(raw)
+        self._arrays: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __getitem__(self, i: int) -> OpenOrder:
+        order = self._orders[i]
+        if order is None:
+            order = self._orders[i] = OpenOrder(self.raw[i])
+        return order
+
+    def __iter__(self) -> Iterator[OpenOrder]:
+        for i in range(len(self.raw)):
+            yield self[i]
+
+    def coins(self) -> List[str]:
+        return [order["coin"] for order in self.raw]
+
+    def _array(self, key: str) -> "array[float]":
+        values = self._arrays.get(key)
+        if values is None:
+            values = self._arrays[key] = _float_array(self.raw, key)
+        return values
+
+    def limit_pxs(self) -> "array[float]":
+        return self._array("limitPx")
+
+    def sizes(self) -> "array[float]":
+        return self._array("sz")
+
+    def signed_sizes(self) -> "array[float]":
+        """sz of every order, negative for sells."""
+        values = self._arrays.get("signed_sz")
+        if values is None:
+            values = self._arrays["signed_sz"] = array(
+                "d", [float(order["sz"]) if order["side"] == "B" else -float(order["sz"]) for order in self.raw]
+            )
+        return values
+
+    def oids(self) -> "array[int]":
+        values = self._arrays.get("oid")
+        if values is None:
+            values = self._arrays["oid"] = array("q", [order["oid"] for order in self.raw])
+        return values
@@ -0,0 +1,193 @@
+import threading
+from array import array
+
+from hyperliquid.info import Info
+from hyperliquid.utils.types import Any, Dict, List, Optional, Tuple
+
+# l2Book messages carry up to 20 levels per side
+DEFAULT_CAPACITY = 20
+
+BID = 0
+ASK = 1
+
+
+class L2Book:
+    """Price levels of one coin in preallocated arrays, updated in place from l2Book and bbo messages.
+
+    Side BID and ASK each have px and sz arrays of doubles and an n array of order counts, best level first, of
+    which the first n_levels[side] entries are valid. l2Book messages replace the levels, bbo messages only move the
+    top of the book in between. Messages older than the last applied one are ignored.
+
+    Queries walk the arrays without building lists. The arrays support the buffer protocol, e.g.
+    numpy.frombuffer(book.px[BID], count=book.n_levels[BID]) gives a view without copying.
+    """
+
+    def __init__(self, coin: str, capacity: int = DEFAULT_CAPACITY):
+        self.coin = coin
+        self.capacity = capacity
+        self.px = (array("d", bytes(8 * capacity)), array("d", bytes(8 * capacity)))
+        self.sz = (array("d", bytes(8 * capacity)), array("d", bytes(8 * capacity)))
+        self.n = (array("l", [0] * capacity), array("l", [0] * capacity))
+        self.n_levels = [0, 0]
+        self.time = 0
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def on_l2_book(self, ws_msg: Any) -> None:
+        data = ws_msg["data"]
+        with self._lock:
+            if data["time"] < self.time:
+                return
+            for side in (BID, ASK):
+                px, sz, n = self.px[side], self.sz[side], self.n[side]
+                levels = data["levels"][side]
+                count = min(len(levels), self.capacity)
+                for i in range(count):
+                    level = levels[i]
+                    px[i] = float(level["px"])
+                    sz[i] = float(level["sz"])
+                    n[i] = level["n"]
+                self.n_levels[side] = count
+            self.time = data["time"]
+            self.version += 1
+
+    def on_bbo(self, ws_msg: Any) -> None:
+        data = ws_msg["data"]
+        with self._lock:
+            if data["time"] < self.time:
+                return
+            for side in (BID, ASK):
+                level = data["bbo"][side]
+                if level is None:
+                    self.n_levels[side] = 0
+                else:
+                    self._set_top(side, float(level["px"]), float(level["sz"]), level["n"])
+            self.time = data["time"]
+            self.version += 1
+
+    def _set_top(self, side: int, top_px: float, top_sz: float, top_n: int) -> None:
+        px, sz, n = self.px[side], self.sz[side], self.n[side]
+        count = self.n_levels[side]
+        sign = 1.0 if side == BID else -1.0
+        # levels better than the new top were taken out
+        dropped = 0
+        while dropped < count and (px[dropped] - top_px) * sign > 0:
+            dropped += 1
+        if dropped:
+            count -= dropped
+            px[:count] = px[dropped : dropped + count]
+            sz[:count] = sz[dropped : dropped + count]
+            n[:count] = n[dropped : dropped + count]
+        if count == 0 or px[0] != top_px:
+            # a new best level, shift the others down and lose the last one if full
+            count = min(count + 1, self.capacity)
+            px[1:count] = px[: count - 1]
+            sz[1:count] = sz[: count - 1]
+            n[1:count] = n[: count - 1]
+        px[0], sz[0], n[0] = top_px, top_sz, top_n
+        self.n_levels[side] = count
+
+    def best(self, side: int) -> Optional[Tuple[float, float]]:
+        """(px, sz) of the best level of side, None if the side is empty."""
+        with self._lock:
+            if self.n_levels[side] == 0:
+                return None
+            return self.px[side][0], self.sz[side][0]
+
+    def mid(self) -> Optional[float]:
+        with self._lock:
+            if self.n_levels[BID] == 0 or self.n_levels[ASK] == 0:
+                return None
+            return (self.px[BID][0] + self.px[ASK][0]) / 2
+
+    def spread_bps(self) -> Optional[float]:
+        with self._lock:
+            if self.n_levels[BID] == 0 or self.n_levels[ASK] == 0:
+                return None
+            bid, ask = self.px[BID][0], self.px[ASK][0]
+            return (ask - bid) / ((bid + ask) / 2) * 1e4
+
+    def microprice(self) -> Optional[float]:
+        """Mid weighted by the size on the opposite side of the top levels, leaning towards the thinner side."""
+        with self._lock:
+            if self.n_levels[BID] == 0 or self.n_levels[ASK] == 0:
+                return None
+            bid, ask = self.px[BID][0], self.px[ASK][0]
+            bid_sz, ask_sz = self.sz[BID][0], self.sz[ASK][0]
+            return (bid * ask_sz + ask * bid_sz) / (bid_sz + ask_sz)
+
+    def depth(self, side: int, bps: float) -> float:
+        """Total size on side at prices within bps of the mid."""
+        with self._lock:
+            if self.n_levels[BID] == 0 or self.n_levels[ASK] == 0:
+                return 0.0
+            mid = (self.px[BID][0] + self.px[ASK][0]) / 2
+            px, sz = self.px[side], self.sz[side]
+            bound = mid * (1 - bps / 1e4) if side == BID else mid * (1 + bps / 1e4)
+            total = 0.0
+            for i in range(self.n_levels[side]):
+                if (px[i] < bound) if side == BID else (px[i] > bound):
+                    break
+                total += sz[i]
+            return total
+
+    def imbalance(self, n_levels: int = 1) -> Optional[float]:
+        """(bid size - ask size) / (bid size + ask size) over the top n_levels of each side, in [-1, 1]."""
+        with self._lock:
+            bid_sz = sum(self.sz[BID][: min(n_levels, self.n_levels[BID])])
+            ask_sz = sum(self.sz[ASK][: min(n_levels, self.n_levels[ASK])])
+        if bid_sz + ask_sz == 0:
+            return None
+        return (bid_sz - ask_sz) / (bid_sz + ask_sz)
+
+    def vwap(self, is_buy: bool, sz: float) -> Optional[float]:
+        """Average price of a market order for sz against the visible levels, None if they are not deep enough."""
+        side = ASK if is_buy else BID
+        with self._lock:
+            px, level_sz = self.px[side], self.sz[side]
+            remaining = sz
+            notional = 0.0
+            for i in range(self.n_levels[side]):
+                take = min(remaining, level_sz[i])
+                notional += take * px[i]
+                remaining -= take
+                if remaining <= 0:
+                    return notional / sz
+        return None
+
+    def levels(self, side: int) -> List[Tuple[float, float, int]]:
+        """Copy of the levels of side as (px, sz, n), best first."""
+        with self._lock:
+            count = self.n_levels[side]
+            return list(zip(self.px[side][:count], self.sz[side][:count], self.n[side][:count]))
+
+
+class OrderBooks:
+    """L2Books for several coins kept current from l2Book and, with bbo=True, bbo subscriptions."""
+
+    def __init__(self, info: Info, coins: List[str], bbo: bool = True, capacity: int = DEFAULT_CAPACITY):
+        self.info = info
+        self.bbo = bbo
+        self.books: Dict[str, L2Book] = {coin: L2Book(coin, capacity) for coin in coins}
+        self._subscriptions: List[Tuple[Any, int]] = []
+
+    def __getitem__(self, coin: str) -> L2Book:
+        return self.books[coin]
+
+    def start(self) -> None:
+        for coin, book in self.books.items():
+            subscriptions: List[Tuple[Any, Any]] = [({"type": "l2Book", "coin": coin}, book.on_l2_book)]
+            if self.bbo:
+                subscriptions.append(({"type": "bbo", "coin": coin}, book.on_bbo))
+            for subscription, callback in subscriptions:
+                self._subscriptions.append((subscription, self.info.subscribe(subscription, callback)))
+
+    def seed(self) -> None:
+        """Fill every book from l2_snapshot, e.g. when the Info has no websocket or before the first message."""
+        for coin, book in self.books.items():
+            book.on_l2_book({"channel": "l2Book", "data": self.info.l2_snapshot(coin)})
+
+    def stop(self) -> None:
+        for subscription, subscription_id in self._subscriptions:
+            self.info.unsubscribe(subscription, subscription_id)
+        self._subscriptions = []
@@ -0,0 +1,193 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+
+from hyperliquid.exchange import Exchange
+from hyperliquid.utils.signing import CancelByCloidRequest, CancelRequest, OrderRequest, OrderType
+from hyperliquid.utils.types import Any, BuilderInfo, Cloid, Dict, List, Optional, Tuple
+
+# /exchange requests weigh 1 + floor(batch_length / 40), so 39 items is the largest batch at the minimum weight
+DEFAULT_MAX_BATCH = 39
+
+logger = logging.getLogger(__name__)
+
+
+class OrderGateway:
+    """Coalesces individual order and cancel calls into bulk actions.
+
+    Requests are collected for up to window seconds after the first one arrives, or until max_batch of them are
+    waiting, and are then signed and sent as one bulk_orders, bulk_cancel or bulk_cancel_by_cloid action. While a
+    batch is in flight new requests keep accumulating, so batches grow with load. Every call returns a Future that
+    resolves to the caller's own status entry from the response, e.g. {"resting": {"oid": 123}}, or to
+    {"error": ...} if the whole action was rejected.
+
+    Within a batch, cancels are sent before orders to free up margin for them, so calls are not sent in the order
+    they were made. The exception is a cancel_by_cloid for an order that is still waiting to be sent: the batch
+    is sent right away and the cancel is held back until its order has been sent, so it never runs ahead of the
+    order it targets. A cancel by oid cannot target a waiting order, which has no oid yet.
+    """
+
+    def __init__(self, exchange: Exchange, window: float = 0.005, max_batch: int = DEFAULT_MAX_BATCH):
+        self.exchange = exchange
+        self.window = window
+        self.max_batch = max_batch
+        self.batches_sent = 0
+        self.requests_sent = 0
+        self._orders: List[Tuple[OrderRequest, Optional[BuilderInfo], Future[Any]]] = []
+        self._cancels: List[Tuple[CancelRequest, Future[Any]]] = []
+        self._cancels_by_cloid: List[Tuple[CancelByCloidRequest, Future[Any]]] = []
+        # cancels by cloid of orders that are still waiting, released once those orders have been sent
+        self._held: List[Tuple[CancelByCloidRequest, Future[Any]]] = []
+        self._first_arrival: Optional[float] = None
+        self._flush_requested = False
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="hyperliquid-order-gateway", daemon=True)
+        self._thread.start()
+
+    def order(
+        self,
+        name: str,
+        is_buy: bool,
+        sz: float,
+        limit_px: float,
+        order_type: OrderType,
+        reduce_only: bool = False,
+        cloid: Optional[Cloid] = None,
+        builder: Optional[BuilderInfo] = None,
+    ) -> Future[Any]:
+        order: OrderRequest = {
+            "coin": name,
+            "is_buy": is_buy,
+            "sz": sz,
+            "limit_px": limit_px,
+            "order_type": order_type,
+            "reduce_only": reduce_only,
+        }
+        if cloid:
+            order["cloid"] = cloid
+        future: Future[Any] = Future()
+        self._enqueue(self._orders, (order, builder, future))
+        return future
+
+    def cancel(self, name: str, oid: int) -> Future[Any]:
+        future: Future[Any] = Future()
+        self._enqueue(self._cancels, ({"coin": name, "oid": oid}, future))
+        return future
+
+    def cancel_by_cloid(self, name: str, cloid: Cloid) -> Future[Any]:
+        future: Future[Any] = Future()
+        with self._condition:
+            if self._waiting(cloid):
+                if self._stopped:
+                    raise RuntimeError("Cannot submit to a stopped OrderGateway")
+                self._held.append(({"coin": name, "cloid": cloid}, future))
+                # the order it cancels is sent now instead of at the end of the window
+                self._flush_requested = True
+                self._condition.notify()
+                return future
+        self._enqueue(self._cancels_by_cloid, ({"coin": name, "cloid": cloid}, future))
+        return future
+
+    def _waiting(self, cloid: Cloid) -> bool:
+        raw = cloid.to_raw()
+        for order, _, _ in self._orders:
+            order_cloid = order.get("cloid")
+            if order_cloid is not None and order_cloid.to_raw() == raw:
+                return True
+        return False
+
+    def _enqueue(self, queue: List[Any], item: Any) -> None:
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("Cannot submit to a stopped OrderGateway")
+            queue.append(item)
+            if self._first_arrival is None:
+                self._first_arrival = time.monotonic()
+            self._condition.notify()
+
+    def _pending(self) -> int:
+        return len(self._orders) + len(self._cancels) + len(self._cancels_by_cloid)
+
+    def flush(self) -> None:
+        """Send whatever is waiting without waiting for the window to pass."""
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify()
+
+    def stop(self) -> None:
+        """Send the requests that are still waiting and stop the gateway."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._pending() == 0 and not self._stopped:
+                    self._condition.wait()
+                while not self._stopped and not self._flush_requested and self._pending() < self.max_batch:
+                    first_arrival = self._first_arrival if self._first_arrival is not None else time.monotonic()
+                    remaining = first_arrival + self.window - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._pending() == 0 and self._stopped:
+                    return
+                cancels, self._cancels = self._cancels[: self.max_batch], self._cancels[self.max_batch :]
+                cancels_by_cloid = self._cancels_by_cloid[: self.max_batch]
+                self._cancels_by_cloid = self._cancels_by_cloid[self.max_batch :]
+                orders, self._orders = self._orders[: self.max_batch], self._orders[self.max_batch :]
+                # a held cancel whose order is in this batch is released to the next one, sent after this batch
+                held, self._held = self._held, []
+                for held_cancel in held:
+                    waiting = self._waiting(held_cancel[0]["cloid"])
+                    (self._held if waiting else self._cancels_by_cloid).append(held_cancel)
+                # anything left over did not fit in a full batch and is sent right after this one
+                self._first_arrival = time.monotonic() if self._pending() else None
+                self._flush_requested = self._pending() > 0
+
+            # cancels go first so that they free up margin for the orders that follow
+            if cancels:
+                self._send([future for _, future in cancels], self.exchange.bulk_cancel, [c for c, _ in cancels])
+            if cancels_by_cloid:
+                self._send(
+                    [future for _, future in cancels_by_cloid],
+                    self.exchange.bulk_cancel_by_cloid,
+                    [c for c, _ in cancels_by_cloid],
+                )
+            by_builder: Dict[Any, List[Tuple[OrderRequest, Optional[BuilderInfo], Future[Any]]]] = {}
+            for item in orders:
+                builder = item[1]
+                key = None if builder is None else (builder["b"].lower(), builder["f"])
+                by_builder.setdefault(key, []).append(item)
+            for items in by_builder.values():
+                self._send(
+                    [future for _, _, future in items],
+                    self.exchange.bulk_orders,
+                    [order for order, _, _ in items],
+                    items[0][1],
+                )
+
+    def _send(self, futures: List[Future[Any]], method: Any, *args: Any) -> None:
+        try:
+            response = method(*args)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.debug(f"OrderGateway batch of {len(futures)} failed: {e!r}")
+            for future in futures:
+                future.set_exception(e)
+            return
+        self.batches_sent += 1
+        self.requests_sent += len(futures)
+        statuses = None
+        if isinstance(response, dict) and response.get("status") == "ok":
+            statuses = response["response"]["data"]["statuses"]
+        if statuses is None or len(statuses) != len(futures):
+            error = response.get("response", response) if isinstance(response, dict) else response
+            for future in futures:
+                future.set_result({"error": error})
+            return
+        for future, status in zip(futures, statuses):
+            future.set_result(status)
@@ -0,0 +1,205 @@
+import threading
+from collections import OrderedDict
+
+from hyperliquid.info import Info
+from hyperliquid.utils.types import Any, Dict, Fill, List, Optional, Set
+
+# statuses in which an order can still fill
+OPEN_STATUSES = ("open", "triggered")
+
+# fills can arrive before the orderUpdates message announcing their order, e.g. for IOC orders
+MAX_ORPHAN_FILLS = 1_000
+
+
+class TrackedOrder:
+    __slots__ = (
+        "oid",
+        "cloid",
+        "coin",
+        "side",
+        "limit_px",
+        "orig_sz",
+        "sz",
+        "status",
+        "timestamp",
+        "status_timestamp",
+        "reduce_only",
+        "filled_sz",
+        "fills",
+    )
+
+    def __init__(self, order: Any, status: str, status_timestamp: int):
+        self.oid: int = order["oid"]
+        self.cloid: Optional[str] = order.get("cloid")
+        self.coin: str = order["coin"]
+        self.side: str = order["side"]
+        self.limit_px = float(order["limitPx"])
+        self.orig_sz = float(order.get("origSz", order["sz"]))
+        self.sz = float(order["sz"])
+        self.status = status
+        self.timestamp: int = order["timestamp"]
+        self.status_timestamp = status_timestamp
+        self.reduce_only: bool = order.get("reduceOnly", False)
+        self.filled_sz = 0.0
+        self.fills: List[Fill] = []
+
+    @property
+    def is_open(self) -> bool:
+        return self.status in OPEN_STATUSES
+
+    def __repr__(self):
+        return (
+            f"TrackedOrder(oid={self.oid}, coin={self.coin}, side={self.side}, limit_px={self.limit_px}, "
+            f"sz={self.sz}/{self.orig_sz}, status={self.status})"
+        )
+
+
+class OrderTracker:
+    """In-process mirror of one user's orders, kept current from the orderUpdates and userFills channels.
+
+    The mirror is seeded once from frontend_open_orders and then only updated from websocket messages, so lookups
+    by oid, cloid or coin never touch the network. Closed orders are kept for max_closed orders so that late fills
+    and status queries still resolve. version increases on every change.
+
+    Note that the websocket manager accepts a single orderUpdates subscription, so use one tracker per Info.
+    """
+
+    def __init__(self, info: Info, address: str, dexs: Optional[List[str]] = None, max_closed: int = 10_000):
+        self.info = info
+        self.address = address
+        self.dexs = dexs if dexs is not None else [""]
+        self.max_closed = max_closed
+        self.version = 0
+        self._orders: Dict[int, TrackedOrder] = {}
+        self._closed: "OrderedDict[int, TrackedOrder]" = OrderedDict()
+        self._cloid_to_oid: Dict[str, int] = {}
+        self._open_by_coin: Dict[str, Set[int]] = {}
+        self._seen_tids: Set[int] = set()
+        self._orphan_fills: "OrderedDict[int, List[Fill]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._subscription_ids: List[int] = []
+
+    def start(self) -> None:
+        """Subscribe to order updates and fills, then seed the open orders over REST."""
+        self._subscription_ids = [
+            self.info.subscribe({"type": "orderUpdates", "user": self.address}, self.on_order_updates),
+            self.info.subscribe({"type": "userFills", "user": self.address}, self.on_user_fills),
+        ]
+        for dex in self.dexs:
+            self.seed(self.info.frontend_open_orders(self.address, dex))
+
+    def stop(self) -> None:
+        if self._subscription_ids:
+            self.info.unsubscribe({"type": "orderUpdates", "user": self.address}, self._subscription_ids[0])
+            self.info.unsubscribe({"type": "userFills", "user": self.address}, self._subscription_ids[1])
+            self._subscription_ids = []
+
+    def seed(self, open_orders: List[Any]) -> None:
+        """Add open orders from a frontend_open_orders response. Orders already known from the websocket win."""
+        with self._lock:
+            for order in open_orders:
+                if order["oid"] not in self._orders and order["oid"] not in self._closed:
+                    self._insert(TrackedOrder(order, "open", order["timestamp"]))
+            self.version += 1
+
+    def on_order_updates(self, ws_msg: Any) -> None:
+        with self._lock:
+            for update in ws_msg["data"]:
+                order = update["order"]
+                oid = order["oid"]
+                tracked = self._orders.get(oid) or self._closed.get(oid)
+                if tracked is None:
+                    tracked = TrackedOrder(order, update["status"], update["statusTimestamp"])
+                    self._insert(tracked)
+                elif update["statusTimestamp"] < tracked.status_timestamp:
+                    continue
+                else:
+                    tracked.limit_px = float(order["limitPx"])
+                    tracked.sz = float(order["sz"])
+                    tracked.status = update["status"]
+                    tracked.status_timestamp = update["statusTimestamp"]
+                if tracked.is_open:
+                    # a newer open status, e.g. a modify that kept the oid, brings a closed order back
+                    self._reopen(tracked)
+                else:
+                    self._close(tracked)
+            self.version += 1
+
+    def on_user_fills(self, ws_msg: Any) -> None:
+        with self._lock:
+            for fill in ws_msg["data"]["fills"]:
+                tid = fill["tid"]
+                if tid in self._seen_tids:
+                    continue
+                self._seen_tids.add(tid)
+                tracked = self._orders.get(fill["oid"]) or self._closed.get(fill["oid"])
+                if tracked is None:
+                    self._orphan_fills.setdefault(fill["oid"], []).append(fill)
+                    while len(self._orphan_fills) > MAX_ORPHAN_FILLS:
+                        _, dropped = self._orphan_fills.popitem(last=False)
+                        for dropped_fill in dropped:
+                            self._seen_tids.discard(dropped_fill["tid"])
+                else:
+                    self._apply_fill(tracked, fill)
+            self.version += 1
+
+    def _apply_fill(self, tracked: TrackedOrder, fill: Fill) -> None:
+        tracked.fills.append(fill)
+        tracked.filled_sz += float(fill["sz"])
+        if tracked.is_open:
+            tracked.sz = max(0.0, tracked.orig_sz - tracked.filled_sz)
+
+    def _insert(self, tracked: TrackedOrder) -> None:
+        for fill in self._orphan_fills.pop(tracked.oid, ()):
+            self._apply_fill(tracked, fill)
+        if tracked.cloid is not None:
+            self._cloid_to_oid[tracked.cloid] = tracked.oid
+        if tracked.is_open:
+            self._orders[tracked.oid] = tracked
+            self._open_by_coin.setdefault(tracked.coin, set()).add(tracked.oid)
+        else:
+            self._remember_closed(tracked)
+
+    def _close(self, tracked: TrackedOrder) -> None:
+        if self._orders.pop(tracked.oid, None) is not None:
+            self._open_by_coin[tracked.coin].discard(tracked.oid)
+            self._remember_closed(tracked)
+
+    def _reopen(self, tracked: TrackedOrder) -> None:
+        if self._closed.pop(tracked.oid, None) is not None:
+            if tracked.cloid is not None:
+                self._cloid_to_oid[tracked.cloid] = tracked.oid
+            self._orders[tracked.oid] = tracked
+            self._open_by_coin.setdefault(tracked.coin, set()).add(tracked.oid)
+
+    def _remember_closed(self, tracked: TrackedOrder) -> None:
+        self._closed[tracked.oid] = tracked
+        while len(self._closed) > self.max_closed:
+            _, evicted = self._closed.popitem(last=False)
+            if evicted.cloid is not None and self._cloid_to_oid.get(evicted.cloid) == evicted.oid:
+                del self._cloid_to_oid[evicted.cloid]
+            for fill in evicted.fills:
+                self._seen_tids.discard(fill["tid"])
+
+    def order(self, oid: int) -> Optional[TrackedOrder]:
+        with self._lock:
+            return self._orders.get(oid) or self._closed.get(oid)
+
+    def order_by_cloid(self, cloid: Any) -> Optional[TrackedOrder]:
+        with self._lock:
+            oid = self._cloid_to_oid.get(str(cloid))
+            return None if oid is None else self.order(oid)
+
+    def open_orders(self, coin: Optional[str] = None) -> List[TrackedOrder]:
+        with self._lock:
+            if coin is None:
+                return list(self._orders.values())
+            return [self._orders[oid] for oid in self._open_by_coin.get(coin, ())]
+
+    def remaining_sz(self, oid: int) -> float:
+        tracked = self.order(oid)
+        return 0.0 if tracked is None or not tracked.is_open else tracked.sz
+
+    def fills(self, oid: int) -> List[Fill]:
+        tracked = self.order(oid)
+        return [] if tracked is None else list(tracked.fills)
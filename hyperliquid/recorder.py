@@ -0,0 +1,432 @@
+"""Record trades, bbo and l2Book for many coins into partitioned columnar segment files.
+
+    python -m hyperliquid.recorder --root ticks                 # every listed perp
+    python -m hyperliquid.recorder --root ticks --coin BTC --coin ETH --channel trades
+
+Files are partitioned as root/<coin>/<YYYY-MM-DD>/<channel>.<seq>.seg by the UTC day of each event's exchange
+time. A segment starts with a JSON header describing its columns and is followed by blocks, one per channel and
+partition every flush_interval seconds. A block header carries the row count, the first and last event time and
+the byte length of every column, then each column follows as a packed array, zlib compressed unless compression
+is None. Blocks are self-describing, so a segment cut short by a crash is readable up to its last whole block.
+Segments are rotated once they reach rotate_bytes, a new recorder never appends to existing files.
+
+Websocket callbacks only append to per-partition lists, encoding, compression and writing happen on the flush
+thread. Every block is handed to the OS as it is written, so a segment that is still being written can be read
+up to its last flushed block. fsync="interval" syncs written files every fsync_interval seconds, "always" after
+every block and "never" leaves it to the OS. stats() reports rows, bytes and throughput.
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import struct
+import threading
+import time
+import zlib
+from array import array
+
+from hyperliquid.api import API
+from hyperliquid.utils.constants import MAINNET_API_URL
+from hyperliquid.utils.types import Any, Dict, Iterator, List, NamedTuple, Optional, Subscription, Tuple, cast
+
+FILE_MAGIC = b"HLTICK01"
+BLOCK_MAGIC = b"BLK1"
+# magic, rows, first time, last time, followed by one uint32 byte length per column
+BLOCK_HEADER = struct.Struct("<4sIqq")
+CHANNELS = ("trades", "bbo", "l2Book")
+FSYNC_POLICIES = ("never", "interval", "always")
+DEFAULT_DEPTH = 20
+DEFAULT_ROTATE_BYTES = 256 * 1024 * 1024
+
+# (name, array typecode, values per row)
+Column = Tuple[str, str, int]
+Block = NamedTuple("Block", [("rows", int), ("start", int), ("end", int), ("columns", Dict[str, Any])])
+
+
+def schema(channel: str, depth: int = DEFAULT_DEPTH) -> List[Column]:
+    if channel == "trades":
+        return [("time", "q", 1), ("px", "d", 1), ("sz", "d", 1), ("side", "b", 1), ("tid", "q", 1)]
+    if channel == "bbo":
+        return [("time", "q", 1), ("bid_px", "d", 1), ("bid_sz", "d", 1), ("ask_px", "d", 1), ("ask_sz", "d", 1)]
+    if channel == "l2Book":
+        # levels best first, padded with nan when a side has fewer than depth levels
+        return [("time", "q", 1)] + [(name, "d", depth) for name in ("bid_px", "bid_sz", "ask_px", "ask_sz")]
+    raise ValueError("unsupported channel", channel)
+
+
+def partition_day(time_ms: int) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(time_ms // 1000))
+
+
+def coin_dir(coin: str) -> str:
+    # spot pairs like PURR/USDC and builder dex coins like xyz:ABC must stay one path component
+    return coin.replace("/", "_").replace(":", "_")
+
+
+def encode_header(channel: str, coin: str, columns: List[Column], compression: Optional[str]) -> bytes:
+    header = json.dumps({"channel": channel, "coin": coin, "columns": columns, "compression": compression}).encode()
+    return FILE_MAGIC + struct.pack("<I", len(header)) + header
+
+
+def decode_header(buffer: Any) -> Tuple[Dict[str, Any], int]:
+    """(header, offset of the first block) of a segment."""
+    if bytes(buffer[: len(FILE_MAGIC)]) != FILE_MAGIC:
+        raise ValueError("not a tick segment")
+    (length,) = struct.unpack_from("<I", buffer, len(FILE_MAGIC))
+    start = len(FILE_MAGIC) + 4
+    header = json.loads(bytes(buffer[start : start + length]))
+    header["columns"] = [tuple(column) for column in header["columns"]]
+    return header, start + length
+
+
+def iter_block_offsets(buffer: Any, offset: int, n_columns: int) -> Iterator[Tuple[int, int, int, int, List[int]]]:
+    """(offset of the column data, rows, start, end, column byte lengths) of every whole block from offset on."""
+    lengths = struct.Struct(f"<{n_columns}I")
+    size = len(buffer)
+    while offset + BLOCK_HEADER.size + lengths.size <= size:
+        magic, rows, start, end = BLOCK_HEADER.unpack_from(buffer, offset)
+        if magic != BLOCK_MAGIC:
+            raise ValueError("corrupt block", offset)
+        column_lengths = list(lengths.unpack_from(buffer, offset + BLOCK_HEADER.size))
+        data_offset = offset + BLOCK_HEADER.size + lengths.size
+        if data_offset + sum(column_lengths) > size:
+            # cut short by a crash
+            return
+        yield data_offset, rows, start, end, column_lengths
+        offset = data_offset + sum(column_lengths)
+
+
+def read_segment(path: str) -> Tuple[Dict[str, Any], List[Block]]:
+    """Header and decoded blocks of a segment file."""
+    with open(path, "rb") as f:
+        buffer = f.read()
+    header, offset = decode_header(buffer)
+    columns = header["columns"]
+    blocks = []
+    for data_offset, rows, start, end, column_lengths in iter_block_offsets(buffer, offset, len(columns)):
+        decoded = {}
+        for (name, typecode, _), length in zip(columns, column_lengths):
+            raw = buffer[data_offset : data_offset + length]
+            values = array(typecode)
+            values.frombytes(zlib.decompress(raw) if header["compression"] == "zlib" else raw)
+            decoded[name] = values
+            data_offset += length
+        blocks.append(Block(rows, start, end, decoded))
+    return header, blocks
+
+
+class _Partition:
+    """Rows buffered for one (coin, channel, day) and the segment they are written to."""
+
+    def __init__(self, coin: str, channel: str, day: str, columns: List[Column]):
+        self.coin = coin
+        self.channel = channel
+        self.day = day
+        self.columns = columns
+        self.buffers: List[List[Any]] = [[] for _ in columns]
+        self.rows = 0
+        self.file: Any = None
+        self.seq = 0
+        self.bytes_written = 0
+        self.dirty = False
+
+    def take(self) -> Tuple[int, List[List[Any]]]:
+        rows, buffers = self.rows, self.buffers
+        self.buffers = [[] for _ in self.columns]
+        self.rows = 0
+        return rows, buffers
+
+
+class TickRecorder:
+    def __init__(
+        self,
+        root: str,
+        coins: Optional[List[str]] = None,
+        channels: Tuple[str, ...] = CHANNELS,
+        base_url: Optional[str] = None,
+        flush_interval: float = 1.0,
+        rotate_bytes: int = DEFAULT_ROTATE_BYTES,
+        compression: Optional[str] = "zlib",
+        compression_level: int = 1,
+        fsync: str = "interval",
+        fsync_interval: float = 5.0,
+        depth: int = DEFAULT_DEPTH,
+    ):
+        for channel in channels:
+            schema(channel)
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError("unknown fsync policy", fsync)
+        if compression not in ("zlib", None):
+            raise ValueError("unknown compression", compression)
+        self.root = root
+        self.coins = coins
+        self.channels = channels
+        self.base_url = base_url or MAINNET_API_URL
+        self.flush_interval = flush_interval
+        self.rotate_bytes = rotate_bytes
+        self.compression = compression
+        self.compression_level = compression_level
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.depth = depth
+        self.ws_manager: Any = None
+        self._partitions: Dict[Tuple[str, str, str], _Partition] = {}
+        self._latest_day: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_fsync = time.monotonic()
+        self._started = time.monotonic()
+        self._stats = {
+            "messages": 0,
+            "rows": 0,
+            "blocks": 0,
+            "segments": 0,
+            "raw_bytes": 0,
+            "written_bytes": 0,
+            "fsyncs": 0,
+            "flush_seconds": 0.0,
+        }
+        self._callbacks = {"trades": self.on_trades, "bbo": self.on_bbo, "l2Book": self.on_l2_book}
+
+    def start(self) -> None:
+        """Subscribe to every channel of every coin, all listed perps when coins is None, and start flushing."""
+        if self.coins is None:
+            meta = API(self.base_url).post("/info", {"type": "meta"})
+            self.coins = [asset["name"] for asset in meta["universe"] if not asset.get("isDelisted")]
+        from hyperliquid.websocket_manager import WebsocketManager  # pylint: disable=import-outside-toplevel
+
+        self.ws_manager = WebsocketManager(self.base_url)
+        self.ws_manager.start()
+        for coin in self.coins:
+            for channel in self.channels:
+                subscription = cast(Subscription, {"type": channel, "coin": coin})
+                self.ws_manager.subscribe(subscription, self._callbacks[channel])
+        self.start_flushing()
+
+    def start_flushing(self) -> None:
+        self._started = time.monotonic()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="hyperliquid-tick-recorder", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self.ws_manager is not None:
+            self.ws_manager.stop()
+            self.ws_manager = None
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.close()
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logging.error(f"TickRecorder flush failed: {e!r}")
+
+    def _partition(self, coin: str, channel: str, time_ms: int) -> _Partition:
+        day = partition_day(time_ms)
+        key = (coin, channel, day)
+        partition = self._partitions.get(key)
+        if partition is None:
+            partition = self._partitions[key] = _Partition(coin, channel, day, schema(channel, self.depth))
+            if day > self._latest_day.get((coin, channel), ""):
+                self._latest_day[(coin, channel)] = day
+        return partition
+
+    def on_trades(self, ws_msg: Any) -> None:
+        with self._lock:
+            self._stats["messages"] += 1
+            for trade in ws_msg["data"]:
+                partition = self._partition(trade["coin"], "trades", trade["time"])
+                time_column, px, sz, side, tid = partition.buffers
+                time_column.append(trade["time"])
+                px.append(float(trade["px"]))
+                sz.append(float(trade["sz"]))
+                side.append(1 if trade["side"] == "B" else -1)
+                tid.append(trade["tid"])
+                partition.rows += 1
+
+    def on_bbo(self, ws_msg: Any) -> None:
+        data = ws_msg["data"]
+        with self._lock:
+            self._stats["messages"] += 1
+            partition = self._partition(data["coin"], "bbo", data["time"])
+            time_column, bid_px, bid_sz, ask_px, ask_sz = partition.buffers
+            bid, ask = data["bbo"]
+            time_column.append(data["time"])
+            bid_px.append(math.nan if bid is None else float(bid["px"]))
+            bid_sz.append(math.nan if bid is None else float(bid["sz"]))
+            ask_px.append(math.nan if ask is None else float(ask["px"]))
+            ask_sz.append(math.nan if ask is None else float(ask["sz"]))
+            partition.rows += 1
+
+    def on_l2_book(self, ws_msg: Any) -> None:
+        data = ws_msg["data"]
+        depth = self.depth
+        with self._lock:
+            self._stats["messages"] += 1
+            partition = self._partition(data["coin"], "l2Book", data["time"])
+            time_column, bid_px, bid_sz, ask_px, ask_sz = partition.buffers
+            time_column.append(data["time"])
+            for levels, px, sz in ((data["levels"][0], bid_px, bid_sz), (data["levels"][1], ask_px, ask_sz)):
+                levels = levels[:depth]
+                px.extend(float(level["px"]) for level in levels)
+                sz.extend(float(level["sz"]) for level in levels)
+                padding = depth - len(levels)
+                if padding:
+                    px.extend([math.nan] * padding)
+                    sz.extend([math.nan] * padding)
+            partition.rows += 1
+
+    def _encode(self, partition: _Partition, rows: int, buffers: List[List[Any]]) -> Tuple[bytes, int]:
+        times = buffers[0]
+        encoded = []
+        raw_bytes = 0
+        for (_, typecode, _), values in zip(partition.columns, buffers):
+            raw = array(typecode, values).tobytes()
+            raw_bytes += len(raw)
+            encoded.append(zlib.compress(raw, self.compression_level) if self.compression == "zlib" else raw)
+        header = BLOCK_HEADER.pack(BLOCK_MAGIC, rows, min(times), max(times))
+        lengths = struct.pack(f"<{len(encoded)}I", *(len(column) for column in encoded))
+        return header + lengths + b"".join(encoded), raw_bytes
+
+    def _open_segment(self, partition: _Partition) -> None:
+        directory = os.path.join(self.root, coin_dir(partition.coin), partition.day)
+        os.makedirs(directory, exist_ok=True)
+        while True:
+            path = os.path.join(directory, f"{partition.channel}.{partition.seq:06d}.seg")
+            if not os.path.exists(path):
+                break
+            partition.seq += 1
+        partition.file = open(path, "wb")
+        header = encode_header(partition.channel, partition.coin, partition.columns, self.compression)
+        partition.file.write(header)
+        partition.bytes_written = len(header)
+        self._stats["segments"] += 1
+
+    def _close_segment(self, partition: _Partition) -> None:
+        if partition.file is not None:
+            partition.file.flush()
+            if self.fsync != "never":
+                os.fsync(partition.file.fileno())
+                self._stats["fsyncs"] += 1
+            partition.file.close()
+            partition.file = None
+            partition.seq += 1
+
+    def flush(self) -> None:
+        """Write the buffered rows of every partition as one block each, rotate and close finished partitions."""
+        started = time.perf_counter()
+        with self._lock:
+            taken = [(partition, partition.take()) for partition in self._partitions.values() if partition.rows]
+            # partitions of earlier days are closed once their coin and channel moved on to a new day
+            finished = [
+                key
+                for key, partition in self._partitions.items()
+                if partition.day < self._latest_day[(partition.coin, partition.channel)]
+            ]
+            finished_partitions = [self._partitions.pop(key) for key in finished]
+        with self._write_lock:
+            for partition, (rows, buffers) in taken:
+                block, raw_bytes = self._encode(partition, rows, buffers)
+                if partition.file is None:
+                    self._open_segment(partition)
+                partition.file.write(block)
+                # hand whole blocks to the OS so readers of a live segment see them after every flush
+                partition.file.flush()
+                partition.bytes_written += len(block)
+                partition.dirty = True
+                self._stats["rows"] += rows
+                self._stats["blocks"] += 1
+                self._stats["raw_bytes"] += raw_bytes
+                self._stats["written_bytes"] += len(block)
+                if self.fsync == "always":
+                    os.fsync(partition.file.fileno())
+                    self._stats["fsyncs"] += 1
+                    partition.dirty = False
+                if partition.bytes_written >= self.rotate_bytes:
+                    self._close_segment(partition)
+            for partition in finished_partitions:
+                self._close_segment(partition)
+            if self.fsync == "interval" and time.monotonic() - self._last_fsync >= self.fsync_interval:
+                self._sync_dirty()
+            self._stats["flush_seconds"] += time.perf_counter() - started
+
+    def _sync_dirty(self) -> None:
+        for partition in list(self._partitions.values()):
+            if partition.dirty and partition.file is not None:
+                os.fsync(partition.file.fileno())
+                self._stats["fsyncs"] += 1
+                partition.dirty = False
+        self._last_fsync = time.monotonic()
+
+    def close(self) -> None:
+        """Flush the remaining rows and close every segment."""
+        self.flush()
+        with self._lock:
+            partitions = list(self._partitions.values())
+            self._partitions.clear()
+        with self._write_lock:
+            for partition in partitions:
+                self._close_segment(partition)
+
+    def stats(self) -> Dict[str, float]:
+        """Counters since start plus rows and written bytes per second and the compression ratio."""
+        with self._write_lock:
+            stats: Dict[str, float] = dict(self._stats)
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        stats["elapsed"] = elapsed
+        stats["rows_per_second"] = stats["rows"] / elapsed
+        stats["written_bytes_per_second"] = stats["written_bytes"] / elapsed
+        stats["compression_ratio"] = stats["raw_bytes"] / stats["written_bytes"] if stats["written_bytes"] else 0.0
+        # share of one core spent encoding and writing
+        stats["flush_load"] = stats["flush_seconds"] / elapsed
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record Hyperliquid trades, bbo and l2Book into columnar segments")
+    parser.add_argument("--root", required=True, help="directory to write the coin/day partitions to")
+    parser.add_argument("--url", help="API URL, defaults to mainnet")
+    parser.add_argument("--coin", action="append", help="coins to record, defaults to every listed perp")
+    parser.add_argument("--channel", action="append", choices=CHANNELS, help="channels to record, defaults to all")
+    parser.add_argument("--flush-interval", type=float, default=1.0)
+    parser.add_argument("--rotate-mb", type=float, default=DEFAULT_ROTATE_BYTES / 1024 / 1024)
+    parser.add_argument("--no-compression", action="store_true")
+    parser.add_argument("--fsync", choices=FSYNC_POLICIES, default="interval")
+    parser.add_argument("--stats-interval", type=float, default=60.0, help="seconds between throughput reports")
+    args = parser.parse_args()
+
+    recorder = TickRecorder(
+        args.root,
+        args.coin,
+        tuple(args.channel or CHANNELS),
+        args.url,
+        flush_interval=args.flush_interval,
+        rotate_bytes=int(args.rotate_mb * 1024 * 1024),
+        compression=None if args.no_compression else "zlib",
+        fsync=args.fsync,
+    )
+    recorder.start()
+    try:
+        while True:
+            time.sleep(args.stats_interval)
+            stats = recorder.stats()
+            print(
+                f"{stats['rows_per_second']:,.0f} rows/s  {stats['written_bytes_per_second'] / 1024:,.1f} KiB/s  "
+                f"compression {stats['compression_ratio']:.1f}x  flush load {stats['flush_load']:.1%}",
+                flush=True,
+            )
+    except KeyboardInterrupt:
+        recorder.stop()
+
+
+if __name__ == "__main__":
+    main()
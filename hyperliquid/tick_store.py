@@ -0,0 +1,257 @@
+"""Query segments written by hyperliquid.recorder by coin and time range.
+
+    store = TickStore("ticks")
+    for piece in store.query("BTC", start, end):
+        prices = piece.columns["px"]
+    bars = store.resample("BTC", 60_000, start, end)
+
+Segments are memory-mapped and their block headers indexed once, then re-read from where the index stopped when
+the file has grown, so a store can follow a recorder that is still writing. A query binary-searches the block
+times and then the time column of the first and last block. Columns of blocks recorded without compression come
+back as memoryviews into the mapping, no data is copied, compressed blocks are decompressed into arrays. Either
+way a query returns one Piece per block, in time order. Views keep their mapping open, release them before close().
+
+Rows are assumed to be in time order within a coin and channel, the order the exchange publishes them in and the
+recorder writes them in. resample, cvd and vwap work a bar or a block at a time with builtins such as sum, max and
+map over the views, so no per-row Python code runs.
+"""
+
+import mmap
+import operator
+import os
+import struct
+import zlib
+from array import array
+from bisect import bisect_left
+from itertools import accumulate, chain, islice
+
+from hyperliquid.bars import Bar
+from hyperliquid.recorder import coin_dir, decode_header, iter_block_offsets, partition_day, schema
+from hyperliquid.utils.types import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+Piece = NamedTuple("Piece", [("rows", int), ("columns", Dict[str, Any])])
+
+
+class Segment:
+    """A memory-mapped segment file and the time range of each of its blocks."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.header: Optional[Dict[str, Any]] = None
+        self.starts = array("q")
+        self.ends = array("q")
+        self.blocks: List[Tuple[int, int, List[int]]] = []
+        self._file: Any = None
+        self._mmap: Any = None
+        self._size = 0
+        self._next_offset = 0
+
+    def refresh(self) -> None:
+        """Map the file again if it has grown and index the blocks added since the last call."""
+        size = os.path.getsize(self.path)
+        if size == self._size:
+            return
+        if self._file is None:
+            self._file = open(self.path, "rb")
+        try:
+            mapped = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty file, the recorder has not written the header yet
+            return
+        if self.header is None:
+            try:
+                self.header, self._next_offset = decode_header(mapped)
+            except (ValueError, struct.error):
+                # the header is still being written
+                mapped.close()
+                return
+        # views handed out earlier keep the old mapping alive until they are released
+        self._mmap = mapped
+        self._size = size
+        columns = self.header["columns"]
+        for data_offset, rows, start, end, lengths in iter_block_offsets(mapped, self._next_offset, len(columns)):
+            self.starts.append(start)
+            self.ends.append(end)
+            self.blocks.append((data_offset, rows, lengths))
+            self._next_offset = data_offset + sum(lengths)
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def block(self, i: int, names: Optional[List[str]] = None) -> Piece:
+        """Columns of block i, views into the mapping unless the segment is compressed."""
+        assert self.header is not None
+        data_offset, rows, lengths = self.blocks[i]
+        compressed = self.header["compression"] == "zlib"
+        view = memoryview(self._mmap)
+        columns: Dict[str, Any] = {}
+        for (name, typecode, _), length in zip(self.header["columns"], lengths):
+            if names is None or name in names:
+                raw = view[data_offset : data_offset + length]
+                if compressed:
+                    columns[name] = array(typecode, zlib.decompress(raw))
+                else:
+                    columns[name] = raw.cast(typecode)
+            data_offset += length
+        return Piece(rows, columns)
+
+    def query(self, start: int, end: int, names: Optional[List[str]] = None) -> Iterator[Piece]:
+        """Rows with start <= time < end, one Piece per block."""
+        assert self.header is not None
+        widths = {name: width for name, _, width in self.header["columns"]}
+        if names is not None and "time" not in names:
+            names = list(names) + ["time"]
+        # block end times never decrease, the first block that can hold start is found by bisection
+        for i in range(bisect_left(self.ends, start), len(self.blocks)):
+            if self.starts[i] >= end:
+                return
+            piece = self.block(i, names)
+            times = piece.columns["time"]
+            lo = bisect_left(times, start) if self.starts[i] < start else 0
+            hi = bisect_left(times, end) if self.ends[i] >= end else piece.rows
+            if lo >= hi:
+                continue
+            if lo == 0 and hi == piece.rows:
+                yield piece
+            else:
+                yield Piece(
+                    hi - lo,
+                    {name: column[lo * widths[name] : hi * widths[name]] for name, column in piece.columns.items()},
+                )
+
+
+class TickStore:
+    def __init__(self, root: str):
+        self.root = root
+        self._segments: Dict[str, Segment] = {}
+
+    def segments(self, coin: str, channel: str = "trades", start: int = 0, end: Optional[int] = None) -> List[Segment]:
+        """Indexed segments of the coin and channel in the day partitions that overlap [start, end), in time order."""
+        directory = os.path.join(self.root, coin_dir(coin))
+        if not os.path.isdir(directory):
+            return []
+        first_day = partition_day(start)
+        last_day = None if end is None else partition_day(max(end - 1, start))
+        segments = []
+        for day in sorted(os.listdir(directory)):
+            if day < first_day or (last_day is not None and day > last_day):
+                continue
+            prefix = channel + "."
+            names = sorted(name for name in os.listdir(os.path.join(directory, day)) if name.startswith(prefix))
+            for name in names:
+                path = os.path.join(directory, day, name)
+                segment = self._segments.get(path)
+                if segment is None:
+                    segment = self._segments[path] = Segment(path)
+                segment.refresh()
+                if segment.header is not None:
+                    segments.append(segment)
+        return segments
+
+    def query(
+        self,
+        coin: str,
+        start: int,
+        end: int,
+        channel: str = "trades",
+        columns: Optional[List[str]] = None,
+    ) -> List[Piece]:
+        """Rows of the coin with start <= time < end (exchange ms) as one Piece per block, in time order.
+
+        Columns of width n, like the l2Book levels, hold n values per row. Pass columns to read only some of them,
+        time is always included.
+        """
+        pieces: List[Piece] = []
+        for segment in self.segments(coin, channel, start, end):
+            if not segment.blocks or segment.ends[-1] < start or segment.starts[0] >= end:
+                continue
+            pieces.extend(segment.query(start, end, columns))
+        return pieces
+
+    def column(self, coin: str, name: str, start: int, end: int, channel: str = "trades") -> Any:
+        """One column of the range copied into a single array."""
+        typecodes = {column: typecode for column, typecode, _ in schema(channel)}
+        values = array(typecodes[name])
+        for piece in self.query(coin, start, end, channel, [name]):
+            values.frombytes(memoryview(piece.columns[name]).cast("B"))
+        return values
+
+    def resample(self, coin: str, interval_ms: int, start: int, end: int) -> List[Bar]:
+        """OHLCV bars of interval_ms from recorded trades, shaped like hyperliquid.bars time bars.
+
+        Bars start at multiples of interval_ms, end is the time of their last trade and intervals without trades
+        produce no bar.
+        """
+        bars: List[Bar] = []
+        for piece in self.query(coin, start, end, "trades", ["px", "sz", "side"]):
+            times, px, sz, side = (piece.columns[name] for name in ("time", "px", "sz", "side"))
+            i = 0
+            while i < piece.rows:
+                bar_start = times[i] - times[i] % interval_ms
+                j = bisect_left(times, bar_start + interval_ms, i, piece.rows)
+                bar_px, bar_sz = px[i:j], sz[i:j]
+                volume = sum(bar_sz)
+                signed = sum(map(operator.mul, side[i:j], bar_sz))
+                bar = Bar(
+                    bar_start,
+                    times[j - 1],
+                    bar_px[0],
+                    max(bar_px),
+                    min(bar_px),
+                    bar_px[-1],
+                    volume,
+                    (volume + signed) / 2,
+                    sum(map(operator.mul, bar_px, bar_sz)),
+                    j - i,
+                )
+                if bars and bars[-1].start == bar_start:
+                    # the bar continues from the previous block
+                    bar = _merge(bars.pop(), bar)
+                bars.append(bar)
+                i = j
+        return bars
+
+    def cvd(self, coin: str, start: int, end: int) -> Tuple[Any, Any]:
+        """Trade times and cumulative volume delta, buys minus sells, from start."""
+        times = array("q")
+        deltas = array("d")
+        total = 0.0
+        for piece in self.query(coin, start, end, "trades", ["sz", "side"]):
+            times.frombytes(memoryview(piece.columns["time"]).cast("B"))
+            signed = map(operator.mul, piece.columns["side"], piece.columns["sz"])
+            deltas.extend(islice(accumulate(chain((total,), signed)), 1, None))
+            total = deltas[-1]
+        return times, deltas
+
+    def vwap(self, coin: str, start: int, end: int) -> float:
+        """Volume weighted average trade price of the range, nan without trades."""
+        notional = volume = 0.0
+        for piece in self.query(coin, start, end, "trades", ["px", "sz"]):
+            notional += sum(map(operator.mul, piece.columns["px"], piece.columns["sz"]))
+            volume += sum(piece.columns["sz"])
+        return notional / volume if volume else float("nan")
+
+    def close(self) -> None:
+        for segment in self._segments.values():
+            segment.close()
+        self._segments.clear()
+
+
+def _merge(first: Bar, second: Bar) -> Bar:
+    return Bar(
+        first.start,
+        second.end,
+        first.open,
+        max(first.high, second.high),
+        min(first.low, second.low),
+        second.close,
+        first.volume + second.volume,
+        first.buy_volume + second.buy_volume,
+        first.notional + second.notional,
+        first.trades + second.trades,
+    )
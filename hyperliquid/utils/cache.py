@@ -0,0 +1,116 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from hyperliquid.utils.types import Any, Dict, NamedTuple, Optional
+
+# Seconds a response stays fresh, by /info request type. Types missing from the table are never cached.
+DEFAULT_TTLS: Dict[str, float] = {
+    "meta": 60,
+    "spotMeta": 60,
+    "perpDexs": 300,
+    "userFees": 60,
+    "subAccounts": 30,
+    "referral": 60,
+    "delegatorSummary": 30,
+    "delegations": 30,
+    "userToMultiSigSigners": 60,
+    "perpDeployAuctionStatus": 10,
+}
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# returned by ResponseCache.get on a miss when passed as its default, a cached response can be None
+MISS: Any = object()
+
+CacheEntry = NamedTuple(
+    "CacheEntry", [("expires_at", float), ("body", str), ("request_type", str), ("user", Optional[str])]
+)
+
+
+def _cache_key(payload: Any) -> str:
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"))
+
+
+class ResponseCache:
+    """Memory bounded LRU cache of /info responses with a TTL per request type.
+
+    Responses are kept JSON encoded, so the memory bound counts actual bytes and every hit returns a fresh
+    object that callers are free to mutate.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size_bytes = 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def is_cacheable(self, payload: Any) -> bool:
+        return payload.get("type") in self.ttls
+
+    def get(self, payload: Any, default: Any = None) -> Any:
+        """The cached response, or default if there is none. A cached JSON null is returned as None."""
+        key = _cache_key(payload)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return json.loads(entry.body)
+
+    def put(self, payload: Any, response: Any) -> None:
+        # null is a valid answer, e.g. subAccounts of a user without sub-accounts, only errors are not kept
+        if isinstance(response, dict) and "error" in response:
+            return
+        request_type = payload.get("type")
+        body = json.dumps(response, separators=(",", ":"))
+        if len(body) > self.max_bytes:
+            return
+        key = _cache_key(payload)
+        entry = CacheEntry(time.monotonic() + self.ttls[request_type], body, request_type, payload.get("user"))
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self.size_bytes += len(body)
+            while self.size_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self.size_bytes -= len(entry.body)
+
+    def invalidate(self, request_type: Optional[str] = None, user: Optional[str] = None) -> int:
+        """Drop entries matching request_type and/or user, or every entry if neither is given.
+
+        Returns the number of entries dropped.
+        """
+        with self._lock:
+            keys = [
+                key
+                for key, entry in self._entries.items()
+                if (request_type is None or entry.request_type == request_type)
+                and (user is None or (entry.user is not None and entry.user.lower() == user.lower()))
+            ]
+            for key in keys:
+                self._remove(key)
+        return len(keys)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.size_bytes,
+            }
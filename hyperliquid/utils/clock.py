@@ -0,0 +1,120 @@
+import logging
+import threading
+import time
+from collections import deque
+
+from hyperliquid.utils.types import Any, Deque, Optional, Tuple
+
+# samples kept by the filters, about half an hour of REST samples at the default interval
+DEFAULT_WINDOW = 64
+
+
+class ExchangeClock:
+    """Estimates the offset between the local clock and exchange timestamps, NTP style.
+
+    A request sent at local time t0 whose response carries exchange time ts and arrives at t1 gives the sample
+    offset = ts - (t0 + t1) / 2, which is off by at most the round trip (t1 - t0) / 2. Of the last window samples
+    the one with the shortest round trip is used, as it has the smallest error. Timestamped messages, like
+    websocket bbo, l2Book and trades, only give a lower bound: the exchange stamped the message before it
+    arrived, so offset >= ts - t1. The estimate is raised to the highest recent lower bound.
+
+    Exchange timestamps are block times, a little before the moment the response or message was built, so the
+    estimate errs towards the exchange clock being behind. Hand the clock to Exchange to take nonces and
+    expires_after from now_ms() instead of the local clock.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        # (round trip ms, offset ms)
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=window)
+        self._lower_bounds: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._subscription: Optional[Tuple[Any, Any, int]] = None
+
+    def observe(self, sent_ms: float, exchange_ms: float, received_ms: float) -> None:
+        """Record a request sent at local sent_ms, answered with exchange time exchange_ms, received at received_ms."""
+        with self._lock:
+            self._samples.append((received_ms - sent_ms, exchange_ms - (sent_ms + received_ms) / 2))
+
+    def observe_message(self, exchange_ms: float, received_ms: Optional[float] = None) -> None:
+        """Record a message stamped exchange_ms by the exchange that arrived at local received_ms, by default now."""
+        if received_ms is None:
+            received_ms = time.time() * 1000
+        with self._lock:
+            self._lower_bounds.append(exchange_ms - received_ms)
+
+    def on_ws_message(self, ws_msg: Any) -> None:
+        """Subscription callback for channels whose messages carry a time, e.g. bbo, l2Book and trades."""
+        received_ms = time.time() * 1000
+        data = ws_msg.get("data")
+        if isinstance(data, list):
+            if not data:
+                return
+            data = data[-1]
+        if isinstance(data, dict) and "time" in data:
+            self.observe_message(data["time"], received_ms)
+
+    def estimate(self) -> Optional[Tuple[float, float]]:
+        """(offset ms, error ms) where exchange time = local time + offset, None before any sample."""
+        with self._lock:
+            best = min(self._samples) if self._samples else None
+            lower_bound = max(self._lower_bounds) if self._lower_bounds else None
+        if best is None:
+            if lower_bound is None:
+                return None
+            return lower_bound, float("inf")
+        rtt, offset = best
+        if lower_bound is not None and lower_bound > offset:
+            return lower_bound, rtt / 2
+        return offset, rtt / 2
+
+    @property
+    def offset_ms(self) -> float:
+        estimate = self.estimate()
+        return 0.0 if estimate is None else estimate[0]
+
+    @property
+    def error_ms(self) -> float:
+        """Bound on how far now_ms() may be from the exchange clock, inf without a round trip sample."""
+        estimate = self.estimate()
+        return float("inf") if estimate is None else estimate[1]
+
+    def now_ms(self) -> int:
+        """Current exchange time in milliseconds, the local clock until there are samples."""
+        return int(time.time() * 1000 + self.offset_ms)
+
+    def sample(self, info: Any, coin: str = "BTC") -> None:
+        """Take one round trip sample from an l2Book snapshot, which is stamped with the exchange time."""
+        sent_ms = time.time() * 1000
+        snapshot = info.l2_snapshot(coin)
+        self.observe(sent_ms, snapshot["time"], time.time() * 1000)
+
+    def start(self, info: Any, interval: float = 30.0, coin: str = "BTC") -> None:
+        """Sample over REST every interval seconds and, if info has a websocket, from every bbo message of coin."""
+        self.sample(info, coin)
+        if info.ws_manager is not None:
+            subscription = {"type": "bbo", "coin": coin}
+            self._subscription = (info, subscription, info.subscribe(subscription, self.on_ws_message))
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(info, interval, coin), name="hyperliquid-exchange-clock", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._subscription is not None:
+            info, subscription, subscription_id = self._subscription
+            info.unsubscribe(subscription, subscription_id)
+            self._subscription = None
+
+    def _run(self, info: Any, interval: float, coin: str) -> None:
+        while not self._stop_event.wait(interval):
+            try:
+                self.sample(info, coin)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logging.warning(f"exchange clock sample failed: {e!r}")
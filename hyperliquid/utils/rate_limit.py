@@ -0,0 +1,123 @@
+import threading
+import time
+
+from hyperliquid.utils.types import Any, Dict, Optional
+
+# Hyperliquid allows an aggregated weight of 1200 per minute per IP address across /info and /exchange.
+DEFAULT_WEIGHT_PER_MINUTE = 1200
+
+DEFAULT_INFO_WEIGHT = 20
+INFO_TYPE_WEIGHTS: Dict[str, int] = {
+    "l2Book": 2,
+    "allMids": 2,
+    "clearinghouseState": 2,
+    "orderStatus": 2,
+    "spotClearinghouseState": 2,
+    "exchangeStatus": 2,
+    "userRole": 60,
+}
+
+# Keys under which batched /exchange actions carry their items
+EXCHANGE_BATCH_KEYS = ("orders", "cancels", "modifies")
+
+
+def request_weight(url_path: str, payload: Any) -> int:
+    """Weight a request counts against the per-IP budget.
+
+    /info requests are weighted by their type, /exchange requests weigh 1 + floor(batch_length / 40).
+    """
+    if url_path == "/info":
+        return INFO_TYPE_WEIGHTS.get(payload.get("type"), DEFAULT_INFO_WEIGHT)
+    if url_path == "/exchange":
+        action = payload.get("action") or {}
+        batch_length = 0
+        for key in EXCHANGE_BATCH_KEYS:
+            if key in action:
+                batch_length = len(action[key])
+                break
+        return 1 + batch_length // 40
+    return DEFAULT_INFO_WEIGHT
+
+
+class _Cell:
+    __slots__ = ("value",)
+
+    def __init__(self, value: float):
+        self.value = value
+
+
+class RateLimiter:
+    """Token bucket governing the weight of requests sent by one or more API instances.
+
+    Tokens refill continuously at weight_per_minute / 60 per second up to burst. acquire reserves weight
+    immediately and sleeps until the reservation is covered, so concurrent callers are served in the order
+    they arrived. Share a single instance between Info and Exchange objects to share a budget across
+    threads. With shared=True the bucket lives in shared memory and can be handed to child processes
+    when they are created.
+    """
+
+    def __init__(
+        self,
+        weight_per_minute: float = DEFAULT_WEIGHT_PER_MINUTE,
+        burst: Optional[float] = None,
+        shared: bool = False,
+    ):
+        if weight_per_minute <= 0:
+            raise ValueError("weight_per_minute must be positive", weight_per_minute)
+        self.capacity = float(burst if burst is not None else weight_per_minute)
+        self.refill_rate = weight_per_minute / 60.0
+        now = time.monotonic()
+        if shared:
+            import multiprocessing  # pylint: disable=import-outside-toplevel
+
+            self._lock: Any = multiprocessing.Lock()
+            self._tokens: Any = multiprocessing.Value("d", self.capacity, lock=False)
+            self._updated: Any = multiprocessing.Value("d", now, lock=False)
+        else:
+            self._lock = threading.Lock()
+            self._tokens = _Cell(self.capacity)
+            self._updated = _Cell(now)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated.value
+        if elapsed > 0:
+            self._tokens.value = min(self.capacity, self._tokens.value + elapsed * self.refill_rate)
+            self._updated.value = now
+
+    def reserve(self, weight: float) -> float:
+        """Reserve weight and return how many seconds the caller has to wait before sending."""
+        weight = min(float(weight), self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens.value -= weight
+            deficit = -self._tokens.value
+        return deficit / self.refill_rate if deficit > 0 else 0.0
+
+    def acquire(self, weight: float) -> float:
+        """Block until weight fits in the budget. Returns the number of seconds spent waiting."""
+        wait = self.reserve(weight)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def try_acquire(self, weight: float) -> bool:
+        """Take weight from the budget only if it is available right now."""
+        weight = min(float(weight), self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens.value < weight:
+                return False
+            self._tokens.value -= weight
+            return True
+
+    def headroom(self) -> float:
+        """Weight that can be sent right now without waiting. Negative while reservations are queued."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return float(self._tokens.value)
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the server answered with 429, so the next requests back off."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens.value = min(self._tokens.value, 0.0)
@@ -0,0 +1,106 @@
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+from hyperliquid.utils.types import Any, Deque, FrozenSet, Optional
+
+RETRYABLE_STATUS_CODES: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+
+
+class RetryPolicy:
+    """Retry and hedging policy for idempotent /info requests.
+
+    Failed requests (connection errors, timeouts and the status codes in retry_status_codes) are retried with
+    exponential backoff and full jitter, honoring Retry-After when the server sends it. Retries draw from a
+    budget: every request deposits budget_ratio tokens, every retry or hedge spends one, so a struggling
+    server sees at most roughly budget_ratio extra load once the initial budget_max tokens are gone.
+
+    When hedge_percentile is set, a second identical request is sent if the first has not completed within
+    that percentile of recently observed latencies, and the first response to arrive is used.
+    /exchange requests are never retried or hedged since they are not idempotent.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 0.25,
+        backoff_max: float = 8.0,
+        retry_after_max: float = 30.0,
+        budget_ratio: float = 0.1,
+        budget_max: float = 10.0,
+        hedge_percentile: Optional[float] = None,
+        hedge_min_samples: int = 20,
+        latency_window: int = 256,
+        retry_status_codes: FrozenSet[int] = RETRYABLE_STATUS_CODES,
+    ):
+        if hedge_percentile is not None and not 0 < hedge_percentile < 1:
+            raise ValueError("hedge_percentile must be between 0 and 1", hedge_percentile)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+        self.budget_ratio = budget_ratio
+        self.budget_max = budget_max
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.retry_status_codes = retry_status_codes
+        self.retries = 0
+        self.hedges = 0
+        self._budget = budget_max
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._budget = min(self.budget_max, self._budget + self.budget_ratio)
+
+    def _spend_budget(self, hedge: bool) -> bool:
+        with self._lock:
+            if self._budget < 1:
+                return False
+            self._budget -= 1
+            if hedge:
+                self.hedges += 1
+            else:
+                self.retries += 1
+            return True
+
+    def should_retry(self, attempt: int) -> bool:
+        """Whether a request that failed on attempt (0 based) may be retried. Spends budget if so."""
+        return attempt < self.max_retries and self._spend_budget(hedge=False)
+
+    def should_hedge(self) -> bool:
+        return self._spend_budget(hedge=True)
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))  # nosec B311
+
+    def retry_after(self, response: Any) -> Optional[float]:
+        """Seconds to wait according to the Retry-After header, which is either seconds or an HTTP date."""
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return min(max(delay, 0.0), self.retry_after_max)
+
+    def record_latency(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds after which a hedged request should be sent, None if hedging is off or not yet calibrated."""
+        if self.hedge_percentile is None:
+            return None
+        with self._lock:
+            if len(self._latencies) < self.hedge_min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * self.hedge_percentile))]
@@ -0,0 +1,213 @@
+"""Recover the signers of many signed actions, e.g. from action logs or replica command dumps.
+
+recover_agent_or_user_from_l1_action and recover_user_from_user_signed_action build the full EIP-712 payload for
+every call. Here the domain separators and type hashes are computed once and each signature only costs the
+action hash, one struct hash and the public key recovery, which is spread over a process pool. The recovery
+dominates: eth_keys uses libsecp256k1 when coincurve is installed and is much slower without it.
+
+    for recovered in recover_signers_from_file("actions.jsonl", is_mainnet=True):
+        print(recovered.signed_action["action"]["type"], recovered.signer)
+
+Signed actions are dicts shaped like the body posted to /exchange: action, nonce, signature and optionally
+vaultAddress and expiresAfter.
+"""
+
+import itertools
+import json
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache, partial
+
+from eth_keys import keys
+from eth_utils import keccak
+
+from hyperliquid.utils.signing import (
+    APPROVE_AGENT_SIGN_TYPES,
+    APPROVE_BUILDER_FEE_SIGN_TYPES,
+    CONVERT_TO_MULTI_SIG_USER_SIGN_TYPES,
+    MULTI_SIG_ENVELOPE_SIGN_TYPES,
+    SEND_ASSET_SIGN_TYPES,
+    SPOT_TRANSFER_SIGN_TYPES,
+    TOKEN_DELEGATE_TYPES,
+    USD_CLASS_TRANSFER_SIGN_TYPES,
+    USD_SEND_SIGN_TYPES,
+    WITHDRAW_SIGN_TYPES,
+    action_hash,
+)
+from hyperliquid.utils.types import Any, Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# user signed action type -> (primary type, fields)
+USER_SIGNED_ACTIONS: Dict[str, Tuple[str, List[Dict[str, str]]]] = {
+    "usdSend": ("HyperliquidTransaction:UsdSend", USD_SEND_SIGN_TYPES),
+    "spotSend": ("HyperliquidTransaction:SpotSend", SPOT_TRANSFER_SIGN_TYPES),
+    "withdraw3": ("HyperliquidTransaction:Withdraw", WITHDRAW_SIGN_TYPES),
+    "usdClassTransfer": ("HyperliquidTransaction:UsdClassTransfer", USD_CLASS_TRANSFER_SIGN_TYPES),
+    "sendAsset": ("HyperliquidTransaction:SendAsset", SEND_ASSET_SIGN_TYPES),
+    "convertToMultiSigUser": ("HyperliquidTransaction:ConvertToMultiSigUser", CONVERT_TO_MULTI_SIG_USER_SIGN_TYPES),
+    "approveAgent": ("HyperliquidTransaction:ApproveAgent", APPROVE_AGENT_SIGN_TYPES),
+    "approveBuilderFee": ("HyperliquidTransaction:ApproveBuilderFee", APPROVE_BUILDER_FEE_SIGN_TYPES),
+    "tokenDelegate": ("HyperliquidTransaction:TokenDelegate", TOKEN_DELEGATE_TYPES),
+}
+
+Recovered = NamedTuple("Recovered", [("signed_action", Any), ("signer", Optional[str]), ("error", Optional[str])])
+
+EIP712_DOMAIN_TYPE_HASH = keccak(b"EIP712Domain(string name,string version,uint256 chainId,address verifyingContract)")
+AGENT_TYPE_HASH = keccak(b"Agent(string source,bytes32 connectionId)")
+_SOURCE_HASHES = {True: keccak(b"a"), False: keccak(b"b")}
+
+
+@lru_cache(maxsize=None)
+def domain_separator(name: str, version: str, chain_id: int) -> bytes:
+    # every domain used by the exchange has the zero address as verifyingContract
+    return keccak(
+        EIP712_DOMAIN_TYPE_HASH
+        + keccak(name.encode())
+        + keccak(version.encode())
+        + chain_id.to_bytes(32, "big")
+        + bytes(32)
+    )
+
+
+L1_DOMAIN_SEPARATOR = domain_separator("Exchange", "1", 1337)
+
+
+@lru_cache(maxsize=None)
+def _type_hash(primary_type: str, fields: Tuple[Tuple[str, str], ...]) -> bytes:
+    return keccak(f"{primary_type}({','.join(f'{type_} {name}' for name, type_ in fields)})".encode())
+
+
+def _encode_value(type_: str, value: Any) -> bytes:
+    if type_ == "string":
+        return keccak(value.encode())
+    if type_ == "address":
+        return bytes(12) + bytes.fromhex(value[2:] if value.startswith("0x") else value)
+    if type_ == "bytes32":
+        return value if isinstance(value, bytes) else bytes.fromhex(value[2:] if value.startswith("0x") else value)
+    if type_ == "bool" or type_.startswith("uint"):
+        return int(value).to_bytes(32, "big")
+    raise ValueError("unsupported EIP-712 field type", type_)
+
+
+def l1_action_digest(
+    action: Any, vault_address: Optional[str], nonce: int, expires_after: Optional[int], is_mainnet: bool
+) -> bytes:
+    struct_hash = keccak(
+        AGENT_TYPE_HASH + _SOURCE_HASHES[is_mainnet] + action_hash(action, vault_address, nonce, expires_after)
+    )
+    return keccak(b"\x19\x01" + L1_DOMAIN_SEPARATOR + struct_hash)
+
+
+def user_signed_action_digest(
+    action: Any, payload_types: List[Dict[str, str]], primary_type: str, is_mainnet: bool
+) -> bytes:
+    fields = tuple((field["name"], field["type"]) for field in payload_types)
+    message = dict(action, hyperliquidChain="Mainnet" if is_mainnet else "Testnet")
+    encoded = b"".join(_encode_value(type_, message[name]) for name, type_ in fields)
+    struct_hash = keccak(_type_hash(primary_type, fields) + encoded)
+    domain = domain_separator("HyperliquidSignTransaction", "1", int(action["signatureChainId"], 16))
+    return keccak(b"\x19\x01" + domain + struct_hash)
+
+
+def signed_action_digest(signed_action: Any, is_mainnet: bool) -> bytes:
+    """EIP-712 digest that was signed for a body posted to /exchange."""
+    action = signed_action["action"]
+    action_type = action["type"]
+    vault_address = signed_action.get("vaultAddress")
+    expires_after = signed_action.get("expiresAfter")
+    if action_type == "multiSig":
+        action_without_tag = {key: value for key, value in action.items() if key != "type"}
+        envelope = {
+            "signatureChainId": action["signatureChainId"],
+            "multiSigActionHash": action_hash(action_without_tag, vault_address, signed_action["nonce"], expires_after),
+            "nonce": signed_action["nonce"],
+        }
+        return user_signed_action_digest(
+            envelope, MULTI_SIG_ENVELOPE_SIGN_TYPES, "HyperliquidTransaction:SendMultiSig", is_mainnet
+        )
+    user_signed = USER_SIGNED_ACTIONS.get(action_type)
+    if user_signed is not None:
+        if action_type == "approveAgent" and "agentName" not in action:
+            # approve_agent drops an empty agentName from the posted action but it is signed as ""
+            action = dict(action, agentName="")
+        primary_type, payload_types = user_signed
+        return user_signed_action_digest(action, payload_types, primary_type, is_mainnet)
+    return l1_action_digest(action, vault_address, signed_action["nonce"], expires_after, is_mainnet)
+
+
+def recover_from_digest(digest: bytes, signature: Any) -> str:
+    # signatures carry v as 27 or 28, eth_keys takes the recovery id
+    v = signature["v"] - 27 if signature["v"] >= 27 else signature["v"]
+    vrs = (v, int(signature["r"], 16), int(signature["s"], 16))
+    return keys.Signature(vrs=vrs).recover_public_key_from_msg_hash(digest).to_checksum_address()
+
+
+def recover_signer(signed_action: Any, is_mainnet: bool) -> Recovered:
+    try:
+        signer = recover_from_digest(signed_action_digest(signed_action, is_mainnet), signed_action["signature"])
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        return Recovered(signed_action, None, repr(e))
+    return Recovered(signed_action, signer, None)
+
+
+def _recover_lines(lines: List[str], is_mainnet: bool) -> List[Recovered]:
+    results = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            signed_action = json.loads(line)
+        except ValueError as e:
+            results.append(Recovered(line, None, repr(e)))
+            continue
+        results.append(recover_signer(signed_action, is_mainnet))
+    return results
+
+
+def _recover_chunk(signed_actions: List[Any], is_mainnet: bool) -> List[Recovered]:
+    return [recover_signer(signed_action, is_mainnet) for signed_action in signed_actions]
+
+
+def _map_chunks(
+    fn: Callable[[List[Any]], List[Recovered]], items: Iterable[Any], processes: Optional[int], chunksize: int
+) -> Iterator[Recovered]:
+    chunks = iter(lambda: list(itertools.islice(items, chunksize)), [])
+    if processes == 0:
+        for chunk in chunks:
+            yield from fn(chunk)
+        return
+    # only a few chunks per worker are in flight so arbitrarily large inputs stream in constant memory
+    max_pending = 2 * (processes or os.cpu_count() or 1)
+    with ProcessPoolExecutor(processes) as pool:
+        pending: Deque[Future[List[Recovered]]] = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(fn, chunk))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def recover_signers(
+    signed_actions: Iterable[Any], is_mainnet: bool, processes: Optional[int] = None, chunksize: int = 256
+) -> Iterator[Recovered]:
+    """Recover the signer of every signed action, in order, on a pool of processes.
+
+    Args:
+        signed_actions (Iterable[Any]): Bodies posted to /exchange, consumed lazily.
+        is_mainnet (bool): Whether the actions were signed for mainnet.
+        processes (Optional[int]): Worker processes, defaults to the number of CPUs. 0 recovers in this process.
+        chunksize (int): Actions handed to a worker at a time.
+
+    Yields:
+        Recovered(signed_action, signer, error) where signer is None and error is set if recovery failed.
+    """
+    return _map_chunks(partial(_recover_chunk, is_mainnet=is_mainnet), iter(signed_actions), processes, chunksize)
+
+
+def recover_signers_from_file(
+    path: str, is_mainnet: bool, processes: Optional[int] = None, chunksize: int = 256
+) -> Iterator[Recovered]:
+    """recover_signers for a file with one signed action per line. The lines are parsed by the workers."""
+    with open(path) as f:
+        yield from _map_chunks(partial(_recover_lines, is_mainnet=is_mainnet), f, processes, chunksize)
@@ -1,12 +1,11 @@
+import threading
 import time
 from decimal import Decimal
 
 import msgpack
-from eth_account import Account
-from eth_account.messages import encode_typed_data
-from eth_utils import keccak, to_hex
+from eth_hash.auto import keccak as keccak256
 
-from hyperliquid.utils.types import Cloid, Literal, NotRequired, Optional, TypedDict, Union
+from hyperliquid.utils.types import Any, Cloid, List, Literal, NotRequired, Optional, TypedDict, Union
 
 Tif = Union[Literal["Alo"], Literal["Ioc"], Literal["Gtc"]]
 Tpsl = Union[Literal["tp"], Literal["sl"]]
@@ -129,6 +128,20 @@ CONVERT_TO_MULTI_SIG_USER_SIGN_TYPES = [
     {"name": "nonce", "type": "uint64"},
 ]
 
+APPROVE_AGENT_SIGN_TYPES = [
+    {"name": "hyperliquidChain", "type": "string"},
+    {"name": "agentAddress", "type": "address"},
+    {"name": "agentName", "type": "string"},
+    {"name": "nonce", "type": "uint64"},
+]
+
+APPROVE_BUILDER_FEE_SIGN_TYPES = [
+    {"name": "hyperliquidChain", "type": "string"},
+    {"name": "maxFeeRate", "type": "string"},
+    {"name": "builder", "type": "address"},
+    {"name": "nonce", "type": "uint64"},
+]
+
 MULTI_SIG_ENVELOPE_SIGN_TYPES = [
     {"name": "hyperliquidChain", "type": "string"},
     {"name": "multiSigActionHash", "type": "bytes32"},
@@ -154,18 +167,95 @@ def address_to_bytes(address):
     return bytes.fromhex(address[2:] if address.startswith("0x") else address)
 
 
+_packer_local = threading.local()
+
+
+def _packer() -> msgpack.Packer:
+    # Packer keeps its buffer between calls, so every thread reuses one instead of allocating per action
+    packer = getattr(_packer_local, "packer", None)
+    if packer is None:
+        packer = _packer_local.packer = msgpack.Packer(autoreset=False)
+    return packer
+
+
+def packb(obj: Any) -> bytes:
+    """Same bytes as msgpack.packb(obj), using the calling thread's cached Packer."""
+    packer = _packer()
+    try:
+        packer.pack(obj)
+        packed: bytes = packer.bytes()
+        return packed
+    finally:
+        packer.reset()
+
+
+def pack_order_wire(order_wire: OrderWire) -> bytes:
+    return packb(order_wire)
+
+
+def pack_modify_wire(oid: Union[int, str], packed_order_wire: bytes) -> bytes:
+    """Packed {"oid": oid, "order": order_wire} from an order wire packed with pack_order_wire."""
+    packer = _packer()
+    try:
+        packer.pack_map_header(2)
+        packer.pack("oid")
+        packer.pack(oid)
+        packer.pack("order")
+        header: bytes = packer.bytes()
+        return header + packed_order_wire
+    finally:
+        packer.reset()
+
+
+def _pack_action(fields: List[Any], spliced_key: str, packed_items: List[bytes]) -> bytes:
+    # a msgpack map or array is a header followed by its packed entries, so packed entries can be joined as they are
+    packer = _packer()
+    try:
+        parts = []
+        packer.pack_map_header(len(fields))
+        for key, value in fields:
+            packer.pack(key)
+            if key == spliced_key:
+                packer.pack_array_header(len(packed_items))
+                parts.append(packer.bytes())
+                parts.extend(packed_items)
+                packer.reset()
+            else:
+                packer.pack(value)
+        parts.append(packer.bytes())
+        return b"".join(parts)
+    finally:
+        packer.reset()
+
+
+def pack_order_action(packed_order_wires: List[bytes], builder: Optional[Any] = None) -> bytes:
+    """Same bytes as packb(order_wires_to_order_action(order_wires, builder)) from packed order wires."""
+    fields: List[Any] = [("type", "order"), ("orders", None), ("grouping", "na")]
+    if builder:
+        fields.append(("builder", builder))
+    return _pack_action(fields, "orders", packed_order_wires)
+
+
+def pack_batch_modify_action(packed_modify_wires: List[bytes]) -> bytes:
+    """Same bytes as packb({"type": "batchModify", "modifies": modifies}) from modifies packed with pack_modify_wire."""
+    return _pack_action([("type", "batchModify"), ("modifies", None)], "modifies", packed_modify_wires)
+
+
 def action_hash(action, vault_address, nonce, expires_after):
-    data = msgpack.packb(action)
-    data += nonce.to_bytes(8, "big")
+    # action may also be already packed, e.g. with pack_order_action, to skip packing unchanged order wires again
+    suffix = bytearray(nonce.to_bytes(8, "big"))
     if vault_address is None:
-        data += b"\x00"
+        suffix.append(0)
     else:
-        data += b"\x01"
-        data += address_to_bytes(vault_address)
+        suffix.append(1)
+        suffix += address_to_bytes(vault_address)
     if expires_after is not None:
-        data += b"\x00"
-        data += expires_after.to_bytes(8, "big")
-    return keccak(data)
+        suffix.append(0)
+        suffix += expires_after.to_bytes(8, "big")
+    # the suffix is fed to the hash separately instead of being appended to a copy of the packed action
+    preimage = keccak256.new(action if isinstance(action, (bytes, bytearray)) else packb(action))
+    preimage.update(bytes(suffix))
+    return preimage.digest()
 
 
 def construct_phantom_agent(hash, is_mainnet):
@@ -376,12 +466,7 @@ def sign_agent(wallet, action, is_mainnet):
     return sign_user_signed_action(
         wallet,
         action,
-        [
-            {"name": "hyperliquidChain", "type": "string"},
-            {"name": "agentAddress", "type": "address"},
-            {"name": "agentName", "type": "string"},
-            {"name": "nonce", "type": "uint64"},
-        ],
+        APPROVE_AGENT_SIGN_TYPES,
         "HyperliquidTransaction:ApproveAgent",
         is_mainnet,
     )
@@ -391,12 +476,7 @@ def sign_approve_builder_fee(wallet, action, is_mainnet):
     return sign_user_signed_action(
         wallet,
         action,
-        [
-            {"name": "hyperliquidChain", "type": "string"},
-            {"name": "maxFeeRate", "type": "string"},
-            {"name": "builder", "type": "address"},
-            {"name": "nonce", "type": "uint64"},
-        ],
+        APPROVE_BUILDER_FEE_SIGN_TYPES,
         "HyperliquidTransaction:ApproveBuilderFee",
         is_mainnet,
     )
@@ -413,15 +493,21 @@ def sign_token_delegate_action(wallet, action, is_mainnet):
 
 
 def sign_inner(wallet, data):
+    # eth_account takes about half a second to import, it is only loaded once something is signed or recovered
+    from eth_account.messages import encode_typed_data  # pylint: disable=import-outside-toplevel
+
     structured_data = encode_typed_data(full_message=data)
     signed = wallet.sign_message(structured_data)
-    return {"r": to_hex(signed["r"]), "s": to_hex(signed["s"]), "v": signed["v"]}
+    return {"r": hex(signed["r"]), "s": hex(signed["s"]), "v": signed["v"]}
 
 
 def recover_agent_or_user_from_l1_action(action, signature, active_pool, nonce, expires_after, is_mainnet):
     hash = action_hash(action, active_pool, nonce, expires_after)
     phantom_agent = construct_phantom_agent(hash, is_mainnet)
     data = l1_payload(phantom_agent)
+    from eth_account import Account  # pylint: disable=import-outside-toplevel
+    from eth_account.messages import encode_typed_data  # pylint: disable=import-outside-toplevel
+
     structured_data = encode_typed_data(full_message=data)
     address = Account.recover_message(structured_data, vrs=[signature["v"], signature["r"], signature["s"]])
     return address
@@ -430,6 +516,9 @@ def recover_agent_or_user_from_l1_action(action, signature, active_pool, nonce,
 def recover_user_from_user_signed_action(action, signature, payload_types, primary_type, is_mainnet):
     action["hyperliquidChain"] = "Mainnet" if is_mainnet else "Testnet"
     data = user_signed_payload(primary_type, payload_types, action)
+    from eth_account import Account  # pylint: disable=import-outside-toplevel
+    from eth_account.messages import encode_typed_data  # pylint: disable=import-outside-toplevel
+
     structured_data = encode_typed_data(full_message=data)
     address = Account.recover_message(structured_data, vrs=[signature["v"], signature["r"], signature["s"]])
     return address
@@ -1,13 +1,37 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, List, Literal, NamedTuple, Optional, Tuple, TypedDict, Union, cast
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypedDict,
+    Union,
+    cast,
+)
 from typing_extensions import NotRequired
 
 Any = Any
 Option = Optional
 cast = cast
 Callable = Callable
+Deque = Deque
+FrozenSet = FrozenSet
+Iterable = Iterable
+Iterator = Iterator
 NamedTuple = NamedTuple
+Sequence = Sequence
+Set = Set
 NotRequired = NotRequired
 
 AssetInfo = TypedDict("AssetInfo", {"name": str, "szDecimals": int})
@@ -6,11 +6,17 @@ import asyncio
 from dotenv import load_dotenv
 load_dotenv()
 
-from quantpylib.wrappers.hyperliquid import Hyperliquid
+from hyperliquid.daemon_client import DaemonClient, DaemonError
 
-async def get_prices(tickers=None):
-    if tickers is None:
-        tickers = ['BTC', 'ETH', 'SOL', 'HYPE']
+async def fetch_mids():
+    # answered from the daemon's allMids subscription when `python -m hyperliquid.daemon` is running
+    try:
+        with DaemonClient() as client:
+            return client.all_mids(), None
+    except (OSError, DaemonError):
+        pass
+
+    from quantpylib.wrappers.hyperliquid import Hyperliquid
 
     hyp = Hyperliquid(
         key=os.getenv('HYP_KEY'),
@@ -18,8 +24,13 @@ async def get_prices(tickers=None):
         mode='live'
     )
     await hyp.init_client()
+    return await hyp.get_all_mids(), hyp
+
+async def get_prices(tickers=None):
+    if tickers is None:
+        tickers = ['BTC', 'ETH', 'SOL', 'HYPE']
 
-    mids = await hyp.get_all_mids()
+    mids, hyp = await fetch_mids()
 
     print("=" * 40)
     print("HYPERLIQUID PRICES")
@@ -34,7 +45,8 @@ async def get_prices(tickers=None):
             print(f"  {ticker_upper:8} NOT FOUND")
 
     print("=" * 40)
-    await hyp.cleanup()
+    if hyp is not None:
+        await hyp.cleanup()
 
 if __name__ == "__main__":
     tickers = sys.argv[1:] if len(sys.argv) > 1 else None
@@ -0,0 +1,136 @@
+import eth_account
+import pytest
+
+from hyperliquid.account_state import AccountState
+from hyperliquid.exchange import Exchange
+from hyperliquid.info import Info
+from hyperliquid.local_server import LocalServer
+from hyperliquid.utils.signing import OrderType
+
+GTC: OrderType = {"limit": {"tif": "Gtc"}}
+IOC: OrderType = {"limit": {"tif": "Ioc"}}
+USER = "0x0000000000000000000000000000000000000001"
+
+
+def clearinghouse_state(szis, time, account_value="1000.0"):
+    positions = [
+        {"position": {"coin": coin, "szi": szi, "entryPx": "100.0"}, "type": "oneWay"} for coin, szi in szis.items()
+    ]
+    return {
+        "assetPositions": positions,
+        "marginSummary": {"accountValue": account_value},
+        "withdrawable": "500.0",
+        "time": time,
+    }
+
+
+def web_data2(szis, time, open_orders=()):
+    return {
+        "channel": "webData2",
+        "data": {
+            "user": USER,
+            "clearinghouseState": clearinghouse_state(szis, time),
+            "openOrders": list(open_orders),
+            "spotState": {"balances": [{"coin": "USDC", "total": "25.5", "hold": "0.0"}]},
+        },
+    }
+
+
+def fill(tid, coin, side, sz, time):
+    return {"tid": tid, "coin": coin, "side": side, "sz": str(sz), "px": "100.0", "time": time, "oid": 1}
+
+
+def user_fills(fills, is_snapshot=False):
+    return {"channel": "userFills", "data": {"user": USER, "isSnapshot": is_snapshot, "fills": fills}}
+
+
+@pytest.fixture
+def server():
+    server = LocalServer().start()
+    yield server
+    server.stop()
+
+
+def test_fills_move_positions_until_the_next_snapshot(server):
+    state = AccountState(Info(server.base_url, skip_ws=True), USER)
+    state.on_web_data2(web_data2({"ETH": "1.0"}, 1000, [{"coin": "ETH", "oid": 7}]))
+    assert state.wait_ready(0)
+    assert state.position_size("ETH") == 1.0 and state.balances() == {"USDC": 25.5}
+    assert state.account_value == 1000.0 and state.withdrawable == 500.0
+    assert [order["oid"] for order in state.open_orders("ETH")] == [7] and state.open_orders("BTC") == []
+
+    # history sent on subscription and fills already in the snapshot are not applied again
+    state.on_user_fills(user_fills([fill(1, "ETH", "B", 5, 900)], is_snapshot=True))
+    state.on_user_fills(user_fills([fill(2, "ETH", "B", 5, 1000)]))
+    assert state.position_size("ETH") == 1.0
+
+    version = state.version
+    state.on_user_fills(user_fills([fill(3, "ETH", "A", 0.25, 1001), fill(4, "BTC", "B", 0.1, 1002)]))
+    state.on_user_fills(user_fills([fill(3, "ETH", "A", 0.25, 1001)]))
+    assert state.positions() == {"ETH": 0.75, "BTC": 0.1}
+    assert state.version > version
+
+    # a snapshot including fill 3 but not fill 4
+    state.on_web_data2(web_data2({"ETH": "0.75"}, 1001))
+    assert state.positions() == {"ETH": 0.75, "BTC": 0.1}
+    state.on_web_data2(web_data2({"ETH": "0.75", "BTC": "0.1"}, 1002))
+    assert state.positions() == {"ETH": 0.75, "BTC": 0.1}
+    # stale snapshots are ignored
+    state.on_web_data2(web_data2({}, 999))
+    model = state.state()
+    assert model is not None and model.sizes().tolist() == [0.75, 0.1]
+
+
+def test_fills_do_not_leave_float_residuals(server):
+    state = AccountState(Info(server.base_url, skip_ws=True), USER)
+    state.on_web_data2(web_data2({}, 1000))
+    state.on_user_fills(
+        user_fills([fill(1, "ETH", "B", 0.1, 1001), fill(2, "ETH", "B", 0.2, 1002), fill(3, "ETH", "A", 0.3, 1003)])
+    )
+    assert state.position_size("ETH") == 0 and state.positions() == {}
+
+
+def test_funding_and_ledger_events_are_kept(server):
+    state = AccountState(Info(server.base_url, skip_ws=True), USER)
+    state.on_user_fundings({"channel": "userFundings", "data": {"isSnapshot": True, "fundings": [{"usdc": "1"}]}})
+    state.on_user_fundings({"channel": "userFundings", "data": {"user": USER, "fundings": [{"usdc": "-0.5"}]}})
+    state.on_ledger_updates(
+        {
+            "channel": "userNonFundingLedgerUpdates",
+            "data": {"user": USER, "nonFundingLedgerUpdates": [{"delta": {"type": "deposit", "usdc": "10"}}]},
+        }
+    )
+    assert list(state.fundings) == [{"usdc": "-0.5"}]
+    assert state.ledger_updates[0]["delta"]["type"] == "deposit"
+
+
+def test_reconcile_and_market_close_from_the_mirror(server):
+    maker = Exchange(eth_account.Account.create(), server.base_url)
+    taker = Exchange(eth_account.Account.create(), server.base_url)
+    maker.order("ETH", False, 2, 2000, GTC)
+    taker.order("ETH", True, 2, 2000, IOC)
+
+    state = AccountState(taker.info, taker.wallet.address)
+    state.reconcile()
+    assert state.position_size("ETH") == 2.0
+
+    maker.order("ETH", True, 2, 1990, GTC)
+    taker.account_state = state
+    response = taker.market_close("ETH", px=2000)
+    assert response["response"]["data"]["statuses"][0]["filled"]["totalSz"] == "2"
+    state.reconcile()
+    assert state.positions() == {}
+    assert taker.market_close("ETH") is None
+
+
+def test_market_close_reads_rest_until_the_mirror_is_ready(server):
+    maker = Exchange(eth_account.Account.create(), server.base_url)
+    taker = Exchange(eth_account.Account.create(), server.base_url)
+    maker.order("ETH", False, 1, 2000, GTC)
+    taker.order("ETH", True, 1, 2000, IOC)
+    maker.order("ETH", True, 1, 1990, GTC)
+
+    # started but without a snapshot yet, the mirror would report no position
+    taker.account_state = AccountState(taker.info, taker.wallet.address)
+    response = taker.market_close("ETH", px=2000)
+    assert response["response"]["data"]["statuses"][0]["filled"]["totalSz"] == "1"
@@ -0,0 +1,84 @@
+import pytest
+
+from hyperliquid.bars import Bar, BarBuilder, BarSeries, dollar_bars, tick_bars, time_bars, volume_bars
+
+
+def trades(*rows, coin="ETH"):
+    data = [
+        {"coin": coin, "side": side, "px": str(px), "sz": str(sz), "time": time, "tid": tid, "hash": "0x0"}
+        for tid, time, px, sz, side in rows
+    ]
+    return {"channel": "trades", "data": data}
+
+
+def current(series: BarSeries) -> Bar:
+    bar = series.current()
+    assert bar is not None
+    return bar
+
+
+def test_time_bars_wait_for_late_trades():
+    series = BarSeries("ETH", time_bars(1), allowed_lateness_ms=200)
+    series.add(1000, 10.0, 1.0, True)
+    series.add(1500, 12.0, 1.0, False)
+    series.add(2100, 11.0, 2.0, True)
+    # still within the allowed lateness of the first bar
+    series.add(1900, 9.0, 1.0, False)
+    assert len(series.ring) == 0
+    series.add(2300, 11.5, 1.0, True)
+    assert series.ring.bars() == [(1000, 1900, 10.0, 12.0, 9.0, 9.0, 3.0, 1.0, 31.0, 3)]
+    series.add(1950, 50.0, 1.0, True)
+    assert series.late_trades == 1
+
+    # gaps produce no bars and a timer flush closes the last one
+    series.add(5000, 13.0, 1.0, True)
+    assert [bar.start for bar in series.ring.bars()] == [1000, 2000]
+    assert current(series).start == 5000
+    series.flush(6000)
+    assert [bar.start for bar in series.ring.bars()] == [1000, 2000, 5000]
+    assert series.current() is None
+
+
+def test_tick_volume_and_dollar_bars():
+    ticks = BarSeries("ETH", tick_bars(2))
+    volume = BarSeries("ETH", volume_bars(1.0))
+    dollar = BarSeries("ETH", dollar_bars(100.0))
+    for series in (ticks, volume, dollar):
+        series.add(1, 50.0, 0.5, True)
+        series.add(2, 40.0, 2.0, False)
+        series.add(3, 60.0, 0.25, True)
+    assert [(bar.trades, bar.volume) for bar in ticks.ring.bars()] == [(2, 2.5)]
+    # the 2.0 trade is split over three bars
+    assert [bar.volume for bar in volume.ring.bars()] == [1.0, 1.0]
+    assert current(volume).volume == pytest.approx(0.75)
+    assert [bar.notional for bar in dollar.ring.bars()] == pytest.approx([100.0])
+    assert current(dollar).notional == pytest.approx(5.0 + 15.0)
+    with pytest.raises(ValueError):
+        BarSeries("ETH", volume_bars(0))
+
+
+def test_ring_keeps_the_last_bars():
+    series = BarSeries("ETH", tick_bars(1), capacity=3)
+    for i in range(5):
+        series.add(i, float(i), 1.0, True)
+    ring = series.ring
+    assert len(ring) == 3 and ring.count == 5
+    assert ring.column("close").tolist() == [2.0, 3.0, 4.0]
+    assert ring.column("close", 2).tolist() == [3.0, 4.0]
+    assert ring[-1].close == 4.0 and ring[0].close == 2.0
+    with pytest.raises(IndexError):
+        ring[3]  # pylint: disable=pointless-statement
+
+
+def test_builder_routes_and_deduplicates_trades():
+    closed = []
+    builder = BarBuilder(None, ["ETH", "BTC"], [tick_bars(2), time_bars(5)], on_bar=lambda *bar: closed.append(bar))
+    builder.on_trades(trades((1, 1000, 10, 1, "B"), (2, 1200, 11, 1, "A")))
+    builder.on_trades(trades((1, 1000, 10, 1, "B"), (3, 7000, 12, 1, "B")))
+    builder.on_trades(trades((4, 1000, 100, 1, "B"), coin="SOL"))
+    assert builder.series("ETH", tick_bars(2)).ring.column("trades").tolist() == [2]
+    assert builder.series("ETH", time_bars(5)).ring.column("volume").tolist() == [2.0]
+    assert builder.series("BTC", tick_bars(2)).ring.count == 0
+    assert [(coin, spec.kind) for coin, spec, _ in closed] == [("ETH", "tick"), ("ETH", "time")]
+    builder.flush(10_000)
+    assert builder.series("ETH", time_bars(5)).ring.column("start").tolist() == [0, 5000]
@@ -0,0 +1,47 @@
+import eth_account
+
+from benchmarks import harness, hot_paths, import_time, order_path  # noqa: F401 pylint: disable=unused-import
+from hyperliquid.exchange import Exchange
+from hyperliquid.local_server import LocalServer
+
+
+def test_every_benchmark_runs():
+    assert harness.REGISTRY
+    for setup in harness.REGISTRY.values():
+        try:
+            setup()()
+        finally:
+            harness.cleanup()
+
+
+def test_compare_flags_slowdowns():
+    results = harness.run(["ws.ws_msg_to_identifier"], min_time=0.001, repeat=1)
+    baseline = {results[0].name: results[0].ns_per_op / 2}
+    (comparison,) = harness.compare(baseline, results)
+    assert comparison.change is not None and comparison.change > 0.9
+
+
+def test_order_path_reports_every_stage():
+    server = LocalServer().start()
+    try:
+        exchange = Exchange(eth_account.Account.from_key(order_path.PRIVATE_KEY), server.base_url)
+        results = order_path.run(exchange, list(order_path.SCENARIOS), [200], duration=0.01, batch=3, concurrency=1)
+    finally:
+        server.stop()
+    assert [(result.scenario, result.errors) for result in results] == [(name, 0) for name in order_path.SCENARIOS]
+    for result in results:
+        assert result.latency_ns["sign"]["p50"] > 0 and result.latency_ns["http"]["p50"] > 0
+        assert result.latency_ns["total"]["p50"] >= result.latency_ns["service"]["p50"] > 0
+    # the probes are removed again
+    assert Exchange._post_action.__name__ == "_post_action"
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+    assert [order_path.percentile(values, q) for q in (0.5, 0.99, 0.999)] == [50, 99, 100]
+
+
+def test_info_and_exchange_imports_stay_light():
+    for result in import_time.check(repeat=1):
+        assert result.forbidden == [], result.statement
+        assert result.ms > 0
@@ -0,0 +1,70 @@
+import time
+
+from hyperliquid.info import Info
+from hyperliquid.utils.cache import MISS, ResponseCache
+from hyperliquid.utils.types import Meta, SpotMeta
+
+TEST_META: Meta = {"universe": []}
+TEST_SPOT_META: SpotMeta = {"universe": [], "tokens": []}
+
+
+class OfflineInfo(Info):
+    def _send(self, url_path, payload):
+        raise AssertionError("no network in tests")
+
+
+def test_hits_within_ttl_and_expires():
+    cache = ResponseCache(ttls={"meta": 0.05})
+    payload = {"type": "meta", "dex": ""}
+    assert cache.get(payload) is None
+    cache.put(payload, {"universe": [{"name": "BTC", "szDecimals": 5}]})
+    first = cache.get(payload)
+    assert first == {"universe": [{"name": "BTC", "szDecimals": 5}]}
+    first["universe"].clear()
+    assert cache.get(payload) == {"universe": [{"name": "BTC", "szDecimals": 5}]}
+    time.sleep(0.06)
+    assert cache.get(payload) is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 2
+
+
+def test_evicts_least_recently_used_by_size():
+    cache = ResponseCache(ttls={"userFees": 60}, max_bytes=80)
+    for user in ["0xa", "0xb", "0xc"]:
+        cache.put({"type": "userFees", "user": user}, {"userAddRate": "0.0001", "pad": "x" * 5})
+        cache.get({"type": "userFees", "user": "0xa"})
+    assert cache.stats()["evictions"] == 1
+    assert cache.get({"type": "userFees", "user": "0xb"}) is None
+    assert cache.get({"type": "userFees", "user": "0xa"}) is not None
+    assert cache.stats()["bytes"] <= 80
+
+
+def test_invalidate_by_type_and_user():
+    cache = ResponseCache()
+    cache.put({"type": "userFees", "user": "0xAbc"}, {"fee": 1})
+    cache.put({"type": "subAccounts", "user": "0xabc"}, [])
+    cache.put({"type": "meta", "dex": ""}, {"universe": []})
+    assert cache.invalidate(user="0xabc") == 2
+    assert cache.invalidate(request_type="meta") == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_info_serves_cacheable_requests_from_cache():
+    cache = ResponseCache()
+    info = OfflineInfo(skip_ws=True, meta=TEST_META, spot_meta=TEST_SPOT_META, cache=cache)
+    cache.put({"type": "perpDexs"}, [None, {"name": "test"}])
+    assert info.perp_dexs() == [None, {"name": "test"}]
+    assert not cache.is_cacheable({"type": "l2Book", "coin": "BTC"})
+
+
+def test_null_responses_are_cached():
+    cache = ResponseCache()
+    info = OfflineInfo(skip_ws=True, meta=TEST_META, spot_meta=TEST_SPOT_META, cache=cache)
+    payload = {"type": "subAccounts", "user": "0xabc"}
+    assert cache.get(payload, MISS) is MISS
+    cache.put(payload, None)
+    assert cache.get(payload, MISS) is None
+    # answered from the cache, OfflineInfo fails on any request that reaches the network
+    assert info.query_sub_accounts("0xabc") is None
+    cache.put({"type": "userFees", "user": "0xabc"}, {"error": "rate limited"})
+    assert cache.get({"type": "userFees", "user": "0xabc"}, MISS) is MISS
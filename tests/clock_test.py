@@ -0,0 +1,93 @@
+import threading
+import time
+
+import eth_account
+import pytest
+
+from hyperliquid.exchange import Exchange
+from hyperliquid.info import Info
+from hyperliquid.local_server import LocalServer
+from hyperliquid.utils.clock import ExchangeClock
+from hyperliquid.utils.signing import OrderType
+
+GTC: OrderType = {"limit": {"tif": "Gtc"}}
+
+
+def test_prefers_the_shortest_round_trip():
+    clock = ExchangeClock()
+    assert clock.estimate() is None and clock.offset_ms == 0.0
+    clock.observe(1000, 1600, 1200)
+    clock.observe(2000, 2530, 2040)
+    clock.observe(3000, 3700, 3400)
+    assert clock.estimate() == (510.0, 20.0)
+
+    # a message can not arrive before the exchange stamped it
+    clock.observe_message(5550, received_ms=5000)
+    assert clock.estimate() == (550.0, 20.0)
+    now = time.time() * 1000
+    clock.on_ws_message({"channel": "trades", "data": [{"time": now}, {"time": now + 10_000}]})
+    assert clock.offset_ms > 9_000
+
+
+def test_window_forgets_old_samples():
+    clock = ExchangeClock(window=2)
+    clock.observe(0, 100, 10)
+    clock.observe(0, 200, 100)
+    clock.observe(0, 300, 50)
+    assert clock.estimate() == (275.0, 25.0)
+
+
+@pytest.fixture
+def server():
+    server = LocalServer().start()
+    yield server
+    server.stop()
+
+
+def test_samples_from_l2_snapshots(server):
+    clock = ExchangeClock()
+    clock.sample(Info(server.base_url, skip_ws=True), "ETH")
+    assert abs(clock.offset_ms) < 1000 and clock.error_ms < 1000
+
+
+def test_exchange_nonces_and_expiry_follow_the_clock(server):
+    clock = ExchangeClock()
+    now = time.time() * 1000
+    clock.observe(now, now + 3_600_000, now)
+    exchange = Exchange(eth_account.Account.create(), server.base_url, clock=clock)
+    assert exchange._next_nonce() >= now + 3_600_000  # pylint: disable=protected-access
+
+    exchange.set_expires_in(1000)
+    nonce = exchange._next_nonce()  # pylint: disable=protected-access
+    assert exchange.expires_after == nonce + 1000
+    # the local server uses the local clock, so an hour ahead the action is still fresh
+    response = exchange.order("ETH", True, 1, 1000, GTC)
+    assert response["response"]["data"]["statuses"][0]["resting"]
+
+    behind = ExchangeClock()
+    behind.observe(now, now - 60_000, now)
+    exchange = Exchange(eth_account.Account.create(), server.base_url, clock=behind)
+    exchange.set_expires_in(1000)
+    response = exchange.order("ETH", True, 1, 1000, GTC)
+    assert response["status"] == "err" and "expired" in response["response"]
+
+    exchange.set_expires_after(None)
+    assert exchange.expires_after is None
+
+
+def test_expiry_is_per_thread():
+    exchange = Exchange(eth_account.Account.create(), meta={"universe": []}, spot_meta={"universe": [], "tokens": []})
+    exchange.set_expires_in(500)
+    seen = {}
+
+    def sign(name):
+        nonce = exchange._next_nonce()  # pylint: disable=protected-access
+        time.sleep(0.01)
+        seen[name] = (nonce, exchange.expires_after)
+
+    threads = [threading.Thread(target=sign, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(expires_after == nonce + 500 for nonce, expires_after in seen.values())
@@ -0,0 +1,135 @@
+import os
+import stat
+import tempfile
+import time
+
+import eth_account
+import pytest
+
+from hyperliquid.daemon import Daemon
+from hyperliquid.daemon_client import DaemonClient, DaemonError, default_socket_path
+from hyperliquid.exchange import Exchange
+from hyperliquid.info import Info
+from hyperliquid.local_server import LocalServer
+from hyperliquid.utils.cache import ResponseCache
+
+GTC = {"limit": {"tif": "Gtc"}}
+
+
+@pytest.fixture
+def server():
+    server = LocalServer(initial_mids={"BTC": 60000, "ETH": 3000, "SOL": 150}, book_interval=0.01).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are limited to about 100 bytes, pytest's tmp_path can be longer
+    directory = tempfile.mkdtemp()
+    yield os.path.join(directory, "daemon.sock")
+    os.rmdir(directory)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_serves_cached_and_forwarded_requests(server, socket_path):
+    info = Info(server.base_url, cache=ResponseCache())
+    exchange = Exchange(eth_account.Account.create(), server.base_url)
+    daemon = Daemon(info, socket_path, exchange).start()
+    client = DaemonClient(socket_path)
+    try:
+        assert client.available()
+        assert client.all_mids() == info.all_mids()
+        wait_for(lambda: daemon._fresh("allMids") is not None)  # pylint: disable=protected-access
+        assert set(client.all_mids()) == {"BTC", "ETH", "SOL"}
+
+        response = client.exchange("order", "ETH", True, 1, 1000, GTC)
+        assert response["response"]["data"]["statuses"] == [{"resting": {"oid": 1}}]
+        assert client.info("open_orders", exchange.wallet.address)[0]["oid"] == 1
+        assert client.user_state(exchange.wallet.address)["assetPositions"] == []
+
+        assert client.l2_book("ETH")["levels"][0][0]["px"] == "1000"
+        wait_for(lambda: daemon._fresh("l2Book:ETH") is not None)  # pylint: disable=protected-access
+        assert client.l2_book("ETH")["coin"] == "ETH"
+
+        assert [asset["name"] for asset in client.meta()["universe"]] == ["BTC", "ETH", "SOL"]
+        assert client.call("coin_to_asset")["ETH"] == 1
+        assert client.call("ping")["requests"] > 0
+    finally:
+        client.close()
+        daemon.stop()
+        info.disconnect_websocket()
+    assert not os.path.exists(socket_path)
+    assert not client.available()
+
+
+def test_rejects_unknown_and_unforwarded_methods(server, socket_path):
+    daemon = Daemon(Info(server.base_url, skip_ws=True), socket_path).start()
+    try:
+        with DaemonClient(socket_path) as client:
+            with pytest.raises(DaemonError, match="unknown method"):
+                client.call("shutdown")
+            with pytest.raises(DaemonError, match="not an Info read method"):
+                client.info("disconnect_websocket")
+            with pytest.raises(DaemonError, match="without an Exchange"):
+                client.exchange("order", "ETH", True, 1, 1000, GTC)
+            # the connection stays usable after errors
+            assert client.all_mids()["ETH"]
+    finally:
+        daemon.stop()
+
+
+def test_refuses_to_replace_a_running_daemon(server, socket_path):
+    info = Info(server.base_url, skip_ws=True)
+    daemon = Daemon(info, socket_path).start()
+    try:
+        with pytest.raises(RuntimeError):
+            Daemon(info, socket_path).start()
+    finally:
+        daemon.stop()
+
+
+def test_default_socket_path(monkeypatch):
+    monkeypatch.delenv("HYPERLIQUID_DAEMON_SOCKET", raising=False)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+    assert default_socket_path() == "/run/user/1000/hyperliquid-daemon.sock"
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    assert default_socket_path() == os.path.join(tempfile.gettempdir(), f"hyperliquid-{os.getuid()}", "daemon.sock")
+    monkeypatch.setenv("HYPERLIQUID_DAEMON_SOCKET", "/tmp/custom.sock")
+    assert default_socket_path() == "/tmp/custom.sock"
+
+
+def test_socket_is_private_to_the_user(server, socket_path):
+    # the socket's directory is created with mode 0700 when it is missing
+    nested = os.path.join(os.path.dirname(socket_path), "private", "daemon.sock")
+    daemon = Daemon(Info(server.base_url, skip_ws=True), nested).start()
+    try:
+        assert stat.S_IMODE(os.stat(os.path.dirname(nested)).st_mode) == 0o700
+        assert stat.S_IMODE(os.stat(nested).st_mode) == 0o600
+    finally:
+        daemon.stop()
+        os.rmdir(os.path.dirname(nested))
+
+
+def test_refuses_paths_other_users_control(server, socket_path, monkeypatch):
+    info = Info(server.base_url, skip_ws=True)
+    directory = os.path.dirname(socket_path)
+    os.chmod(directory, 0o777)
+    with pytest.raises(RuntimeError, match="writable by other users"):
+        Daemon(info, socket_path).start()
+
+    # in a sticky directory, a socket planted by another user is left alone
+    os.chmod(directory, 0o1777)
+    with open(socket_path, "w"):
+        pass
+    monkeypatch.setattr(os, "getuid", lambda: os.lstat(socket_path).st_uid + 1)
+    with pytest.raises(RuntimeError, match="belongs to another user"):
+        Daemon(info, socket_path).start()
+    monkeypatch.undo()
+    os.unlink(socket_path)
@@ -0,0 +1,132 @@
+import time
+
+import eth_account
+import pytest
+
+from hyperliquid.deadman_switch import DeadmanSwitch
+from hyperliquid.exchange import Exchange
+from hyperliquid.order_tracker import OrderTracker
+from hyperliquid.utils.signing import recover_agent_or_user_from_l1_action
+from hyperliquid.utils.types import Any, Meta, SpotMeta
+
+TEST_META: Meta = {"universe": [{"name": "BTC", "szDecimals": 5}, {"name": "ETH", "szDecimals": 4}]}
+TEST_SPOT_META: SpotMeta = {"universe": [], "tokens": []}
+NOW = 1_700_000_000_000
+# orders are fed to the tracker directly, it is never started
+NO_INFO: Any = None
+
+
+def order(oid: int, coin: str = "ETH") -> Any:
+    return {"coin": coin, "side": "B", "limitPx": "1000.0", "sz": "1.0", "oid": oid, "timestamp": 1, "origSz": "1.0"}
+
+
+class Stub:
+    """Exchange calls made by the switch, recorded instead of sent."""
+
+    def __init__(self):
+        self.now = NOW
+        self.scheduled: Any = []
+        self.posted: Any = []
+        self.bulk_cancels: Any = []
+
+
+@pytest.fixture
+def stub():
+    return Stub()
+
+
+@pytest.fixture
+def exchange(monkeypatch, stub):
+    exchange = Exchange(eth_account.Account.create(), meta=TEST_META, spot_meta=TEST_SPOT_META)
+    monkeypatch.setattr(exchange, "now_ms", lambda: stub.now)
+    monkeypatch.setattr(exchange, "schedule_cancel", lambda time: stub.scheduled.append(time) or {"status": "ok"})
+    monkeypatch.setattr(exchange, "post", lambda url_path, payload: stub.posted.append((url_path, payload)) or {})
+    monkeypatch.setattr(exchange, "bulk_cancel", lambda cancels: stub.bulk_cancels.append(cancels) or {})
+    return exchange
+
+
+@pytest.fixture
+def tracker():
+    tracker = OrderTracker(NO_INFO, "0x0000000000000000000000000000000000000001")
+    tracker.seed([order(1), order(2, "BTC")])
+    return tracker
+
+
+def test_start_heartbeats_and_presigns_every_open_order(exchange, tracker, stub):
+    switch = DeadmanSwitch(exchange, tracker, refresh_interval=60, presign_horizon_ms=60_000)
+    switch.start()
+    assert stub.scheduled == [NOW + 30_000]
+    presigned = switch.presigned
+    assert presigned is not None and presigned.oids == {1, 2} and presigned.nonce == NOW + 60_000
+    payload = presigned.payload
+    assert payload["action"] == {"type": "cancel", "cancels": [{"a": 1, "o": 1}, {"a": 0, "o": 2}]}
+    signer = recover_agent_or_user_from_l1_action(
+        payload["action"], payload["signature"], None, payload["nonce"], None, True
+    )
+    assert signer.lower() == exchange.wallet.address.lower()
+
+    switch.stop()
+    assert stub.scheduled == [NOW + 30_000, None]
+
+
+def test_refresh_re_signs_on_changes_and_before_the_nonce_gets_old(exchange, tracker, stub):
+    switch = DeadmanSwitch(exchange, tracker, presign_horizon_ms=60_000)
+    switch.refresh()
+    first = switch.presigned
+    switch.refresh()
+    assert switch.presigned is first
+
+    tracker.on_order_updates(
+        {"channel": "orderUpdates", "data": [{"order": order(3), "status": "open", "statusTimestamp": 5}]}
+    )
+    switch.refresh()
+    assert switch.presigned is not first and switch.presigned is not None and switch.presigned.oids == {1, 2, 3}
+
+    # re-armed once half the horizon has passed, well before the exchange would reject the nonce
+    second = switch.presigned
+    stub.now = NOW + 29_000
+    switch.refresh()
+    assert switch.presigned is second
+    stub.now = NOW + 31_000
+    switch.refresh()
+    assert switch.presigned is not second and switch.presigned is not None and switch.presigned.nonce == NOW + 91_000
+
+
+def test_panic_posts_the_presigned_cancel_and_cancels_the_rest(exchange, tracker, stub):
+    switch = DeadmanSwitch(exchange, tracker)
+    switch.refresh()
+    assert switch.presigned is not None
+    payload = switch.presigned.payload
+    tracker.on_order_updates(
+        {"channel": "orderUpdates", "data": [{"order": order(3), "status": "open", "statusTimestamp": 5}]}
+    )
+
+    result = switch.panic()
+    assert stub.posted == [("/exchange", payload)] and payload["expiresAfter"] is None
+    assert stub.bulk_cancels == [[{"coin": "ETH", "oid": 3}]]
+    assert result == {"presigned": {}, "remaining": {}}
+    # the nonce is spent
+    assert switch.presigned is None
+
+
+def test_heartbeats_until_stopped_without_disarming(exchange, tracker, stub):
+    switch = DeadmanSwitch(exchange, tracker, heartbeat_interval=0.02, cancel_after=10, refresh_interval=0.01)
+    switch.start()
+    deadline = time.monotonic() + 5
+    while len(stub.scheduled) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    switch.stop(disarm=False)
+    heartbeats = len(stub.scheduled)
+    assert heartbeats >= 3 and set(stub.scheduled) == {NOW + 10_000}
+    time.sleep(0.05)
+    # no heartbeat after stop, and the scheduled cancel is left to fire
+    assert len(stub.scheduled) == heartbeats
+
+
+def test_rejects_invalid_timing(exchange, tracker):
+    with pytest.raises(ValueError):
+        DeadmanSwitch(exchange, tracker, cancel_after=4)
+    with pytest.raises(ValueError):
+        DeadmanSwitch(exchange, tracker, heartbeat_interval=30, cancel_after=30)
+    with pytest.raises(ValueError):
+        DeadmanSwitch(exchange, tracker, presign_horizon_ms=86_400_000)
@@ -0,0 +1,70 @@
+import eth_account
+import pytest
+
+from hyperliquid.exchange_pool import ExchangePool
+from hyperliquid.info import Info
+from hyperliquid.utils.types import Any, Meta, SpotMeta
+
+TEST_META: Meta = {"universe": [{"name": "BTC", "szDecimals": 5}, {"name": "ETH", "szDecimals": 4}]}
+TEST_SPOT_META: SpotMeta = {"universe": [], "tokens": []}
+GTC: Any = {"limit": {"tif": "Gtc"}}
+
+
+class FakeAgent:
+    def __init__(self, name):
+        self.name = name
+        self.calls = []
+
+    def __getattr__(self, method):
+        def call(*args):
+            self.calls.append((method, args))
+            return self.name
+
+        return call
+
+
+def make_pool(routing="round_robin", n=3):
+    agents: Any = [FakeAgent(i) for i in range(n)]
+    return ExchangePool(agents, routing), agents
+
+
+def test_round_robin_cycles_through_agents():
+    pool, agents = make_pool()
+    assert [pool.order("ETH", True, 1, 1000, GTC) for _ in range(5)] == [0, 1, 2, 0, 1]
+    assert [pool.cancel("BTC", oid) for oid in range(3)] == [2, 0, 1]
+    assert agents[0].calls[0] == ("order", ("ETH", True, 1, 1000, GTC, False, None, None))
+
+
+def test_coin_routing_keeps_a_coin_on_one_agent():
+    pool, _ = make_pool("coin")
+    eth = {pool.order("ETH", True, 1, 1000, GTC) for _ in range(5)}
+    eth.add(pool.cancel("ETH", 1))
+    eth.add(pool.bulk_cancel([{"coin": "ETH", "oid": 2}, {"coin": "BTC", "oid": 3}]))
+    assert len(eth) == 1
+    assert len({pool.agent(f"COIN{i}").name for i in range(20)}) == 3
+    # without a coin, e.g. for account wide actions, agents still take turns
+    assert [pool.agent().name for _ in range(3)] == [0, 1, 2]
+
+
+def test_bulk_actions_need_a_request():
+    pool, agents = make_pool()
+    with pytest.raises(ValueError):
+        pool.bulk_orders([])
+    with pytest.raises(ValueError):
+        pool.bulk_cancel([])
+    with pytest.raises(ValueError):
+        pool.bulk_cancel_by_cloid([])
+    with pytest.raises(ValueError):
+        pool.bulk_modify_orders_new([])
+    assert all(agent.calls == [] for agent in agents)
+    with pytest.raises(ValueError):
+        ExchangePool([])
+
+
+def test_agents_from_keys_share_one_info():
+    info = Info(skip_ws=True, meta=TEST_META, spot_meta=TEST_SPOT_META)
+    keys = [eth_account.Account.create().key.hex() for _ in range(2)]
+    pool = ExchangePool.from_agent_keys(keys, "0x0000000000000000000000000000000000000001", info)
+    assert [agent.info for agent in pool.agents] == [info, info]
+    assert [agent.wallet.key.hex() for agent in pool.agents] == keys
+    assert {agent.account_address for agent in pool.agents} == {"0x0000000000000000000000000000000000000001"}
@@ -0,0 +1,118 @@
+import threading
+
+import eth_account
+import pytest
+
+from hyperliquid.exchange import Exchange
+from hyperliquid.utils.types import Any, Meta, SpotMeta
+
+TEST_META: Meta = {"universe": [{"name": "BTC", "szDecimals": 5}, {"name": "ETH", "szDecimals": 4}]}
+TEST_SPOT_META: SpotMeta = {
+    "universe": [{"name": "PURR/USDC", "tokens": [1, 0], "index": 0, "isCanonical": True}],
+    "tokens": [
+        {
+            "name": name,
+            "szDecimals": sz_decimals,
+            "weiDecimals": 8,
+            "index": index,
+            "tokenId": "0x0",
+            "isCanonical": True,
+            "evmContract": None,
+            "fullName": None,
+        }
+        for index, (name, sz_decimals) in enumerate([("USDC", 8), ("PURR", 0)])
+    ],
+}
+
+
+def position(coin: str, szi: str) -> Any:
+    return {"position": {"coin": coin, "szi": szi}, "type": "oneWay"}
+
+
+@pytest.fixture
+def sent():
+    return {"orders": [], "cancels": []}
+
+
+@pytest.fixture
+def exchange(monkeypatch, sent):
+    exchange = Exchange(eth_account.Account.create(), meta=TEST_META, spot_meta=TEST_SPOT_META)
+
+    def bulk_orders(order_requests, builder=None, grouping="na"):
+        sent["orders"].append(order_requests)
+        return {"status": "ok"}
+
+    def bulk_cancel(cancel_requests):
+        sent["cancels"].append(cancel_requests)
+        return {"status": "ok"}
+
+    monkeypatch.setattr(exchange, "bulk_orders", bulk_orders)
+    monkeypatch.setattr(exchange, "bulk_cancel", bulk_cancel)
+    monkeypatch.setattr(exchange.info, "all_mids", lambda dex="": {"BTC": "60000", "ETH": "2000"})
+    monkeypatch.setattr(
+        exchange.info,
+        "user_state",
+        lambda address, dex="": {"assetPositions": [position("BTC", "0.5"), position("ETH", "-2.0")]},
+    )
+    monkeypatch.setattr(
+        exchange.info,
+        "open_orders",
+        lambda address, dex="": [
+            {"coin": "BTC", "oid": 1},
+            {"coin": "ETH", "oid": 2},
+            {"coin": "SOL", "oid": 3},
+            {"coin": "PURR/USDC", "oid": 4},
+        ],
+    )
+    return exchange
+
+
+def test_close_all_positions_closes_every_position(exchange, sent):
+    response = exchange.close_all_positions()
+    assert response == {"cancel": None, "order": {"status": "ok"}}
+    (orders,) = sent["orders"]
+    assert [(order["coin"], order["is_buy"], order["sz"]) for order in orders] == [
+        ("BTC", False, 0.5),
+        ("ETH", True, 2.0),
+    ]
+    assert all(order["reduce_only"] and order["order_type"] == {"limit": {"tif": "Ioc"}} for order in orders)
+    assert [order["limit_px"] for order in orders] == [57000.0, 2100.0]
+    assert sent["cancels"] == []
+
+
+def test_close_all_positions_cancels_only_orders_in_closed_coins(exchange, sent):
+    exchange.close_all_positions(cancel_orders=True)
+    # orders in coins without a position and spot orders stay
+    assert sent["cancels"] == [[{"coin": "BTC", "oid": 1}, {"coin": "ETH", "oid": 2}]]
+
+    sent.update(orders=[], cancels=[])
+    exchange.close_all_positions(coins=["ETH"], cancel_orders=True)
+    assert sent["cancels"] == [[{"coin": "ETH", "oid": 2}]]
+    assert [order["coin"] for order in sent["orders"][0]] == ["ETH"]
+
+    sent.update(orders=[], cancels=[])
+    assert exchange.close_all_positions(coins=["SOL"], cancel_orders=True) == {"cancel": None, "order": None}
+    assert sent == {"orders": [], "cancels": []}
+
+
+def test_nonces_are_unique_within_a_millisecond_across_threads(monkeypatch):
+    exchange = Exchange(eth_account.Account.create(), meta=TEST_META, spot_meta=TEST_SPOT_META)
+    # a frozen clock, every nonce is taken in the same millisecond
+    monkeypatch.setattr(exchange, "now_ms", lambda: 1_700_000_000_000)
+    nonces: Any = {}
+
+    def sign(thread):
+        nonces[thread] = [exchange._next_nonce() for _ in range(200)]  # pylint: disable=protected-access
+
+    threads = [threading.Thread(target=sign, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    every = [nonce for thread_nonces in nonces.values() for nonce in thread_nonces]
+    assert len(set(every)) == 1600 and min(every) == 1_700_000_000_000
+    assert all(thread_nonces == sorted(thread_nonces) for thread_nonces in nonces.values())
+
+    # the clock catching up does not move nonces back
+    monkeypatch.setattr(exchange, "now_ms", lambda: 1_700_000_000_001)
+    assert exchange._next_nonce() == max(every) + 1  # pylint: disable=protected-access
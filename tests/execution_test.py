@@ -0,0 +1,67 @@
+import time
+
+import eth_account
+import pytest
+
+from hyperliquid.exchange import Exchange
+from hyperliquid.execution import ExecutionEngine, ParentOrder
+from hyperliquid.info import Info
+from hyperliquid.local_server import LocalServer
+from hyperliquid.order_tracker import OrderTracker
+from hyperliquid.utils.signing import OrderType
+
+GTC: OrderType = {"limit": {"tif": "Gtc"}}
+IOC: OrderType = {"limit": {"tif": "Ioc"}}
+
+
+@pytest.fixture
+def server():
+    server = LocalServer(book_interval=0.01).start()
+    yield server
+    server.stop()
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_twap_reprices_with_modify_and_crosses_the_rest(server):
+    maker = Exchange(eth_account.Account.create(), server.base_url)
+    maker.bulk_orders(
+        [
+            {"coin": "ETH", "is_buy": True, "sz": 0.01, "limit_px": 1999, "order_type": GTC, "reduce_only": False},
+            {"coin": "ETH", "is_buy": False, "sz": 1, "limit_px": 2001, "order_type": GTC, "reduce_only": False},
+        ]
+    )
+    trader = Exchange(eth_account.Account.create(), server.base_url)
+    info = Info(server.base_url, skip_ws=False)
+    tracker = OrderTracker(info, trader.wallet.address)
+    tracker.start()
+    engine = ExecutionEngine(trader, tracker, interval=0.05)
+    parent = engine.submit(ParentOrder("ETH", True, 0.1, duration=1.0, slices=2, finish="cross"))
+    engine.start()
+    try:
+        wait_for(lambda: parent.child is not None)
+        assert parent.child is not None and parent.child.px == 1999 and parent.child.sz == 0.05
+        # the seller hits the maker first, who was there first at the same price
+        maker.order("ETH", False, 0.03, 1990, IOC)
+        wait_for(lambda: engine.filled(parent)[0] == 0.02)
+        maker.order("ETH", True, 0.01, 2000, GTC)
+        wait_for(lambda: parent.child is not None and parent.child.px == 2000)
+        assert parent.wait(5)
+    finally:
+        engine.stop()
+        info.disconnect_websocket()
+
+    report = engine.report(parent)
+    assert report.status == "done"
+    assert report.filled_sz == pytest.approx(0.1)
+    assert report.arrival_px == 2000
+    assert report.modifies >= 1
+    # 0.02 filled at 1999, the rest crossed at 2001
+    assert report.avg_px == pytest.approx((0.02 * 1999 + 0.08 * 2001) / 0.1)
+    assert report.avg_px is not None and report.slippage_bps == pytest.approx((report.avg_px / 2000 - 1) * 1e4)
+    assert info.open_orders(trader.wallet.address) == []
@@ -1,5 +1,11 @@
+import threading
+import time
+
+import eth_account
 import pytest
 
+from hyperliquid.api import API
+from hyperliquid.exchange import Exchange
 from hyperliquid.info import Info
 from hyperliquid.utils.types import L2BookData, Meta, SpotMeta
 
@@ -133,3 +139,67 @@ def test_user_funding_history_without_end_time():
         for key in ["coin", "fundingRate", "szi", "type", "usdc"]:
             assert key in delta, f"There must be a key '{key}' in 'delta'"
         assert delta["type"] == "funding", "The type must be 'funding'"
+
+
+def test_metadata_is_loaded_concurrently(monkeypatch):
+    metas = {"": ["BTC", "ETH"], "test": ["TEST0"], "xyz": ["XYZ0", "XYZ1"]}
+    responses = {
+        "spotMeta": {
+            "universe": [{"name": "PURR/USDC", "tokens": [1, 0], "index": 0}],
+            "tokens": [{"name": "USDC", "szDecimals": 8}, {"name": "PURR", "szDecimals": 0}],
+        },
+        "perpDexs": [None, {"name": "test"}, {"name": "xyz"}],
+    }
+    requests = []
+    in_flight = [0, 0]
+    lock = threading.Lock()
+
+    def post(self, url_path, payload=None):
+        with lock:
+            requests.append(payload)
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight[0] -= 1
+        if payload["type"] == "meta":
+            return {"universe": [{"name": name, "szDecimals": 2} for name in metas[payload["dex"]]]}
+        return responses[payload["type"]]
+
+    monkeypatch.setattr(API, "post", post)
+    info = Info("http://localhost:3001", skip_ws=True, perp_dexs=["", "test", "xyz"])
+    assert len(requests) == 5 and in_flight[1] == 5
+    assert info.coin_to_asset == {
+        "PURR/USDC": 10000,
+        "BTC": 0,
+        "ETH": 1,
+        "TEST0": 110000,
+        "XYZ0": 120000,
+        "XYZ1": 120001,
+    }
+
+    requests.clear()
+    exchange = Exchange(eth_account.Account.create(), info=info)
+    assert requests == []
+    assert exchange.info is info and exchange.base_url == "http://localhost:3001"
+
+
+def test_portfolio_snapshot_reads_every_account_and_dex(monkeypatch):
+    def post(self, url_path, payload=None):
+        request_type, user = payload["type"], payload["user"]
+        if request_type == "clearinghouseState":
+            return {"user": user, "dex": payload["dex"], "time": 1000}
+        if request_type == "spotClearinghouseState":
+            return {"user": user, "balances": []}
+        return [{"type": request_type, "user": user, "dex": payload["dex"]}]
+
+    monkeypatch.setattr(API, "post", post)
+    info = Info(skip_ws=True, meta=TEST_META, spot_meta=TEST_SPOT_META)
+    snapshot = info.portfolio_snapshot(["0x1", "0x2"], dexs=["", "xyz"], max_workers=4)
+    assert set(snapshot["accounts"]) == {"0x1", "0x2"} and snapshot["elapsed"] >= 0
+    account = snapshot["accounts"]["0x2"]
+    assert account["spotState"] == {"user": "0x2", "balances": []}
+    assert account["dexs"]["xyz"]["userState"] == {"user": "0x2", "dex": "xyz", "time": 1000}
+    assert account["dexs"][""]["openOrders"] == [{"type": "openOrders", "user": "0x2", "dex": ""}]
+    assert account["dexs"][""]["frontendOpenOrders"][0]["type"] == "frontendOpenOrders"
+    assert info.portfolio_snapshot([])["accounts"] == {}
@@ -0,0 +1,58 @@
+import eth_account
+import pytest
+
+from hyperliquid.exchange import Exchange
+from hyperliquid.info import Info
+from hyperliquid.local_server import LocalServer
+from hyperliquid.utils.signing import OrderType
+
+GTC: OrderType = {"limit": {"tif": "Gtc"}}
+
+
+@pytest.fixture
+def server():
+    server = LocalServer(book_interval=0.01).start()
+    yield server
+    server.stop()
+
+
+def statuses(response):
+    assert response["status"] == "ok", response
+    return response["response"]["data"]["statuses"]
+
+
+def test_orders_match_with_price_time_priority(server):
+    maker = Exchange(eth_account.Account.create(), server.base_url)
+    taker = Exchange(eth_account.Account.create(), server.base_url)
+    info = Info(server.base_url, skip_ws=True)
+
+    assert statuses(maker.order("ETH", False, 1, 2001, GTC)) == [{"resting": {"oid": 1}}]
+    assert statuses(maker.order("ETH", False, 1, 2000, GTC)) == [{"resting": {"oid": 2}}]
+    alo = statuses(taker.order("ETH", True, 1, 2000, {"limit": {"tif": "Alo"}}))
+    assert alo[0]["error"].startswith("Post only order would have immediately matched")
+
+    filled = statuses(taker.order("ETH", True, 1.5, 2001, {"limit": {"tif": "Ioc"}}))
+    assert filled == [{"filled": {"totalSz": "1.5", "avgPx": "2000.33333333", "oid": 3}}]
+    assert info.l2_snapshot("ETH")["levels"] == [[], [{"px": "2001", "sz": "0.5", "n": 1}]]
+    assert [order["oid"] for order in info.open_orders(maker.wallet.address)] == [1]
+    position = info.user_state(taker.wallet.address)["assetPositions"][0]["position"]
+    assert position["szi"] == "1.5"
+    assert info.user_fills(maker.wallet.address)[0]["dir"] == "Open Short"
+
+    assert statuses(maker.cancel("ETH", 1)) == ["success"]
+    assert info.query_order_by_oid(maker.wallet.address, 1)["order"]["status"] == "canceled"
+    assert "error" in statuses(maker.cancel("ETH", 1))[0]
+
+
+def test_agents_act_for_their_account_and_nonces_are_checked(server, monkeypatch):
+    account = Exchange(eth_account.Account.create(), server.base_url)
+    response, agent_key = account.approve_agent("bot")
+    assert response["status"] == "ok"
+    agent = Exchange(eth_account.Account.from_key(agent_key), server.base_url, account_address=account.wallet.address)
+    agent.order("BTC", True, 0.1, 50000, GTC)
+    info = Info(server.base_url, skip_ws=True)
+    assert [order["oid"] for order in info.open_orders(account.wallet.address)] == [1]
+
+    monkeypatch.setattr(agent, "_next_nonce", lambda: agent._last_nonce)  # pylint: disable=protected-access
+    response = agent.cancel("BTC", 1)
+    assert response["status"] == "err" and "duplicate nonce" in response["response"]
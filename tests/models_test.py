@@ -0,0 +1,140 @@
+import math
+
+import pytest
+
+from hyperliquid.models import OpenOrders, UserState
+
+USER_STATE = {
+    "assetPositions": [
+        {
+            "position": {
+                "coin": "BTC",
+                "entryPx": "60000.0",
+                "leverage": {"type": "cross", "value": 20},
+                "liquidationPx": None,
+                "marginUsed": "150.0",
+                "positionValue": "3000.0",
+                "returnOnEquity": "0.1",
+                "szi": "0.05",
+                "unrealizedPnl": "15.0",
+            },
+            "type": "oneWay",
+        },
+        {
+            "position": {
+                "coin": "ETH",
+                "entryPx": "3000.5",
+                "leverage": {"type": "isolated", "value": 5, "rawUsd": "-1000.0"},
+                "liquidationPx": "3500.0",
+                "marginUsed": "200.0",
+                "positionValue": "1000.0",
+                "returnOnEquity": "-0.05",
+                "szi": "-0.3333",
+                "unrealizedPnl": "-10.0",
+            },
+            "type": "oneWay",
+        },
+    ],
+    "crossMarginSummary": {
+        "accountValue": "1000.0",
+        "totalMarginUsed": "150.0",
+        "totalNtlPos": "3000.0",
+        "totalRawUsd": "-2000.0",
+    },
+    "marginSummary": {
+        "accountValue": "1200.0",
+        "totalMarginUsed": "350.0",
+        "totalNtlPos": "4000.0",
+        "totalRawUsd": "-2800.0",
+    },
+    "withdrawable": "650.25",
+    "time": 1700000000000,
+}
+
+OPEN_ORDERS = [
+    {"coin": "ETH", "limitPx": "2900.0", "oid": 11, "side": "B", "sz": "0.5", "timestamp": 1},
+    {
+        "coin": "BTC",
+        "limitPx": "70000.0",
+        "oid": 12,
+        "side": "A",
+        "sz": "0.01",
+        "timestamp": 2,
+        "origSz": "0.02",
+        "cloid": "0x00000000000000000000000000000001",
+        "isTrigger": True,
+        "triggerPx": "69000.0",
+        "reduceOnly": True,
+        "orderType": "Stop Limit",
+        "tif": None,
+    },
+]
+
+
+def test_user_state():
+    state = UserState(USER_STATE)
+    assert state.time == 1700000000000
+    assert state.withdrawable == 650.25
+    assert state.margin_summary.account_value == 1200.0
+    assert state.cross_margin_summary.total_raw_usd == -2000.0
+    assert state.coins() == ["BTC", "ETH"]
+
+    btc = state.position("BTC")
+    assert btc is not None and btc.szi == 0.05 and btc.liquidation_px is None and btc.leverage == 20
+    eth = state.position("ETH")
+    assert eth is not None and eth.szi == -0.3333 and eth.liquidation_px == 3500.0
+    assert eth.leverage_type == "isolated"
+    assert state.position("SOL") is None
+    assert [position.coin for position in state.positions] == ["BTC", "ETH"]
+
+
+def test_user_state_arrays():
+    state = UserState(USER_STATE)
+    assert state.sizes().tolist() == [0.05, -0.3333]
+    assert state.entry_pxs().tolist() == [60000.0, 3000.5]
+    assert state.position_values().tolist() == [3000.0, 1000.0]
+    assert state.unrealized_pnls().tolist() == [15.0, -10.0]
+    assert state.margins_used().tolist() == [150.0, 200.0]
+    assert state.sizes() is state.sizes()
+
+
+def test_null_entry_px_is_nan():
+    raw = {
+        "assetPositions": [
+            {"position": {"coin": "BTC", "entryPx": None}},
+            {"position": {"coin": "ETH", "entryPx": "1.5"}},
+        ]
+    }
+    state = UserState(raw)
+    btc, eth = state.entry_pxs().tolist()
+    assert math.isnan(btc) and eth == 1.5
+    position = state.position("BTC")
+    assert position is not None and position.entry_px is None
+
+
+def test_fields_are_parsed_once():
+    raw = {"szi": "1.5", "coin": "ETH"}
+    state = UserState({"assetPositions": [{"position": raw, "type": "oneWay"}]})
+    position = state.positions[0]
+    assert position.szi == 1.5
+    raw["szi"] = "2.0"
+    assert position.szi == 1.5
+    with pytest.raises(AttributeError):
+        position.__dict__  # pylint: disable=pointless-statement
+
+
+def test_open_orders():
+    orders = OpenOrders(OPEN_ORDERS)
+    assert len(orders) == 2
+    eth, btc = orders
+    assert eth is orders[0]
+    assert eth.is_buy and eth.limit_px == 2900.0 and eth.sz == 0.5
+    assert eth.orig_sz is None and eth.trigger_px is None and eth.cloid is None
+    assert not btc.is_buy and btc.orig_sz == 0.02 and btc.trigger_px == 69000.0
+    assert btc.is_trigger and btc.reduce_only and btc.order_type == "Stop Limit"
+
+    assert orders.coins() == ["ETH", "BTC"]
+    assert orders.limit_pxs().tolist() == [2900.0, 70000.0]
+    assert orders.sizes().tolist() == [0.5, 0.01]
+    assert orders.signed_sizes().tolist() == [0.5, -0.01]
+    assert orders.oids().tolist() == [11, 12]
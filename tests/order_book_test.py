@@ -0,0 +1,58 @@
+import pytest
+
+from hyperliquid.order_book import ASK, BID, L2Book
+
+
+def level(px, sz, n=1):
+    return {"px": str(px), "sz": str(sz), "n": n}
+
+
+def l2_book_msg(bids, asks, time=1):
+    return {"channel": "l2Book", "data": {"coin": "ETH", "time": time, "levels": [bids, asks]}}
+
+
+def bbo_msg(bid, ask, time=2):
+    return {"channel": "bbo", "data": {"coin": "ETH", "time": time, "bbo": [bid, ask]}}
+
+
+@pytest.fixture
+def book():
+    book = L2Book("ETH", capacity=4)
+    book.on_l2_book(
+        l2_book_msg(
+            [level(100, 1), level(99, 2, 3), level(98, 3), level(97, 4), level(96, 5)],
+            [level(101, 3), level(102, 1), level(104, 2)],
+        )
+    )
+    return book
+
+
+def test_queries(book):
+    assert book.n_levels == [4, 3]
+    assert book.levels(BID)[-1] == (97.0, 4.0, 1)
+    assert book.mid() == 100.5
+    assert book.spread_bps() == pytest.approx(1 / 100.5 * 1e4)
+    assert book.microprice() == pytest.approx((100 * 3 + 101 * 1) / 4)
+    assert book.imbalance() == pytest.approx((1 - 3) / 4)
+    assert book.imbalance(2) == pytest.approx((3 - 4) / 7)
+    assert book.depth(BID, 150) == 3.0
+    assert book.depth(ASK, 150) == 4.0
+    assert book.vwap(True, 3.5) == pytest.approx((3 * 101 + 0.5 * 102) / 3.5)
+    assert book.vwap(False, 1) == 100.0
+    assert book.vwap(True, 7) is None
+
+
+def test_bbo_moves_the_top_of_the_book(book):
+    # a new best bid is inserted and the last level falls off, the best ask was taken out
+    book.on_bbo(bbo_msg(level(100.5, 0.5), level(102, 0.7)))
+    assert book.levels(BID) == [(100.5, 0.5, 1), (100.0, 1.0, 1), (99.0, 2.0, 3), (98.0, 3.0, 1)]
+    assert book.levels(ASK) == [(102.0, 0.7, 1), (104.0, 2.0, 1)]
+    # the same best price only updates its size
+    book.on_bbo(bbo_msg(level(100.5, 0.25), level(103, 1), time=3))
+    assert book.levels(BID)[0] == (100.5, 0.25, 1)
+    assert book.levels(ASK) == [(103.0, 1.0, 1), (104.0, 2.0, 1)]
+    # stale messages are ignored, an empty side clears it
+    book.on_l2_book(l2_book_msg([level(1, 1)], [level(2, 1)], time=2))
+    assert book.best(BID) == (100.5, 0.25)
+    book.on_bbo(bbo_msg(None, level(103, 1), time=4))
+    assert book.best(BID) is None and book.mid() is None and book.version == 4
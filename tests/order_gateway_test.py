@@ -0,0 +1,100 @@
+import threading
+
+from hyperliquid.order_gateway import OrderGateway
+from hyperliquid.utils.types import Any, BuilderInfo, Cloid
+
+
+class FakeExchange:
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def bulk_orders(self, order_requests, builder=None):
+        with self.lock:
+            self.calls.append(("order", order_requests, builder))
+        statuses = [{"resting": {"oid": i}} for i in range(len(order_requests))]
+        return {"status": "ok", "response": {"type": "order", "data": {"statuses": statuses}}}
+
+    def bulk_cancel(self, cancel_requests):
+        with self.lock:
+            self.calls.append(("cancel", cancel_requests, None))
+        return {"status": "err", "response": "rejected"}
+
+    def bulk_cancel_by_cloid(self, cancel_requests):
+        raise ConnectionError("down")
+
+
+def test_coalesces_orders_into_one_bulk_action():
+    exchange: Any = FakeExchange()
+    gateway = OrderGateway(exchange, window=0.2)
+    futures = [gateway.order("ETH", True, 0.1, 1000 + i, {"limit": {"tif": "Gtc"}}) for i in range(5)]
+    assert [future.result(timeout=2) for future in futures] == [{"resting": {"oid": i}} for i in range(5)]
+    assert len(exchange.calls) == 1
+    assert [order["limit_px"] for order in exchange.calls[0][1]] == [1000, 1001, 1002, 1003, 1004]
+    gateway.stop()
+
+
+def test_splits_at_max_batch_and_by_builder():
+    exchange: Any = FakeExchange()
+    gateway = OrderGateway(exchange, window=10, max_batch=3)
+    builder: BuilderInfo = {"b": "0xabc", "f": 10}
+    futures = [gateway.order("ETH", True, 0.1, 1000, {"limit": {"tif": "Gtc"}}, builder=builder)]
+    futures += [gateway.order("ETH", True, 0.1, 1000, {"limit": {"tif": "Gtc"}}) for _ in range(3)]
+    for future in futures:
+        future.result(timeout=2)
+    gateway.stop()
+    assert sorted(len(call[1]) for call in exchange.calls) == [1, 1, 2]
+
+
+def test_action_errors_and_exceptions_reach_every_caller():
+    exchange: Any = FakeExchange()
+    gateway = OrderGateway(exchange, window=10)
+    cancels = [gateway.cancel("ETH", oid) for oid in (1, 2)]
+    cancel_by_cloid = gateway.cancel_by_cloid("ETH", Cloid.from_int(1))
+    gateway.flush()
+    assert [future.result(timeout=2) for future in cancels] == [{"error": "rejected"}] * 2
+    assert isinstance(cancel_by_cloid.exception(timeout=2), ConnectionError)
+    gateway.stop()
+
+
+class RecordingExchange(FakeExchange):
+    def bulk_cancel_by_cloid(self, cancel_requests):
+        with self.lock:
+            self.calls.append(("cancel_by_cloid", cancel_requests, None))
+        statuses = ["success"] * len(cancel_requests)
+        return {"status": "ok", "response": {"type": "cancel", "data": {"statuses": statuses}}}
+
+
+def test_cancel_by_cloid_waits_for_the_order_it_cancels():
+    exchange: Any = RecordingExchange()
+    gateway = OrderGateway(exchange, window=10)
+    earlier = gateway.cancel_by_cloid("ETH", Cloid.from_int(2))
+    order = gateway.order("ETH", True, 0.1, 1000, {"limit": {"tif": "Gtc"}}, cloid=Cloid.from_int(1))
+    cancel = gateway.cancel_by_cloid("ETH", Cloid.from_int(1))
+    # the order is sent without waiting for the window, the cancel right after it
+    assert order.result(timeout=2) == {"resting": {"oid": 0}}
+    assert cancel.result(timeout=2) == "success" and earlier.result(timeout=2) == "success"
+    gateway.stop()
+    assert [(kind, [request["cloid"].to_raw() for request in requests]) for kind, requests, _ in exchange.calls] == [
+        ("cancel_by_cloid", [Cloid.from_int(2).to_raw()]),
+        ("order", [Cloid.from_int(1).to_raw()]),
+        ("cancel_by_cloid", [Cloid.from_int(1).to_raw()]),
+    ]
+
+
+def test_held_cancels_follow_orders_split_over_batches():
+    exchange: Any = RecordingExchange()
+    gateway = OrderGateway(exchange, window=10, max_batch=2)
+    with gateway._condition:  # pylint: disable=protected-access
+        # queued together so the gateway thread cannot send the first batch before the cancel arrives
+        orders = [
+            gateway.order("ETH", True, 0.1, 1000, {"limit": {"tif": "Gtc"}}, cloid=Cloid.from_int(i)) for i in range(3)
+        ]
+        cancel = gateway.cancel_by_cloid("ETH", Cloid.from_int(2))
+    assert cancel.result(timeout=2) == "success" and all(order.result(timeout=2) for order in orders)
+    gateway.stop()
+    assert [(kind, len(requests)) for kind, requests, _ in exchange.calls] == [
+        ("order", 2),
+        ("order", 1),
+        ("cancel_by_cloid", 1),
+    ]
@@ -0,0 +1,92 @@
+from hyperliquid.order_tracker import OrderTracker, TrackedOrder
+from hyperliquid.utils.types import Any, Optional
+
+USER = "0x5e9ee1089755c3435139848e47e6635505d5a13a"
+# messages are fed to the tracker directly, it is never started
+NO_INFO: Any = None
+
+
+def tracked(order: Optional[TrackedOrder]) -> TrackedOrder:
+    assert order is not None
+    return order
+
+
+def order(oid, sz="1.0", orig_sz="1.0", cloid=None, coin="ETH"):
+    return {
+        "coin": coin,
+        "side": "B",
+        "limitPx": "1000.0",
+        "sz": sz,
+        "oid": oid,
+        "timestamp": 1000,
+        "origSz": orig_sz,
+        "cloid": cloid,
+    }
+
+
+def update(oid, status, timestamp, **kwargs):
+    return {"order": order(oid, **kwargs), "status": status, "statusTimestamp": timestamp}
+
+
+def fill(oid, tid, sz):
+    return {"coin": "ETH", "px": "1000.0", "sz": sz, "side": "B", "time": 2000, "oid": oid, "tid": tid}
+
+
+def fills_msg(*fills):
+    return {"channel": "userFills", "data": {"user": USER, "isSnapshot": False, "fills": list(fills)}}
+
+
+def test_tracks_orders_from_seed_and_updates():
+    tracker = OrderTracker(NO_INFO, USER)
+    tracker.seed([order(1, cloid="0x00000000000000000000000000000001"), order(2, coin="BTC")])
+    assert {o.oid for o in tracker.open_orders()} == {1, 2}
+    assert tracked(tracker.order_by_cloid("0x00000000000000000000000000000001")).oid == 1
+
+    tracker.on_order_updates({"channel": "orderUpdates", "data": [update(3, "open", 1500)]})
+    tracker.on_order_updates({"channel": "orderUpdates", "data": [update(2, "canceled", 1600, coin="BTC")]})
+    assert [o.oid for o in tracker.open_orders("BTC")] == []
+    assert {o.oid for o in tracker.open_orders("ETH")} == {1, 3}
+    assert tracked(tracker.order(2)).status == "canceled"
+
+
+def test_newer_open_status_reopens_a_closed_order():
+    tracker = OrderTracker(NO_INFO, USER)
+    cloid = "0x00000000000000000000000000000001"
+    tracker.on_order_updates({"channel": "orderUpdates", "data": [update(1, "canceled", 1500, cloid=cloid)]})
+    # updates delivered out of order: the older open status is ignored, a newer one reopens the order
+    tracker.on_order_updates({"channel": "orderUpdates", "data": [update(1, "open", 1400, cloid=cloid)]})
+    assert tracker.open_orders() == []
+    tracker.on_order_updates({"channel": "orderUpdates", "data": [update(1, "open", 1600, sz="0.5", cloid=cloid)]})
+    assert [o.oid for o in tracker.open_orders("ETH")] == [1]
+    assert tracker.remaining_sz(1) == 0.5 and tracked(tracker.order_by_cloid(cloid)).status == "open"
+
+    tracker.on_order_updates({"channel": "orderUpdates", "data": [update(1, "canceled", 1700, cloid=cloid)]})
+    assert tracker.open_orders() == [] and tracked(tracker.order(1)).status == "canceled"
+
+
+def test_applies_fills_once_and_closes_filled_orders():
+    tracker = OrderTracker(NO_INFO, USER)
+    tracker.seed([order(1)])
+    tracker.on_user_fills(fills_msg(fill(1, 10, "0.4")))
+    tracker.on_user_fills(fills_msg(fill(1, 10, "0.4")))
+    assert tracker.remaining_sz(1) == 0.6
+    tracker.on_user_fills(fills_msg(fill(1, 11, "0.6")))
+    tracker.on_order_updates({"channel": "orderUpdates", "data": [update(1, "filled", 2000, sz="0.0")]})
+    assert tracker.remaining_sz(1) == 0.0
+    assert [f["tid"] for f in tracker.fills(1)] == [10, 11]
+    assert tracker.open_orders() == []
+
+
+def test_fills_before_order_update_are_kept():
+    tracker = OrderTracker(NO_INFO, USER)
+    tracker.on_user_fills(fills_msg(fill(5, 20, "1.0")))
+    tracker.on_order_updates({"channel": "orderUpdates", "data": [update(5, "filled", 2000, sz="0.0")]})
+    assert tracked(tracker.order(5)).filled_sz == 1.0
+
+
+def test_stale_updates_are_ignored():
+    tracker = OrderTracker(NO_INFO, USER)
+    tracker.on_order_updates({"channel": "orderUpdates", "data": [update(1, "canceled", 2000)]})
+    tracker.on_order_updates({"channel": "orderUpdates", "data": [update(1, "open", 1000)]})
+    assert tracked(tracker.order(1)).status == "canceled"
+    assert tracker.version == 2
@@ -0,0 +1,41 @@
+from hyperliquid.utils.rate_limit import RateLimiter, request_weight
+
+
+def test_info_request_weights():
+    assert request_weight("/info", {"type": "l2Book", "coin": "BTC"}) == 2
+    assert request_weight("/info", {"type": "allMids"}) == 2
+    assert request_weight("/info", {"type": "userRole", "user": "0x0"}) == 60
+    assert request_weight("/info", {"type": "meta"}) == 20
+
+
+def test_exchange_request_weights():
+    assert request_weight("/exchange", {"action": {"type": "updateLeverage"}}) == 1
+    assert request_weight("/exchange", {"action": {"type": "order", "orders": [{}] * 39}}) == 1
+    assert request_weight("/exchange", {"action": {"type": "order", "orders": [{}] * 40}}) == 2
+    assert request_weight("/exchange", {"action": {"type": "cancel", "cancels": [{}] * 85}}) == 3
+    assert request_weight("/exchange", {"action": {"type": "batchModify", "modifies": [{}] * 80}}) == 3
+
+
+def test_try_acquire_respects_budget():
+    limiter = RateLimiter(weight_per_minute=60, burst=10)
+    assert limiter.try_acquire(6)
+    assert not limiter.try_acquire(6)
+    assert limiter.try_acquire(4)
+    assert limiter.headroom() < 1
+
+
+def test_reservations_queue_in_order():
+    limiter = RateLimiter(weight_per_minute=60, burst=2)
+    assert limiter.reserve(2) == 0
+    first_wait = limiter.reserve(1)
+    second_wait = limiter.reserve(1)
+    assert 0.9 < first_wait <= 1.0
+    assert 1.9 < second_wait <= 2.0
+    assert limiter.headroom() < 0
+
+
+def test_drain_empties_bucket():
+    limiter = RateLimiter(shared=True)
+    limiter.drain()
+    assert limiter.headroom() < 1
+    assert limiter.acquire(0) == 0
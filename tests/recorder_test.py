@@ -0,0 +1,147 @@
+import glob
+import math
+import os
+import time
+
+import eth_account
+import pytest
+
+from hyperliquid.exchange import Exchange
+from hyperliquid.local_server import LocalServer
+from hyperliquid.recorder import TickRecorder, read_segment
+from hyperliquid.utils.signing import OrderType
+
+DAY = 86_400_000
+GTC: OrderType = {"limit": {"tif": "Gtc"}}
+IOC: OrderType = {"limit": {"tif": "Ioc"}}
+
+
+def trades(coin, rows):
+    return {
+        "channel": "trades",
+        "data": [
+            {"coin": coin, "side": side, "px": str(px), "sz": str(sz), "time": t, "tid": tid, "hash": "0x"}
+            for t, px, sz, side, tid in rows
+        ],
+    }
+
+
+def segments(root, coin="*", channel="*"):
+    return sorted(glob.glob(os.path.join(str(root), coin, "*", f"{channel}.*.seg")))
+
+
+@pytest.mark.parametrize("compression", ["zlib", None])
+def test_partitions_by_coin_and_day(tmp_path, compression):
+    recorder = TickRecorder(str(tmp_path), ["BTC", "ETH"], compression=compression, fsync="always")
+    recorder.on_trades(trades("BTC", [(1000, 100.5, 1, "B", 1), (2000, 101, 2, "A", 2)]))
+    recorder.on_trades(trades("ETH", [(1500, 10, 3, "A", 3)]))
+    recorder.flush()
+    recorder.on_trades(trades("BTC", [(DAY + 5, 102, 0.5, "B", 4)]))
+    recorder.close()
+
+    paths = segments(tmp_path)
+    assert [os.path.relpath(path, str(tmp_path)) for path in paths] == [
+        os.path.join("BTC", "1970-01-01", "trades.000000.seg"),
+        os.path.join("BTC", "1970-01-02", "trades.000000.seg"),
+        os.path.join("ETH", "1970-01-01", "trades.000000.seg"),
+    ]
+    header, blocks = read_segment(paths[0])
+    assert header["coin"] == "BTC" and header["compression"] == compression
+    assert [(block.rows, block.start, block.end) for block in blocks] == [(2, 1000, 2000)]
+    columns = blocks[0].columns
+    assert columns["px"].tolist() == [100.5, 101.0] and columns["side"].tolist() == [1, -1]
+    assert columns["tid"].tolist() == [1, 2]
+
+    stats = recorder.stats()
+    assert stats["rows"] == 4 and stats["blocks"] == 3 and stats["segments"] == 3 and stats["fsyncs"] >= 3
+    # everything but the segment headers
+    assert 0 < stats["written_bytes"] < sum(os.path.getsize(path) for path in paths)
+
+
+def test_live_segments_are_readable_after_every_flush(tmp_path):
+    recorder = TickRecorder(str(tmp_path), ["BTC"], fsync="never")
+    for i in range(3):
+        recorder.on_trades(trades("BTC", [(i, 100, 1, "B", i)]))
+        recorder.flush()
+        # the segment is still open for writing
+        (path,) = segments(tmp_path)
+        _, blocks = read_segment(path)
+        assert [block.columns["tid"].tolist() for block in blocks] == [[tid] for tid in range(i + 1)]
+    recorder.close()
+
+
+def test_books_are_padded_to_depth(tmp_path):
+    recorder = TickRecorder(str(tmp_path), ["ETH"], depth=2)
+    level = lambda px: {"px": str(px), "sz": "1", "n": 1}  # noqa: E731
+    recorder.on_l2_book({"channel": "l2Book", "data": {"coin": "ETH", "time": 7, "levels": [[level(9)], []]}})
+    recorder.on_l2_book(
+        {"channel": "l2Book", "data": {"coin": "ETH", "time": 8, "levels": [[level(9), level(8), level(7)], []]}}
+    )
+    recorder.on_bbo({"channel": "bbo", "data": {"coin": "ETH", "time": 8, "bbo": [level(9), None]}})
+    recorder.close()
+
+    _, blocks = read_segment(segments(tmp_path, channel="l2Book")[0])
+    bid_px = blocks[0].columns["bid_px"].tolist()
+    assert bid_px[0] == 9.0 and math.isnan(bid_px[1]) and bid_px[2:] == [9.0, 8.0]
+    assert all(math.isnan(px) for px in blocks[0].columns["ask_px"])
+    _, blocks = read_segment(segments(tmp_path, channel="bbo")[0])
+    assert blocks[0].columns["bid_px"].tolist() == [9.0] and math.isnan(blocks[0].columns["ask_px"][0])
+
+
+def test_rotation_and_truncated_segments(tmp_path):
+    recorder = TickRecorder(str(tmp_path), ["BTC"], rotate_bytes=1, fsync="never")
+    for i in range(3):
+        recorder.on_trades(trades("BTC", [(i, 100, 1, "B", i)]))
+        recorder.flush()
+    recorder.close()
+    paths = segments(tmp_path)
+    assert len(paths) == 3
+    assert [read_segment(path)[1][0].columns["tid"].tolist() for path in paths] == [[0], [1], [2]]
+
+    # a new recorder never appends to a segment it did not create
+    recorder = TickRecorder(str(tmp_path), ["BTC"])
+    recorder.on_trades(trades("BTC", [(3, 100, 1, "B", 3), (4, 100, 1, "B", 4)]))
+    recorder.on_trades(trades("BTC", [(5, 100, 1, "B", 5)]))
+    recorder.flush()
+    recorder.on_trades(trades("BTC", [(6, 100, 1, "B", 6)]))
+    recorder.close()
+    paths = segments(tmp_path)
+    assert len(paths) == 4
+    with open(paths[-1], "r+b") as f:
+        f.truncate(os.path.getsize(paths[-1]) - 3)
+    _, blocks = read_segment(paths[-1])
+    assert [block.columns["tid"].tolist() for block in blocks] == [[3, 4, 5]]
+
+
+def test_rejects_unknown_options(tmp_path):
+    with pytest.raises(ValueError):
+        TickRecorder(str(tmp_path), channels=("candle",))
+    with pytest.raises(ValueError):
+        TickRecorder(str(tmp_path), fsync="sometimes")
+
+
+def test_records_the_local_server_feed(tmp_path):
+    server = LocalServer(book_interval=0.01).start()
+    try:
+        recorder = TickRecorder(str(tmp_path), base_url=server.base_url, flush_interval=0.05)
+        recorder.start()
+        assert recorder.coins == [asset["name"] for asset in server.engine.meta["universe"]]
+        time.sleep(0.2)
+        maker = Exchange(eth_account.Account.create(), server.base_url)
+        taker = Exchange(eth_account.Account.create(), server.base_url)
+        maker.order("ETH", False, 2, 2000, GTC)
+        taker.order("ETH", True, 1, 2000, IOC)
+        deadline = time.time() + 5
+        while time.time() < deadline and not (segments(tmp_path, "ETH", "trades") and segments(tmp_path, "ETH", "bbo")):
+            time.sleep(0.05)
+        recorder.stop()
+    finally:
+        server.stop()
+
+    _, blocks = read_segment(segments(tmp_path, "ETH", "trades")[0])
+    assert blocks[0].columns["px"].tolist() == [2000.0] and blocks[0].columns["side"].tolist() == [1]
+    # the first book is the empty snapshot sent on subscription, the last one has the rest of the maker order
+    _, blocks = read_segment(segments(tmp_path, "ETH", "l2Book")[-1])
+    assert blocks[-1].columns["ask_px"][-recorder.depth] == 2000.0
+    assert blocks[-1].columns["ask_sz"][-recorder.depth] == 1.0
+    assert recorder.stats()["rows"] >= 3
@@ -0,0 +1,137 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from hyperliquid.api import API
+from hyperliquid.utils.error import ServerError
+from hyperliquid.utils.retry import RetryPolicy
+
+
+class FakeResponse:
+    def __init__(self, status_code, text="{}", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def json(self):
+        return {"status": self.status_code}
+
+
+class FakeSession:
+    def __init__(self, outcomes, delays=None):
+        self.outcomes = list(outcomes)
+        self.delays = list(delays or [])
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def post(self, url, json=None, timeout=None):
+        with self.lock:
+            self.calls += 1
+            outcome = self.outcomes.pop(0)
+            delay = self.delays.pop(0) if self.delays else 0
+        time.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class ClosableSession(FakeSession):
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def make_api(session, policy):
+    api = API(retry_policy=policy)
+    api.session = session
+    return api
+
+
+def test_retries_server_errors_and_connection_errors():
+    session = FakeSession([FakeResponse(502), requests.exceptions.ConnectionError(), FakeResponse(200)])
+    api = make_api(session, RetryPolicy(backoff_base=0.001))
+    assert api.post("/info", {"type": "meta"}) == {"status": 200}
+    assert session.calls == 3
+
+
+def test_honors_retry_after():
+    session = FakeSession([FakeResponse(429, "null", {"Retry-After": "0.05"}), FakeResponse(200)])
+    api = make_api(session, RetryPolicy(backoff_base=0.001))
+    start = time.monotonic()
+    api.post("/info", {"type": "meta"})
+    assert time.monotonic() - start >= 0.05
+
+
+def test_gives_up_after_max_retries():
+    session = FakeSession([FakeResponse(500)] * 3)
+    api = make_api(session, RetryPolicy(max_retries=2, backoff_base=0.001))
+    with pytest.raises(ServerError):
+        api.post("/info", {"type": "meta"})
+    assert session.calls == 3
+
+
+def test_retry_budget_limits_retries():
+    session = FakeSession([FakeResponse(500)] * 4)
+    api = make_api(session, RetryPolicy(backoff_base=0.001, budget_max=1, budget_ratio=0))
+    with pytest.raises(ServerError):
+        api.post("/info", {"type": "meta"})
+    with pytest.raises(ServerError):
+        api.post("/info", {"type": "meta"})
+    assert session.calls == 3
+
+
+def test_counters_match_the_budget_spent_across_threads():
+    policy = RetryPolicy(budget_max=500, budget_ratio=0)
+    granted = []
+
+    def spend():
+        granted.append(sum(policy.should_retry(0) for _ in range(100)) + sum(policy.should_hedge() for _ in range(100)))
+
+    threads = [threading.Thread(target=spend) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(granted) == policy.retries + policy.hedges == 500
+
+
+def test_exchange_requests_are_not_retried():
+    session = FakeSession([FakeResponse(500), FakeResponse(200)])
+    api = make_api(session, RetryPolicy(backoff_base=0.001))
+    with pytest.raises(ServerError):
+        api.post("/exchange", {"action": {"type": "order", "orders": []}})
+    assert session.calls == 1
+
+
+def test_hedges_slow_requests():
+    policy = RetryPolicy(hedge_percentile=0.5, hedge_min_samples=1)
+    policy.record_latency(0.01)
+    session = FakeSession([FakeResponse(200), FakeResponse(200)], delays=[1.0, 0])
+    api = make_api(session, policy)
+    start = time.monotonic()
+    api.post("/info", {"type": "l2Book", "coin": "BTC"})
+    assert time.monotonic() - start < 0.5
+    assert session.calls == 2
+    assert policy.hedges == 1
+
+
+def test_concurrent_hedged_requests_share_one_executor_until_closed():
+    policy = RetryPolicy(hedge_percentile=0.5, hedge_min_samples=1)
+    policy.record_latency(1.0)
+    session = ClosableSession([FakeResponse(200) for _ in range(8)])
+    api = make_api(session, policy)
+    executor = api._hedge_executor
+    threads = [threading.Thread(target=api.post, args=("/info", {"type": "l2Book", "coin": "BTC"})) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert api._hedge_executor is executor
+    assert session.calls == 8
+    api.close()
+    assert session.closed
+    with pytest.raises(RuntimeError):
+        executor.submit(time.sleep, 0)
@@ -0,0 +1,96 @@
+import json
+
+import eth_account
+
+from hyperliquid.utils.signature_recovery import recover_signers, recover_signers_from_file, signed_action_digest
+from hyperliquid.utils.signing import (
+    TOKEN_DELEGATE_TYPES,
+    OrderRequest,
+    get_timestamp_ms,
+    order_request_to_order_wire,
+    order_wires_to_order_action,
+    recover_agent_or_user_from_l1_action,
+    recover_user_from_user_signed_action,
+    sign_agent,
+    sign_l1_action,
+    sign_multi_sig_action,
+    sign_token_delegate_action,
+    sign_usd_transfer_action,
+)
+
+WALLET = eth_account.Account.from_key("0x0123456789012345678901234567890123456789012345678901234567890123")
+VAULT = "0x1719884eb866cb12b2287399b15f7db5e7d775ea"
+
+
+def signed_actions():
+    nonce = get_timestamp_ms()
+    order: OrderRequest = {
+        "coin": "ETH",
+        "is_buy": True,
+        "sz": 1,
+        "limit_px": 100,
+        "order_type": {"limit": {"tif": "Gtc"}},
+        "reduce_only": False,
+    }
+    order_action = order_wires_to_order_action([order_request_to_order_wire(order, 1)])
+    yield {
+        "action": order_action,
+        "nonce": nonce,
+        "signature": sign_l1_action(WALLET, order_action, VAULT, nonce, nonce + 1000, True),
+        "vaultAddress": VAULT,
+        "expiresAfter": nonce + 1000,
+    }
+    cancel = {"type": "cancel", "cancels": [{"a": 1, "o": 2}]}
+    yield {"action": cancel, "nonce": nonce, "signature": sign_l1_action(WALLET, cancel, None, nonce, None, True)}
+    usd_send = {"destination": VAULT, "amount": "1", "time": nonce, "type": "usdSend"}
+    yield {"action": usd_send, "nonce": nonce, "signature": sign_usd_transfer_action(WALLET, usd_send, True)}
+    agent = {"type": "approveAgent", "agentAddress": VAULT, "agentName": "", "nonce": nonce}
+    signature = sign_agent(WALLET, agent, True)
+    del agent["agentName"]
+    yield {"action": agent, "nonce": nonce, "signature": signature}
+    delegate = {"type": "tokenDelegate", "validator": VAULT, "wei": 10**8, "isUndelegate": False, "nonce": nonce}
+    yield {"action": delegate, "nonce": nonce, "signature": sign_token_delegate_action(WALLET, delegate, True)}
+    multi_sig = {"type": "multiSig", "signatureChainId": "0x66eee", "signatures": [], "payload": {"x": 1}}
+    signature = sign_multi_sig_action(WALLET, multi_sig, True, None, nonce, None)
+    yield {"action": multi_sig, "nonce": nonce, "signature": signature}
+
+
+def test_recovers_every_kind_of_action_like_the_single_action_functions():
+    actions = list(signed_actions())
+    results = list(recover_signers(actions, True, processes=0))
+    assert [result.signer for result in results] == [WALLET.address] * len(actions)
+    assert all(result.error is None for result in results)
+
+    order = actions[0]
+    assert WALLET.address == recover_agent_or_user_from_l1_action(
+        order["action"], order["signature"], VAULT, order["nonce"], order["expiresAfter"], True
+    )
+    delegate = actions[4]
+    assert WALLET.address == recover_user_from_user_signed_action(
+        dict(delegate["action"]),
+        delegate["signature"],
+        TOKEN_DELEGATE_TYPES,
+        "HyperliquidTransaction:TokenDelegate",
+        True,
+    )
+    # signed for mainnet, so testnet recovers someone else
+    assert next(recover_signers(actions[:1], False, processes=0)).signer != WALLET.address
+    assert signed_action_digest(order, True) != signed_action_digest(order, False)
+
+
+def test_streams_a_file_through_worker_processes(tmp_path):
+    actions = list(signed_actions())
+    path = tmp_path / "actions.jsonl"
+    with open(path, "w") as f:
+        for signed_action in actions * 5:
+            f.write(json.dumps(signed_action) + "\n")
+        f.write("\n")
+        f.write("not json\n")
+        f.write(json.dumps({"action": {"type": "cancel"}, "nonce": 1, "signature": {"r": "0x1", "s": "0x1"}}))
+
+    results = list(recover_signers_from_file(str(path), True, processes=2, chunksize=4))
+    assert len(results) == len(actions) * 5 + 2
+    assert [result.signed_action for result in results[:-2]] == actions * 5
+    assert {result.signer for result in results[:-2]} == {WALLET.address}
+    assert [result.signer for result in results[-2:]] == [None, None]
+    assert results[-2].signed_action == "not json\n" and results[-1].error is not None
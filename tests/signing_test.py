@@ -1,6 +1,9 @@
+import threading
+
 import eth_account
+import msgpack
 import pytest
-from eth_utils import to_hex
+from eth_utils import keccak, to_hex
 
 from hyperliquid.utils.signing import (
     OrderRequest,
@@ -10,11 +13,16 @@ from hyperliquid.utils.signing import (
     float_to_int_for_hashing,
     order_request_to_order_wire,
     order_wires_to_order_action,
+    pack_batch_modify_action,
+    pack_modify_wire,
+    pack_order_action,
+    pack_order_wire,
+    packb,
     sign_l1_action,
     sign_usd_transfer_action,
     sign_withdraw_from_bridge_action,
 )
-from hyperliquid.utils.types import Cloid
+from hyperliquid.utils.types import Cloid, List
 
 
 def test_phantom_agent_creation_matches_production():
@@ -271,3 +279,71 @@ def test_schedule_cancel_action():
     assert signature_testnet["r"] == "0x4e4f2dbd4107c69783e251b7e1057d9f2b9d11cee213441ccfa2be63516dc5bc"
     assert signature_testnet["s"] == "0x706c656b23428c8ba356d68db207e11139ede1670481a9e01ae2dfcdb0e1a678"
     assert signature_testnet["v"] == 27
+
+
+def _order_wires(n):
+    orders: List[OrderRequest] = [
+        {
+            "coin": "ETH",
+            "is_buy": i % 2 == 0,
+            "sz": 0.0147 + i,
+            "limit_px": 1670.1 + i,
+            "reduce_only": i % 3 == 0,
+            "order_type": (
+                {"limit": {"tif": "Gtc"}}
+                if i % 4
+                else {"trigger": {"triggerPx": 1600 + i, "isMarket": True, "tpsl": "sl"}}
+            ),
+            "cloid": Cloid.from_int(i) if i % 2 else None,
+        }
+        for i in range(n)
+    ]
+    return [order_request_to_order_wire(order, 4) for order in orders]
+
+
+def test_action_hash_matches_plain_msgpack():
+    vault = "0x1719884eb866cb12b2287399b15f7db5e7d775ea"
+    action = order_wires_to_order_action(_order_wires(50))
+    for vault_address, expires_after in ((None, None), (vault, None), (vault, 1_700_000_005_000)):
+        data = msgpack.packb(action) + (1_700_000_000_000).to_bytes(8, "big")
+        data += b"\x00" if vault_address is None else b"\x01" + bytes.fromhex(vault_address[2:])
+        if expires_after is not None:
+            data += b"\x00" + expires_after.to_bytes(8, "big")
+        assert action_hash(action, vault_address, 1_700_000_000_000, expires_after) == keccak(data)
+
+
+def test_spliced_actions_match_msgpack_packb():
+    wires = _order_wires(50)
+    packed_wires = [pack_order_wire(wire) for wire in wires]
+    builder = {"b": "0x8c967e73e7b15087c42a10d344cff4c96d877f1d", "f": 1}
+    for n in (0, 1, 15, 16, 50):
+        assert pack_order_action(packed_wires[:n]) == msgpack.packb(order_wires_to_order_action(wires[:n]))
+        assert pack_order_action(packed_wires[:n], builder) == msgpack.packb(
+            order_wires_to_order_action(wires[:n], builder)
+        )
+
+    oids = [40_000_000_000 + i if i % 2 else Cloid.from_int(i).to_raw() for i in range(50)]
+    modifies = [{"oid": oid, "order": wire} for oid, wire in zip(oids, wires)]
+    packed_modifies = [pack_modify_wire(oid, packed) for oid, packed in zip(oids, packed_wires)]
+    action = {"type": "batchModify", "modifies": modifies}
+    assert pack_batch_modify_action(packed_modifies) == msgpack.packb(action)
+    assert action_hash(pack_batch_modify_action(packed_modifies), None, 1, None) == action_hash(action, None, 1, None)
+
+
+def test_packb_is_thread_safe():
+    actions = [order_wires_to_order_action(_order_wires(n)) for n in range(1, 9)]
+    expected = [msgpack.packb(action) for action in actions]
+    mismatches = []
+
+    def pack_repeatedly():
+        for _ in range(200):
+            for action, packed in zip(actions, expected):
+                if packb(action) != packed:
+                    mismatches.append(action)
+
+    threads = [threading.Thread(target=pack_repeatedly) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not mismatches
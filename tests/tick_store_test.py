@@ -0,0 +1,102 @@
+import math
+import mmap
+
+import pytest
+
+from hyperliquid.bars import BarSeries, time_bars
+from hyperliquid.recorder import TickRecorder
+from hyperliquid.tick_store import TickStore
+
+DAY = 86_400_000
+
+
+def trades(rows):
+    return {
+        "channel": "trades",
+        "data": [
+            {"coin": "BTC", "side": side, "px": str(px), "sz": str(sz), "time": t, "tid": t, "hash": "0x"}
+            for t, px, sz, side in rows
+        ],
+    }
+
+
+# three blocks, the second one crossing midnight
+ROWS = [
+    [(DAY - 3000, 100, 1, "B"), (DAY - 2500, 102, 2, "A"), (DAY - 1000, 101, 1, "B")],
+    [(DAY - 900, 99, 3, "A"), (DAY + 100, 104, 1, "B"), (DAY + 200, 103, 2, "B")],
+    [(DAY + 1500, 105, 1, "A"), (DAY + 1600, 106, 4, "B")],
+]
+
+
+def record(root, compression):
+    recorder = TickRecorder(root, ["BTC"], compression=compression, fsync="never")
+    for rows in ROWS:
+        recorder.on_trades(trades(rows))
+        recorder.flush()
+    return recorder
+
+
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_queries_time_ranges_across_blocks_and_days(tmp_path, compression):
+    record(str(tmp_path), compression).close()
+    store = TickStore(str(tmp_path))
+
+    pieces = store.query("BTC", DAY - 2500, DAY + 200)
+    assert [piece.rows for piece in pieces] == [2, 1, 1]
+    assert [t for piece in pieces for t in piece.columns["time"]] == [DAY - 2500, DAY - 1000, DAY - 900, DAY + 100]
+    px = pieces[0].columns["px"]
+    if compression is None:
+        # zero copy views into the mapped segments
+        assert isinstance(px, memoryview) and isinstance(px.obj, mmap.mmap)
+    assert store.column("BTC", "px", 0, 2 * DAY).tolist() == [100, 102, 101, 99, 104, 103, 105, 106]
+    assert store.query("BTC", DAY + 2000, 2 * DAY) == [] and store.query("ETH", 0, 2 * DAY) == []
+    assert sorted(store.query("BTC", 0, DAY, columns=["sz"])[0].columns) == ["sz", "time"]
+
+    # views must be released before the mappings are closed
+    del pieces, px
+    store.close()
+
+
+def test_aggregations_match_live_bars(tmp_path):
+    record(str(tmp_path), None).close()
+    store = TickStore(str(tmp_path))
+
+    series = BarSeries("BTC", time_bars(1))
+    for rows in ROWS:
+        for t, px, sz, side in rows:
+            series.add(t, float(px), float(sz), side == "B")
+    series.flush(2 * DAY)
+    assert store.resample("BTC", 1000, 0, 2 * DAY) == series.ring.bars()
+
+    times, cvd = store.cvd("BTC", DAY - 2500, DAY + 1600)
+    assert times.tolist() == [DAY - 2500, DAY - 1000, DAY - 900, DAY + 100, DAY + 200, DAY + 1500]
+    assert cvd.tolist() == [-2, -1, -4, -3, -1, -2]
+    assert store.vwap("BTC", DAY, 2 * DAY) == pytest.approx((104 + 206 + 105 + 424) / 8)
+    assert math.isnan(store.vwap("BTC", 0, 1))
+    store.close()
+
+
+def test_follows_a_segment_being_written(tmp_path):
+    recorder = record(str(tmp_path), None)
+    store = TickStore(str(tmp_path))
+    assert len(store.column("BTC", "time", 0, 2 * DAY)) == 8
+
+    recorder.on_trades(trades([(DAY + 1700, 107, 1, "B")]))
+    recorder.flush()
+    assert store.column("BTC", "px", DAY + 1600, 2 * DAY).tolist() == [106, 107]
+    recorder.close()
+    store.close()
+
+
+def test_book_levels_keep_their_width(tmp_path):
+    recorder = TickRecorder(str(tmp_path), ["ETH"], depth=2, compression=None)
+    for t in range(3):
+        levels = [[{"px": str(10 - t), "sz": "1", "n": 1}], [{"px": str(11 + t), "sz": "2", "n": 1}]]
+        recorder.on_l2_book({"channel": "l2Book", "data": {"coin": "ETH", "time": t, "levels": levels}})
+    recorder.close()
+
+    store = TickStore(str(tmp_path))
+    (piece,) = store.query("ETH", 1, 3, "l2Book", ["ask_px"])
+    assert piece.rows == 2 and piece.columns["ask_px"][::2].tolist() == [12.0, 13.0]
+    del piece
+    store.close()